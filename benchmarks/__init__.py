@@ -0,0 +1 @@
+# benchmark scripts: python -m benchmarks.<name>
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""Trade-fill throughput: per-trade `fill_trade` loop vs batched `fill_trades`."""
+from __future__ import annotations
+import argparse, time
+import numpy as np
+from src.execution import fill_trade, fill_trades
+
+
+def synthetic_trades(n_bars: int, n_trades: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    mid = 100 + np.cumsum(rng.normal(0, 0.25, n_bars))
+    high, low = mid + rng.random(n_bars) * 0.5, mid - rng.random(n_bars) * 0.5
+    idx = rng.integers(0, n_bars - 1, size=n_trades)
+    sides = rng.choice(["long", "short"], size=n_trades)
+    sgn = np.where(sides == "long", 1.0, -1.0)
+    entries = mid[idx]
+    dist = rng.uniform(0.5, 3.0, n_trades)
+    return idx, sides, entries - sgn * dist, entries + sgn * dist * 2.5, high, low, entries
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Batched trade-fill throughput benchmark")
+    ap.add_argument("--bars", type=int, default=1_000_000)
+    ap.add_argument("--trades", type=int, default=1_000_000)
+    ap.add_argument("--lookahead", type=int, default=64)
+    ap.add_argument("--loop-trades", type=int, default=20_000, help="trades for the per-trade reference")
+    args = ap.parse_args()
+
+    idx, sides, stops, targets, high, low, entries = synthetic_trades(args.bars, args.trades)
+    t0 = time.perf_counter()
+    fill_trades(idx, sides, stops, targets, high, low, look_ahead_bars=args.lookahead, entries=entries)
+    tb = time.perf_counter() - t0
+    print(f"batched : {args.trades:>9,} trades {tb:7.3f}s  {args.trades / tb:12,.0f} trades/s")
+
+    m = min(args.loop_trades, args.trades)
+    L = args.lookahead
+    t0 = time.perf_counter()
+    for k in range(m):
+        i = idx[k]
+        fill_trade(entries[k], sides[k], stops[k], targets[k], high[i + 1 : i + 1 + L], low[i + 1 : i + 1 + L])
+    tl = time.perf_counter() - t0
+    print(f"per-trade: {m:>9,} trades {tl:7.3f}s  {m / tl:12,.0f} trades/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Universe screen: one `screen` pass over stacked (symbols × bars) arrays vs the per-symbol
+loop (`build_features` + `verdict_from_series` for each symbol).
+
+    python -m benchmarks.bench_screener --symbols 500 --min-bars 1000 --max-bars 5000
+"""
+from __future__ import annotations
+import argparse, time
+import numpy as np
+from src.entropy_engine import verdict_from_series
+from src.features import build_features
+from src.screener import screen, stack_universe
+from .synthetic import regime_ohlcv
+
+
+def universe(symbols: int, min_bars: int, max_bars: int, seed: int = 0) -> dict:
+    """Ragged windows of one long regime-switching series, one per symbol."""
+    rng = np.random.default_rng(seed)
+    base = regime_ohlcv(max_bars * 50, seed=seed)
+    out = {}
+    for i in range(symbols):
+        n = int(rng.integers(min_bars, max_bars + 1))
+        s = int(rng.integers(0, len(base) - n))
+        out[f"S{i:04d}"] = base.iloc[s: s + n]
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Cross-sectional screen vs per-symbol loop")
+    ap.add_argument("--symbols", type=int, default=500)
+    ap.add_argument("--min-bars", type=int, default=1000)
+    ap.add_argument("--max-bars", type=int, default=5000)
+    ap.add_argument("--bars", type=int, default=0, help="screen the last N bars only (0 = whole history)")
+    args = ap.parse_args()
+
+    series = universe(args.symbols, args.min_bars, args.max_bars)
+    screen(stack_universe(series, 100))            # pandas import and first-call costs
+    t0 = time.perf_counter()
+    u = stack_universe(series, args.bars or None)
+    t1 = time.perf_counter()
+    table = screen(u)
+    t2 = time.perf_counter()
+    glyphs = {}
+    for sym, df in series.items():
+        v = verdict_from_series(build_features(df.iloc[-args.bars:] if args.bars else df).dphi)
+        glyphs[sym] = v.glyph
+    t3 = time.perf_counter()
+    assert glyphs == dict(zip(table["symbol"], table["glyph"]))
+    print(f"symbols={args.symbols} cells={u.close.size:,} stack={t1 - t0:.3f}s screen={t2 - t1:.3f}s "
+          f"loop={t3 - t2:.3f}s speedup x{(t3 - t2) / (t2 - t0):.1f}")
+
+
+if __name__ == "__main__":
+    main()
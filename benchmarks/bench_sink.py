@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""Capsule persistence: per-trade open/append/close (`write_ndjson`) vs buffered `CapsuleSink`."""
+from __future__ import annotations
+import argparse, json, os, shutil, tempfile, time
+from src.capsule_logger import write_ndjson, trade_capsule, CapsuleSink
+
+
+def capsules(n: int):
+    verdict = {"glyph": "⟿", "np_wall": True, "no_recovery": True, "sat_like": False, "ΔΦ_last": 0.093,
+               "size": 3, "stop": 99.0, "target": 102.5, "exit_reason": "target", "bars_held": 7, "R": 2.5}
+    cap = trade_capsule("ES", "long", 100.0, 102.5, verdict, "2025-01-01 09:30:00", "2025-01-01 09:37:00")
+    return [dict(cap, capsule_id=f"TRADE⇌{i}") for i in range(n)]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Capsule writer benchmark")
+    ap.add_argument("--n", type=int, default=100_000)
+    ap.add_argument("--dir", default=None, help="target directory (e.g. on the artifact volume)")
+    ap.add_argument("--fsync", action="store_true")
+    args = ap.parse_args()
+
+    caps = capsules(args.n)
+    t0 = time.perf_counter()
+    for c in caps:
+        json.dumps(c, separators=(",", ":"))
+    t_json = time.perf_counter() - t0
+
+    root = tempfile.mkdtemp(dir=args.dir)
+    try:
+        path = os.path.join(root, "a", "trades.ndjson")
+        t0 = time.perf_counter()
+        for c in caps:
+            write_ndjson(path, c)
+        t_naive = time.perf_counter() - t0
+
+        path = os.path.join(root, "b", "trades.ndjson")
+        t0 = time.perf_counter()
+        with CapsuleSink(path, fsync=args.fsync) as sink:
+            for c in caps:
+                sink.write(c)
+        t_sink = time.perf_counter() - t0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    print(f"json only   : {t_json:7.3f}s (serialization floor shared by both writers)")
+    print(f"write_ndjson: {t_naive:7.3f}s ({args.n / t_naive:10,.0f} capsules/s)")
+    print(f"CapsuleSink : {t_sink:7.3f}s ({args.n / t_sink:10,.0f} capsules/s)  x{t_naive / t_sink:.1f}")
+
+
+if __name__ == "__main__":
+    main()
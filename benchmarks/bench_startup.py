@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+CLI startup cost: wall time of short `python -m src ...` runs and their `-X importtime` profile.
+
+    python -m benchmarks.bench_startup --out benchmarks/startup_baseline.json
+    python -m benchmarks.bench_startup --compare benchmarks/startup_baseline.json
+
+Each case runs in a fresh interpreter `--repeat` times (best wall time kept), then once more
+under `-X importtime`, which gives the total import time, the module count, whether pandas
+was loaded and the most expensive top-level imports. `--compare` exits 1 when a case got
+slower than the baseline by more than the tolerance (same rule as `benchmarks.suite`).
+"""
+from __future__ import annotations
+import argparse, json, os, shutil, subprocess, sys, tempfile, time
+from typing import Dict, List, Tuple
+from .suite import compare
+from .synthetic import regime_ohlcv
+
+RUNNERS = ("backtest_runner", "multi_backtest", "ab_runner", "portfolio_runner", "wf_runner", "sweep_runner",
+           "screen_runner", "live_runner", "montecarlo_runner")
+
+
+def cases(csv: str) -> Dict[str, Tuple[List[str], bool]]:
+    """name: (interpreter args, drop the CSV's binary cache before each run)."""
+    return {
+        "help": (["-m", "src", "--help"], False),
+        "multi_help": (["-m", "src", "multi", "--help"], False),
+        "import_runners": (["-c", "import " + ", ".join(f"src.{r}" for r in RUNNERS)], False),
+        "multi_cached": (["-m", "src", "multi", "--csv", csv, "--no-cache"], False),
+        "multi_parse_csv": (["-m", "src", "multi", "--csv", csv, "--no-cache"], True),
+        "backtest": (["-m", "src", "backtest", "--csv", csv], False),
+    }
+
+
+def parse_importtime(stderr: str, top: int = 5) -> Dict:
+    """Totals of a `-X importtime` log: top-level cumulative µs, module count, pandas, slowest top-level imports."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        rows.append((int(cum), name.rstrip()))
+    roots = [(cum, name.strip()) for cum, name in rows if len(name) - len(name.lstrip()) == 1]
+    return {"import_ms": sum(c for c, _ in roots) / 1e3, "modules": len(rows),
+            "pandas": any(name.strip().split(".")[0] == "pandas" for _, name in rows),
+            "top": [[name, cum / 1e3] for cum, name in sorted(roots, reverse=True)[:top]]}
+
+
+def run(bars: int = 2000, repeat: int = 5, log=print) -> Dict:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    tmp = tempfile.mkdtemp(prefix="startup")
+    try:
+        csv = os.path.join(tmp, "bars.csv")
+        regime_ohlcv(bars, seed=0).to_csv(csv, index_label="timestamp")
+        results = {}
+        for name, (argv, cold) in cases(csv).items():
+            def once(extra: List[str]) -> Tuple[float, str]:
+                if cold:
+                    shutil.rmtree(csv + ".cache", ignore_errors=True)
+                t = time.perf_counter()
+                p = subprocess.run([sys.executable, *extra, *argv], cwd=tmp, env=env, capture_output=True, text=True)
+                if p.returncode:
+                    raise RuntimeError(f"{name} failed: {p.stderr[-2000:]}")
+                return time.perf_counter() - t, p.stderr
+            once([])                                        # warm the OS cache and the CSV's binary cache
+            best = min(once([])[0] for _ in range(repeat))
+            results[name] = {"seconds": best, **parse_importtime(once(["-X", "importtime"])[1])}
+            r = results[name]
+            log(f"{name:<16} {best * 1e3:8.1f} ms  imports {r['import_ms']:8.1f} ms  {r['modules']:4d} modules"
+                f"  pandas={'yes' if r['pandas'] else 'no'}")
+        return {"python": sys.version.split()[0], "bars": bars, "results": results}
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="CLI startup / import-time benchmark")
+    ap.add_argument("--bars", type=int, default=2000, help="bars in the CSV of the short runs")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--out", default="artifacts/startup.json")
+    ap.add_argument("--compare", default=None, help="baseline JSON to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, e.g. 0.25 = 25%%")
+    args = ap.parse_args()
+    res = run(args.bars, args.repeat)
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(res, f, indent=2)
+    print(f"[STARTUP] {len(res['results'])} cases → {args.out}")
+    if not args.compare:
+        return
+    with open(args.compare) as f:
+        base = json.load(f)
+    rows = compare(base, res, args.tolerance)
+    for key, t, _, bad in rows:
+        print(f"{'REGRESSION' if bad else 'ok':<10} {key:<16} time x{t:5.2f}")
+    sys.exit(1 if any(bad for *_, bad in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Scaling of per-bar verdict evaluation: `verdict_columns` (what the scanner uses), the O(1)
+`StreamingVerdict` (bar-at-a-time callers) and the quadratic prefix re-scan.
+"""
+from __future__ import annotations
+import argparse, time
+import numpy as np
+from src.entropy_engine import StreamingVerdict, verdict_columns, verdict_from_series, NP_WALL
+
+
+def synthetic_dphi(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    d = np.abs(rng.normal(0.03, 0.02, n))
+    d[rng.random(n) < 0.01] += NP_WALL
+    return d
+
+
+def time_columns(d: np.ndarray) -> float:
+    t0 = time.perf_counter()
+    verdict_columns(d)
+    return time.perf_counter() - t0
+
+
+def time_streaming(d: np.ndarray) -> float:
+    t0 = time.perf_counter()
+    sv = StreamingVerdict()
+    for x in d.tolist():
+        sv.update(x)
+        sv.verdict()
+    return time.perf_counter() - t0
+
+
+def time_prefix(d: np.ndarray) -> float:
+    t0 = time.perf_counter()
+    for i in range(d.size):
+        verdict_from_series(d[: i + 1])
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Verdict-per-bar scaling benchmark")
+    ap.add_argument("--sizes", default="10000,100000,1000000,2000000")
+    ap.add_argument("--prefix-max", type=int, default=20000, help="largest size to run the quadratic reference on")
+    args = ap.parse_args()
+
+    for n in [int(s) for s in args.sizes.split(",")]:
+        d = synthetic_dphi(n)
+        tc, ts = time_columns(d), time_streaming(d)
+        line = (f"n={n:>9,} columns={tc:8.3f}s ({tc / n * 1e9:6.0f} ns/bar)"
+                f" streaming={ts:8.3f}s ({ts / n * 1e9:6.0f} ns/bar)")
+        if n <= args.prefix_max:
+            tp = time_prefix(d)
+            line += f" prefix={tp:8.3f}s ({tp / n * 1e9:8.0f} ns/bar)"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
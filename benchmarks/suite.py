@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite over seeded regime-switching data (`benchmarks.synthetic`).
+
+    python -m benchmarks.suite run --sizes 10000,100000,1000000 --out benchmarks/baseline.json
+    python -m benchmarks.suite compare benchmarks/baseline.json artifacts/bench.json
+
+`run` records, per benchmark and size, the best wall time over `--repeat` runs, throughput
+(bars/s, plus trades/s where trades are produced) and the tracemalloc peak of one extra run.
+`compare` flags benchmarks that got slower (or used more memory) than the baseline by more
+than the tolerance, and exits 1 if any did.
+"""
+from __future__ import annotations
+import argparse, json, os, platform, shutil, sys, tempfile, time, tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from src.data import load_csv, read_csv
+from src.entropy_engine import verdict_columns, verdict_from_series
+from src.execution import fill_trade, fill_trades
+from src.features import build_features, clear_feature_cache
+from src.metrics import compute_metrics
+from src.risk import RiskParams
+from src.scanner import multi_entry_scan
+from .synthetic import regime_ohlcv
+
+LOOP_TRADES = 20_000  # per-trade fill_trade reference is capped at this many trades
+
+
+class Case:
+    """Inputs shared by every benchmark of one size, built lazily."""
+
+    def __init__(self, n: int, seed: int, tmp: str):
+        self.n, self.seed, self.tmp = n, seed, tmp
+        self._df: Optional[pd.DataFrame] = None
+        self._csv: Optional[str] = None
+
+    @property
+    def df(self) -> pd.DataFrame:
+        if self._df is None:
+            self._df = regime_ohlcv(self.n, self.seed)
+        return self._df
+
+    @property
+    def csv(self) -> str:
+        if self._csv is None:
+            self._csv = os.path.join(self.tmp, f"bars_{self.n}.csv")
+            self.df.to_csv(self._csv, date_format="%Y-%m-%d %H:%M")
+        return self._csv
+
+    def trades(self, k: int) -> Tuple[np.ndarray, ...]:
+        rng = np.random.default_rng(self.seed)
+        high, low, close = (self.df[c].values for c in ("high", "low", "close"))
+        idx = np.sort(rng.integers(0, self.n - 1, size=k))
+        sgn = np.where(rng.random(k) < 0.5, 1.0, -1.0)
+        dist = close[idx] * rng.uniform(0.005, 0.03, k)
+        return idx, sgn, close[idx] - sgn * dist, close[idx] + sgn * dist * 2.5, high, low, close[idx]
+
+
+# Each benchmark: (setup(case) -> state, body(state) -> trades produced or None).
+def _scan_setup(c: Case):
+    return c.df, os.path.join(c.tmp, "scan")
+
+
+def _scan(state) -> int:
+    df, outdir = state
+    clear_feature_cache()
+    shutil.rmtree(outdir, ignore_errors=True)
+    return multi_entry_scan(df, "BENCH", RiskParams(), outdir=outdir)[0]
+
+
+def _fill_loop(state) -> int:
+    idx, sgn, stop, target, high, low, entry = state
+    for k in range(idx.size):
+        i = idx[k]
+        fill_trade(entry[k], "long" if sgn[k] > 0 else "short", stop[k], target[k],
+                   high[i + 1 : i + 65], low[i + 1 : i + 65])
+    return idx.size
+
+
+def _fill_batch(state) -> int:
+    idx, sgn, stop, target, high, low, entry = state
+    fill_trades(idx, sgn, stop, target, high, low, look_ahead_bars=64, entries=entry)
+    return idx.size
+
+
+def _metrics_setup(c: Case):
+    rng = np.random.default_rng(c.seed)
+    r = rng.normal(0.1, 1.5, c.n)
+    return [{"pnl": float(x) * 10.0, "verdict": {"R": float(x)}} for x in r.tolist()]
+
+
+def _load_warm_setup(c: Case):
+    load_csv(c.csv)  # writes the sidecar cache
+    return c.csv
+
+
+def _call(fn: Callable) -> Callable:
+    """Body that runs `fn(state)` and reports no trades."""
+    def body(state) -> None:
+        fn(state)
+    return body
+
+
+BENCHMARKS: Dict[str, Tuple[Callable, Callable]] = {
+    "multi_entry_scan": (_scan_setup, _scan),
+    "build_features": (lambda c: c.df, _call(build_features)),
+    "verdict_from_series": (lambda c: build_features(c.df).dphi, _call(verdict_from_series)),
+    "verdict_columns": (lambda c: build_features(c.df).dphi, _call(verdict_columns)),
+    "fill_trade": (lambda c: c.trades(min(LOOP_TRADES, c.n // 10)), _fill_loop),
+    "fill_trades": (lambda c: c.trades(c.n // 10), _fill_batch),
+    "compute_metrics": (_metrics_setup, _call(compute_metrics)),
+    "read_csv": (lambda c: c.csv, _call(read_csv)),
+    "load_csv_cached": (_load_warm_setup, _call(load_csv)),
+}
+
+
+def measure(body: Callable, state, repeat: int, memory: bool) -> Dict:
+    best, trades = float("inf"), None
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        trades = body(state)
+        best = min(best, time.perf_counter() - t0)
+    out = {"seconds": best}
+    if trades is not None:
+        out["trades"] = int(trades)
+        out["trades_per_s"] = trades / best if best > 0 else float("inf")
+    if memory:
+        tracemalloc.start()
+        try:
+            body(state)
+            out["peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+    return out
+
+
+def run(sizes, names, seed: int = 0, repeat: int = 3, memory: bool = True, log=print) -> Dict:
+    results: Dict[str, Dict] = {}
+    tmp = tempfile.mkdtemp(prefix="bench-")
+    try:
+        for n in sizes:
+            case = Case(n, seed, tmp)
+            for name in names:
+                setup, body = BENCHMARKS[name]
+                r = measure(body, setup(case), repeat, memory)
+                r.update(bench=name, n=n, bars_per_s=n / r["seconds"] if r["seconds"] > 0 else float("inf"))
+                results[f"{name}@{n}"] = r
+                log(_fmt(name, n, r))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return {"meta": {"created": datetime.now(timezone.utc).isoformat(timespec="seconds"), "seed": seed,
+                     "repeat": repeat, "python": sys.version.split()[0], "numpy": np.__version__,
+                     "pandas": pd.__version__, "machine": platform.platform()},
+            "results": results}
+
+
+def _fmt(name: str, n: int, r: Dict) -> str:
+    line = f"{name:<20} n={n:>10,} {r['seconds']:9.4f}s {r['bars_per_s']:14,.0f} bars/s"
+    if "trades_per_s" in r:
+        line += f" {r['trades_per_s']:12,.0f} trades/s"
+    if "peak_mb" in r:
+        line += f" peak={r['peak_mb']:8.1f} MB"
+    return line
+
+
+def compare(base: Dict, cur: Dict, tolerance: float = 0.2, mem_tolerance: float = 0.2) -> list:
+    """Rows (key, time ratio, memory ratio, regressed) for benchmarks present in both runs."""
+    rows = []
+    for key, c in cur["results"].items():
+        b = base["results"].get(key)
+        if b is None:
+            continue
+        t = c["seconds"] / b["seconds"] if b["seconds"] > 0 else 1.0
+        m = c["peak_mb"] / b["peak_mb"] if b.get("peak_mb") and "peak_mb" in c else None
+        bad = t > 1 + tolerance or (m is not None and m > 1 + mem_tolerance)
+        rows.append((key, t, m, bad))
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark suite with JSON baselines")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("run", help="run benchmarks and write a JSON result")
+    r.add_argument("--sizes", default="10000,100000,1000000", help="bar counts, up to 10000000")
+    r.add_argument("--bench", default=",".join(BENCHMARKS), help="comma-separated subset")
+    r.add_argument("--seed", type=int, default=0)
+    r.add_argument("--repeat", type=int, default=3)
+    r.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    r.add_argument("--out", default="artifacts/bench.json")
+    r.add_argument("--compare", default=None, help="baseline JSON to compare against after the run")
+    r.add_argument("--tolerance", type=float, default=0.2)
+    c = sub.add_parser("compare", help="compare a result JSON against a baseline")
+    c.add_argument("baseline")
+    c.add_argument("current")
+    c.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown, e.g. 0.2 = 20%%")
+    c.add_argument("--mem-tolerance", type=float, default=0.2)
+    args = ap.parse_args()
+
+    if args.cmd == "run":
+        names = [s.strip() for s in args.bench.split(",") if s.strip()]
+        unknown = sorted(set(names) - set(BENCHMARKS))
+        if unknown:
+            ap.error(f"unknown benchmarks {unknown}; choose from {list(BENCHMARKS)}")
+        res = run([int(float(s)) for s in args.sizes.split(",")], names, args.seed, args.repeat, not args.no_memory)
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(res, f, indent=2)
+        print(f"[BENCH] {len(res['results'])} results → {args.out}")
+        if not args.compare:
+            return
+        base_path, cur, tol, mem_tol = args.compare, res, args.tolerance, args.tolerance
+    else:
+        with open(args.current) as f:
+            cur = json.load(f)
+        base_path, tol, mem_tol = args.baseline, args.tolerance, args.mem_tolerance
+    with open(base_path) as f:
+        base = json.load(f)
+    rows = compare(base, cur, tol, mem_tol)
+    for key, t, m, bad in rows:
+        mem = f" mem x{m:5.2f}" if m is not None else ""
+        print(f"{'REGRESSION' if bad else 'ok':<10} {key:<32} time x{t:5.2f}{mem}")
+    regressed = [k for k, _, _, bad in rows if bad]
+    print(f"[BENCH] compared {len(rows)} vs {base_path}: {len(regressed)} regression(s)")
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+Deterministic regime-switching OHLCV for benchmarks. Calm stretches keep ΔΦ (ATR/close)
+under RECOV_EPS and volatile ones push it over NP_WALL. Isolated shock bars lift ΔΦ over
+NP_WALL for one ATR window and then drop it straight back under RECOV_EPS. So both the
+collapse and the recovery verdicts occur at any size.
+"""
+from __future__ import annotations
+import argparse
+import numpy as np
+import pandas as pd
+
+
+def regime_ohlcv(n: int, seed: int = 0, calm: float = 0.012, volatile: float = 0.12, switch: float = 0.004,
+                 shock: float = 0.002, start: str = "2020-01-01", freq: str = "1min") -> pd.DataFrame:
+    """
+    `n` bars alternating between calm and volatile regimes (mean run length 1/`switch` bars).
+    `calm`/`volatile` are the typical bar range as a fraction of price; a fraction `shock`
+    of bars gets an upper wick of 1.3–2× price.
+    """
+    rng = np.random.default_rng(seed)
+    state = np.cumsum(rng.random(n) < switch) % 2          # 0 calm, 1 volatile
+    vol = np.where(state == 1, volatile, calm)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.15, n) * vol))
+    open_ = np.r_[close[0], close[:-1]]
+    body_hi, body_lo = np.maximum(open_, close), np.minimum(open_, close)
+    wick = np.abs(rng.normal(0.0, 0.5, (2, n))) * vol * close
+    spikes = rng.random(n) < shock
+    wick[0, spikes] += rng.uniform(1.3, 2.0, int(spikes.sum())) * close[spikes]
+    idx = pd.date_range(start, periods=n, freq=freq, name="timestamp")
+    return pd.DataFrame({"open": open_, "high": body_hi + wick[0], "low": body_lo - wick[1], "close": close,
+                         "volume": rng.integers(100, 5000, n).astype(float)}, index=idx)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Write a seeded regime-switching OHLCV CSV")
+    ap.add_argument("--n", type=int, default=100_000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", required=True)
+    args = ap.parse_args()
+    regime_ohlcv(args.n, args.seed).to_csv(args.out, date_format="%Y-%m-%d %H:%M")
+    print(f"[OK] {args.n:,} bars → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,53 +1,37 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 import argparse, json, os
-import pandas as pd
-from .risk import RiskParams
-from .policy import DayPolicy
-from .scanner import multi_entry_scan
-
-def load_csv(path: str) -> pd.DataFrame:
-    df = pd.read_csv(path)
-    if "timestamp" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df = df.set_index("timestamp")
-    return df
-
-def main():
-    ap = argparse.ArgumentParser(description="A/B compare collapse vs recovery strategies")
-    ap.add_argument("--csv", required=True)
-    ap.add_argument("--symbol", default="ES")
-    ap.add_argument("--atr", type=int, default=14)
-    ap.add_argument("--lookahead", type=int, default=64)
-    ap.add_argument("--cooldown", type=int, default=10)
-    ap.add_argument("--max-trades", type=int, default=8)
-    ap.add_argument("--dd-r", type=float, default=-5.0)
-    ap.add_argument("--risk-pct", type=float, default=0.016)
-    ap.add_argument("--rr", type=float, default=2.5)
-    ap.add_argument("--atr-mult", type=float, default=1.5)
-    ap.add_argument("--rev-k", type=float, default=1.0)
-    ap.add_argument("--ma", type=int, default=20)
-    args = ap.parse_args()
-
-    df = load_csv(args.csv)
-    outA = f"artifacts/{args.symbol}_A"
-    outB = f"artifacts/{args.symbol}_B"
-    risk = RiskParams(risk_pct=args.risk_pct, rr=args.rr, atr_mult=args.atr_mult)
-    policy = DayPolicy(max_trades=args.max_trades, dd_limit_r=args.dd_r)
-
-    tradesA, R_A = multi_entry_scan(df, args.symbol, risk, outdir=outA, atr_period=args.atr,
-                                    look_ahead_bars=args.lookahead, cooldown_bars=args.cooldown,
-                                    day_policy=policy, mode="collapse")
-    tradesB, R_B = multi_entry_scan(df, args.symbol, risk, outdir=outB, atr_period=args.atr,
-                                    look_ahead_bars=args.lookahead, cooldown_bars=args.cooldown,
-                                    day_policy=policy, mode="recovery", rev_k=args.rev_k, ma_period=args.ma)
-
-    os.makedirs("artifacts", exist_ok=True)
-    with open("artifacts/ab_summary.json", "w") as f:
-        json.dump({"symbol": args.symbol,
-                   "A_collapse": {"trades": tradesA, "cumR": R_A},
-                   "B_recovery": {"trades": tradesB, "cumR": R_B}}, f, indent=2)
-    print(f"[A/B] collapse: trades={tradesA} cumR={R_A:.2f} | recovery: trades={tradesB} cumR={R_B:.2f}")
+from .cli import day_policy, risk_params, run_command, scan_cache
+
+
+def run(args: argparse.Namespace) -> None:
+    from .data import load_bars, load_csv
+    from .scanner import Variant, multi_variant_scan, parse_variant
+    from .features import feature_frame
+    from .profiling import profiled
+    from .resample import at_timeframe
+    with profiled(args):
+        base = Variant("base", rev_k=args.rev_k, ma_period=args.ma, risk=risk_params(args), day_policy=day_policy(args),
+                       look_ahead_bars=args.lookahead, cooldown_bars=args.cooldown)
+        specs = args.variant or ["A_collapse:mode=collapse", "B_recovery:mode=recovery"]
+        variants = [parse_variant(s, base) for s in specs]
+        # default pair keeps the historical ES_A / ES_B directories
+        outdirs = {v.name: f"artifacts/{args.symbol}_{v.name if args.variant else v.name[0]}" for v in variants}
+
+        df = at_timeframe(load_csv(args.csv), args.timeframe) if args.timeframe else load_bars(args.csv)
+        res = multi_variant_scan(df, args.symbol, variants, outdirs, atr_period=args.atr,
+                                 features=feature_frame(df, args.atr), cache=scan_cache(args))
+
+        os.makedirs("artifacts", exist_ok=True)
+        with open("artifacts/ab_summary.json", "w") as f:
+            json.dump({"symbol": args.symbol, **{name: {"trades": n, "cumR": r} for name, (n, r) in res.items()}},
+                      f, indent=2)
+        print("[A/B] " + " | ".join(f"{name}: trades={n} cumR={r:.2f}" for name, (n, r) in res.items()))
+
+
+def main(argv=None):
+    run_command("ab", run, argv)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+Integer day ids and trading-session ids for a whole DatetimeIndex, computed once in NumPy.
+
+Days follow the index's own clock: local days for tz-aware data, calendar days for naive
+data. A session is an opening time on a local clock, for example London 08:00
+Europe/London. Each instant belongs to the session that opened most recently, so the
+session boundaries move with each market's DST. Naive timestamps are taken as UTC.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+import numpy as np
+from .lazy import pandas as pd
+
+NS_PER_MIN = 60_000_000_000
+NS_PER_HOUR = 3_600_000_000_000
+NS_PER_DAY = 86_400_000_000_000
+
+
+@dataclass(frozen=True)
+class Session:
+    name: str
+    tz: str
+    start: str  # "HH:MM" on the session's local clock
+
+    @property
+    def start_min(self) -> int:
+        h, m = self.start.split(":")
+        return int(h) * 60 + int(m)
+
+
+DEFAULT_SESSIONS: Tuple[Session, ...] = (
+    Session("asia", "Asia/Tokyo", "09:00"),
+    Session("london", "Europe/London", "08:00"),
+    Session("ny", "America/New_York", "08:00"),
+)
+
+
+def utc_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    """Epoch ns in UTC (naive indexes are taken as UTC)."""
+    idx = index.tz_convert("UTC").tz_localize(None) if index.tz is not None else index
+    return idx.as_unit("ns").asi8
+
+
+def utc_offsets(hours: np.ndarray, tz: str) -> np.ndarray:
+    """UTC offset (minutes) of `tz` at each UTC hour (epoch hours). One zoneinfo lookup
+    per day boundary; only the hours of a day whose offset changes are looked up one by one."""
+    zone = ZoneInfo(tz)
+
+    def off(h: int) -> int:
+        return int(datetime.fromtimestamp(h * 3600, timezone.utc).astimezone(zone).utcoffset().total_seconds()) // 60
+
+    hours = np.asarray(hours, dtype=np.int64)
+    days, inverse = _distinct(hours // 24)
+    start = np.array([off(d * 24) for d in days.tolist()], dtype=np.int64)
+    out = start[inverse]
+    for k in np.flatnonzero(start != np.array([off(d * 24 + 24) for d in days.tolist()], dtype=np.int64)).tolist():
+        sel = np.flatnonzero(inverse == k)
+        out[sel] = [off(h) for h in hours[sel].tolist()]
+    return out
+
+
+def wall_ns(utc: np.ndarray, tz: Optional[str]) -> np.ndarray:
+    """Wall-clock epoch ns in `tz` of UTC epoch ns (unchanged for naive, tz=None)."""
+    utc = np.asarray(utc, dtype=np.int64)
+    if tz is None or utc.size == 0:
+        return utc
+    hours, inverse = _distinct(utc // NS_PER_HOUR)
+    return utc + utc_offsets(hours, tz)[inverse] * NS_PER_MIN
+
+
+def format_stamp(wall: int, off: Optional[int] = None) -> str:
+    """`str(pd.Timestamp)` of wall-clock epoch ns, with UTC offset `off` minutes (None: naive)."""
+    sec, ns = divmod(int(wall), 1_000_000_000)
+    out = str(np.datetime64(sec, "s")).replace("T", " ")
+    if ns:
+        out += f".{ns // 1000:06d}" if ns % 1000 == 0 else f".{ns:09d}"
+    if off is not None:
+        out += f"{'-' if off < 0 else '+'}{abs(off) // 60:02d}:{abs(off) % 60:02d}"
+    return out
+
+
+def session_ids_utc(utc: np.ndarray, sessions: Sequence[Session] = DEFAULT_SESSIONS) -> np.ndarray:
+    """Index into `sessions` of the most recently opened session at each UTC instant (epoch ns)."""
+    utc = np.asarray(utc, dtype=np.int64)
+    if utc.size == 0:
+        return np.zeros(0, dtype=np.int8)
+    # tz offsets only change on whole hours: look each distinct UTC hour up once
+    hours, inverse = _distinct(utc // NS_PER_HOUR)
+    minute = utc // NS_PER_MIN
+    since = np.empty((len(sessions), utc.size), dtype=np.int64)
+    for k, s in enumerate(sessions):
+        since[k] = (minute + utc_offsets(hours, s.tz)[inverse] - s.start_min) % 1440  # minutes since it last opened
+    return np.argmin(since, axis=0).astype(np.int8)
+
+
+def _distinct(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(distinct values, index of each element into them); a linear pass for sorted input."""
+    if np.all(x[1:] >= x[:-1]):
+        new = np.r_[True, x[1:] != x[:-1]]
+        return x[new], np.cumsum(new) - 1
+    return np.unique(x, return_inverse=True)
+
+
+class SessionClock:
+    """Scalar `session_ids_utc` for bar-at-a-time callers; tz offsets are cached per UTC hour."""
+
+    def __init__(self, sessions: Sequence[Session] = DEFAULT_SESSIONS):
+        self.sessions = tuple(sessions)
+        self._zones = [ZoneInfo(s.tz) for s in self.sessions]
+        self._starts = [s.start_min for s in self.sessions]
+        self._hour = None
+        self._offsets: List[int] = []
+
+    def __call__(self, utc: int) -> int:
+        hour = utc // NS_PER_HOUR
+        if hour != self._hour:
+            t = datetime.fromtimestamp(hour * 3600, timezone.utc)
+            self._offsets = [int(t.astimezone(z).utcoffset().total_seconds()) // 60 for z in self._zones]
+            self._hour = hour
+        minute = utc // NS_PER_MIN
+        best, best_k = 1440, 0
+        for k, (off, start) in enumerate(zip(self._offsets, self._starts)):
+            since = (minute + off - start) % 1440
+            if since < best:
+                best, best_k = since, k
+        return best_k
+
+
+@dataclass
+class CalendarIndex:
+    day: np.ndarray         # int64 day id per bar, 0..len(day_keys)-1
+    day_keys: List[str]     # ISO date per day id
+    session: np.ndarray     # int8 index into `sessions` per bar
+    sessions: Tuple[Session, ...]
+
+    @property
+    def n_days(self) -> int:
+        return len(self.day_keys)
+
+
+def day_ids(wall: np.ndarray) -> Tuple[np.ndarray, List[str]]:
+    """(day id per wall-clock epoch ns, ISO date per id); ids follow date order."""
+    d = np.asarray(wall, dtype=np.int64) // NS_PER_DAY
+    if d.size == 0:
+        return np.zeros(0, dtype=np.int64), []
+    days, ids = _distinct(d)
+    return ids.astype(np.int64), [str(x) for x in days.astype("datetime64[D]")]
+
+
+def calendar_index(index: pd.DatetimeIndex, sessions: Sequence[Session] = DEFAULT_SESSIONS) -> CalendarIndex:
+    wall = (index.tz_localize(None) if index.tz is not None else index).as_unit("ns").asi8
+    return _calendar(wall, utc_ns(index), sessions)
+
+
+def calendar_utc(utc: np.ndarray, tz: Optional[str], sessions: Sequence[Session] = DEFAULT_SESSIONS) -> CalendarIndex:
+    """`calendar_index` of bars given as UTC epoch ns and an IANA zone name (no pandas)."""
+    return _calendar(wall_ns(utc, tz), np.asarray(utc, dtype=np.int64), sessions)
+
+
+def _calendar(wall: np.ndarray, utc: np.ndarray, sessions: Sequence[Session]) -> CalendarIndex:
+    day, keys = day_ids(wall)
+    return CalendarIndex(day, keys, session_ids_utc(utc, sessions), tuple(sessions))
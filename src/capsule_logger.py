@@ -1,5 +1,5 @@
-import json, os, time
-from typing import Dict, Any
+import itertools, json, os, threading, uuid
+from typing import Dict, Any, List, Optional
 
 def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
@@ -9,11 +9,22 @@ def write_ndjson(path: str, obj: Dict[str, Any]) -> None:
     with open(path, "a", encoding="utf-8") as f:
         f.write(json.dumps(obj, separators=(",", ":")) + "\n")
 
+def _new_run() -> None:
+    """Per-process id prefix (also in forked children), so runs appending to one file never collide."""
+    global RUN_ID, _capsule_seq
+    RUN_ID, _capsule_seq = uuid.uuid4().hex[:8], itertools.count()
+
+_new_run()
+os.register_at_fork(after_in_child=_new_run)
+
+def new_capsule_id() -> str:
+    return f"TRADE⇌{RUN_ID}.{next(_capsule_seq)}"
+
 def trade_capsule(symbol: str, side: str, entry_px: float, exit_px: float,
-                  verdict: Dict[str, Any], t0: str, t1: str) -> dict:
+                  verdict: Dict[str, Any], t0: str, t1: str, capsule_id: Optional[str] = None) -> dict:
     pnl = (exit_px - entry_px) * (1 if side == "long" else -1)
     return {
-        "capsule_id": f"TRADE⇌{int(time.time())}",
+        "capsule_id": capsule_id or new_capsule_id(),
         "symbol": symbol,
         "side": side,
         "entry": entry_px,
@@ -23,3 +34,113 @@ def trade_capsule(symbol: str, side: str, entry_px: float, exit_px: float,
         "t0": t0,
         "t1": t1
     }
+
+
+class CapsuleSink:
+    """
+    Buffered NDJSON appender: `write` serializes into an in-memory buffer and a
+    background thread appends it in batches of `flush_size` lines or every
+    `flush_interval` seconds. The buffer holds at most `max_buffer` lines (writers
+    block when it is full). The file is opened once, on the first batch; `close()`
+    (or leaving the `with` block, also on exceptions) drains everything and
+    optionally fsyncs.
+    """
+
+    def __init__(self, path: str, flush_size: int = 4096, flush_interval: float = 1.0,
+                 max_buffer: int = 65536, fsync: bool = False):
+        self.path = path
+        self.flush_size = max(1, flush_size)
+        self.flush_interval = flush_interval
+        self.max_buffer = max(self.flush_size, max_buffer)
+        self.fsync = fsync
+        self.written = 0
+        self._buf: List[str] = []
+        self._cond = threading.Condition()
+        self._flush_req = 0    # flush() calls issued
+        self._flush_done = 0   # flush() calls whose lines are on disk
+        self._closing = False
+        self._f = None
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="capsule-sink", daemon=True)
+        self._thread.start()
+
+    def write(self, obj: Dict[str, Any]) -> None:
+        line = json.dumps(obj, separators=(",", ":")) + "\n"
+        with self._cond:
+            if self._closing:
+                raise ValueError("write to closed CapsuleSink")
+            while len(self._buf) >= self.max_buffer and self._error is None:
+                self._cond.wait()
+            if self._error is not None:
+                raise self._error
+            self._buf.append(line)
+            if len(self._buf) == self.flush_size:
+                self._cond.notify_all()
+
+    def flush(self) -> None:
+        """Block until every line written so far is in the file."""
+        with self._cond:
+            self._flush_req += 1
+            req = self._flush_req
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._flush_done >= req or not self._thread.is_alive())
+            if self._error is not None:
+                raise self._error
+
+    def close(self) -> None:
+        """Drain and close the file; raises a writer-thread error (once) if one occurred."""
+        with self._cond:
+            if self._closing:
+                return
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self) -> "CapsuleSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is None:
+            self.close()
+            return
+        try:
+            self.close()
+        except BaseException as err:  # keep the block's own exception; note the writer failure on it
+            exc.add_note(f"CapsuleSink writer also failed: {err!r}")
+
+    def _append(self, lines: List[str]) -> None:
+        if self._f is None:
+            ensure_dir(os.path.dirname(self.path))
+            self._f = open(self.path, "a", encoding="utf-8")
+        self._f.write("".join(lines))
+        self._f.flush()
+        self.written += len(lines)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closing or self._flush_req > self._flush_done or len(self._buf) >= self.flush_size,
+                    timeout=self.flush_interval)
+                lines, self._buf = self._buf, []
+                req, closing = self._flush_req, self._closing
+                self._cond.notify_all()  # wake writers blocked on a full buffer
+            if lines and self._error is None:
+                try:
+                    self._append(lines)
+                except BaseException as e:  # surfaced to the caller on its next write/flush/close
+                    self._error = e
+            if closing and self._f is not None:
+                try:
+                    if self.fsync:
+                        os.fsync(self._f.fileno())
+                    self._f.close()
+                except BaseException as e:
+                    self._error = self._error or e
+            with self._cond:
+                self._flush_done = req
+                self._cond.notify_all()
+            if closing:
+                return
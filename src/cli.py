@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+`python -m src <command>`: one entry point and one argument schema for the runners.
+
+Options shared by several commands are declared once here. A command's module is imported
+only after its arguments parse, and the runners import NumPy/pandas inside `run(args)`, so
+`--help` and argument errors cost no heavy imports. `multi` and `ab` read a CSV's binary
+cache (data.load_bars) and scan it without pandas; pandas loads only to parse a CSV the
+first time, to resample, or for confluence / tick / reference scans.
+"""
+from __future__ import annotations
+import argparse, importlib, sys
+from typing import Callable, Dict, List, Optional, Tuple
+from .profiling import add_profile_args
+
+
+def _source(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--csv", required=True)
+    ap.add_argument("--symbol", default="ES")
+
+
+def _timeframe(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--timeframe", default=None, help="resample the CSV first, e.g. 5m, 15m, 1h")
+
+
+def _atr(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--atr", type=int, default=14)
+
+
+def _day(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--max-trades", type=int, default=8)
+    ap.add_argument("--dd-r", type=float, default=-5.0)
+
+
+def _risk(ap: argparse.ArgumentParser, sizing: bool = True) -> None:
+    if sizing:
+        ap.add_argument("--risk-pct", type=float, default=0.016)
+    ap.add_argument("--rr", type=float, default=2.5)
+    ap.add_argument("--atr-mult", type=float, default=1.5)
+
+
+def _trade(ap: argparse.ArgumentParser, sizing: bool = True) -> None:
+    ap.add_argument("--lookahead", type=int, default=64)
+    ap.add_argument("--cooldown", type=int, default=10)
+    _day(ap)
+    _risk(ap, sizing)
+
+
+def _entry(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--rev-k", type=float, default=1.0)
+    ap.add_argument("--ma", type=int, default=20)
+
+
+def _mode(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--mode", choices=["collapse", "recovery"], default="collapse")
+
+
+def _rank(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--rank-by", default="cum_R", help="cum_R, avg_R, win_rate, profit_factor_R, sharpe_R or max_drawdown_R")
+
+
+def _workers(ap: argparse.ArgumentParser, help: str) -> None:
+    ap.add_argument("--workers", type=int, default=1, help=help)
+
+
+def _cache(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--no-cache", action="store_true", help="always re-run scans (skip the scan result cache)")
+    ap.add_argument("--cache-dir", default=None,
+                    help="scan result cache directory (default $ENTROPY_SCAN_CACHE or artifacts/.scan_cache)")
+    ap.add_argument("--cache-mb", type=float, default=512.0, help="evict least recently used results beyond this size")
+
+
+def _backtest(ap: argparse.ArgumentParser) -> None:
+    _source(ap)
+    ap.add_argument("--hud", action="store_true")
+    ap.add_argument("--report", action="store_true")
+    _timeframe(ap)
+
+
+def _multi(ap: argparse.ArgumentParser) -> None:
+    _source(ap)
+    _atr(ap)
+    _trade(ap)
+    ap.add_argument("--confirm-tf", default=None, help="confluence timeframe, e.g. 1h")
+    ap.add_argument("--confirm", default="⟿", help="glyphs the confluence timeframe must show")
+    ap.add_argument("--ticks", default=None, help="binary tick file for exact first-touch fills (see src/ticks.py)")
+    ap.add_argument("--chunk-rows", type=int, default=0,
+                    help="scan the CSV out of core in chunks of this many bars (same trades as in memory)")
+    _timeframe(ap)
+    _cache(ap)
+
+
+def _check_multi(ap: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.chunk_rows and (args.timeframe or args.confirm_tf or args.ticks):
+        ap.error("--chunk-rows cannot be combined with --timeframe, --confirm-tf or --ticks")
+
+
+def _ab(ap: argparse.ArgumentParser) -> None:
+    _source(ap)
+    _atr(ap)
+    _trade(ap)
+    _entry(ap)
+    ap.add_argument("--variant", action="append", default=[],
+                    help="NAME:key=v,... (repeatable); keys mode, rev_k, ma, rr, atr_mult, risk_pct, "
+                         "lookahead, cooldown, max_trades, dd_r, confirm_tf, confirm; unset keys take the flags above. "
+                         "Default: A_collapse and B_recovery")
+    _timeframe(ap)
+    _cache(ap)
+
+
+def _portfolio(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--csv", action="append", required=True,
+                    help="SYMBOL:path.csv (repeatable). Example: --csv ES:data/es.csv --csv NQ:data/nq.csv")
+    _atr(ap)
+    _trade(ap)
+    _workers(ap, "symbols scanned in parallel processes")
+    ap.add_argument("--max-rss", type=float, default=None,
+                    help="memory budget (MB) for symbols in flight; caps concurrency below --workers")
+    _timeframe(ap)
+    _cache(ap)
+
+
+def _wf(ap: argparse.ArgumentParser) -> None:
+    _source(ap)
+    _mode(ap)
+    ap.add_argument("--train-bars", type=int, default=0, help="in-sample bars per split (tuned with --grid)")
+    ap.add_argument("--test-bars", type=int, default=500)
+    ap.add_argument("--step-bars", type=int, default=250)
+    _trade(ap)
+    _entry(ap)
+    ap.add_argument("--grid", action="append", default=[],
+                    help="KEY=v1,v2,... swept on each train window (see the sweep command)")
+    _rank(ap)
+    _workers(ap, "process-parallel splits")
+    _timeframe(ap)
+    _cache(ap)
+
+
+def _check_rank(ap: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    from .sweep import RANK_KEYS
+    if args.rank_by not in RANK_KEYS:
+        ap.error(f"--rank-by must be one of {', '.join(RANK_KEYS)}")
+
+
+def _sweep(ap: argparse.ArgumentParser) -> None:
+    _source(ap)
+    _mode(ap)
+    _atr(ap)
+    ap.add_argument("--grid", action="append", default=[],
+                    help="KEY=v1,v2,... (repeatable); KEY in rr, atr_mult, lookahead, cooldown. "
+                         "Example: --grid rr=1.5,2,2.5,3 --grid cooldown=0,5,10")
+    _trade(ap, sizing=False)
+    _entry(ap)
+    _rank(ap)
+    ap.add_argument("--out", default="artifacts/sweep_results.csv")
+    _timeframe(ap)
+
+
+def _screen(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--csv", action="append", default=[], help="SYMBOL:path.csv (repeatable)")
+    ap.add_argument("--dir", default=None, help="also screen every *.csv here (symbol = file name)")
+    ap.add_argument("--bars", type=int, default=0, help="verdict over each symbol's last N bars (0 = whole history)")
+    _atr(ap)
+    ap.add_argument("--top", type=int, default=20, help="rows to print")
+    ap.add_argument("--out", default="artifacts/screen.csv")
+
+
+def _check_screen(ap: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if not args.csv and not args.dir:
+        ap.error("give --csv SYMBOL:path.csv or --dir")
+
+
+def _live(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--source", choices=["replay", "tail", "socket"], default="replay")
+    ap.add_argument("--csv", help="recorded CSV (replay) or growing CSV (tail)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int)
+    ap.add_argument("--unix", help="Unix socket path (socket source)")
+    ap.add_argument("--idle-timeout", type=float, default=None, help="tail: stop after this many idle seconds")
+    ap.add_argument("--symbol", default="ES")
+    _atr(ap)
+    _risk(ap)
+    ap.add_argument("--decisions", default="artifacts/live_decisions.ndjson", help="entry decisions (NDJSON)")
+    ap.add_argument("--out", default="artifacts/live_latency.json")
+
+
+def _check_live(ap: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.source in ("replay", "tail") and not args.csv:
+        ap.error(f"--source {args.source} needs --csv")
+    if args.source == "socket" and not (args.unix or args.port):
+        ap.error("--source socket needs --port or --unix")
+
+
+def _mc(ap: argparse.ArgumentParser) -> None:
+    src = ap.add_mutually_exclusive_group()
+    src.add_argument("--trades", default="artifacts/trades.ndjson", help="capsule NDJSON")
+    src.add_argument("--ledger", default=None, help="columnar ledger directory")
+    ap.add_argument("--paths", type=int, default=1_000_000)
+    ap.add_argument("--method", default="day", help="iid, block or day")
+    ap.add_argument("--block", type=int, default=5, help="trades per block for --method block")
+    ap.add_argument("--horizon", type=int, default=0, help="trades (iid/block) or days (day) per path; 0 = history")
+    ap.add_argument("--day-rules", action="store_true", help="re-apply --max-trades/--dd-r to every sampled day")
+    _day(ap)
+    ap.add_argument("--ruin-r", type=float, default=10.0, help="drawdown from start, in R, counted as ruin")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--chunk-mb", type=float, default=8.0, help="index block per chunk of paths")
+    ap.add_argument("--out", default="artifacts/montecarlo.json")
+
+
+def _check_mc(ap: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    from .montecarlo import METHODS
+    if args.method not in METHODS:
+        ap.error(f"--method must be one of {', '.join(METHODS)}")
+
+
+# command: (runner module, description, schema, extra validation)
+Schema = Callable[[argparse.ArgumentParser], None]
+Check = Optional[Callable[[argparse.ArgumentParser, argparse.Namespace], None]]
+COMMANDS: Dict[str, Tuple[str, str, Schema, Check]] = {
+    "backtest": ("backtest_runner", "Single-entry backtest on the last bars", _backtest, None),
+    "multi": ("multi_backtest", "Multi-entry backtest (daily clamp, cooldown)", _multi, _check_multi),
+    "ab": ("ab_runner", "A/B (or N-way) compare of strategy variants in one pass", _ab, None),
+    "portfolio": ("portfolio_runner", "Portfolio multi-entry backtest", _portfolio, None),
+    "wf": ("wf_runner", "Walk-forward evaluator", _wf, _check_rank),
+    "sweep": ("sweep_runner", "Parameter sweep (rr × atr_mult × lookahead × cooldown)", _sweep, _check_rank),
+    "screen": ("screen_runner", "Current ΔΦ verdict of a symbol universe, ranked", _screen, _check_screen),
+    "live": ("live_runner", "Drive EntropyStrategy.on_bar from a live or recorded feed", _live, _check_live),
+    "mc": ("montecarlo_runner", "Monte Carlo drawdown / risk-of-ruin on trade R sequences", _mc, _check_mc),
+}
+
+
+def command_parser(ap: argparse.ArgumentParser, command: str) -> argparse.ArgumentParser:
+    """Add `command`'s options to `ap` (also used by the daemon's thin client)."""
+    COMMANDS[command][2](ap)
+    add_profile_args(ap)
+    return ap
+
+
+def _parsers() -> Tuple[argparse.ArgumentParser, Dict[str, argparse.ArgumentParser]]:
+    ap = argparse.ArgumentParser(prog=f"python -m {__package__}", description="EntropyTraderBot backtests")
+    sub = ap.add_subparsers(dest="command", required=True, metavar="COMMAND")
+    subs = {name: command_parser(sub.add_parser(name, help=desc, description=desc), name)
+            for name, (_, desc, _, _) in COMMANDS.items()}
+    return ap, subs
+
+
+def build_parser() -> argparse.ArgumentParser:
+    return _parsers()[0]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap, subs = _parsers()
+    args = ap.parse_args(argv)
+    module, _, _, check = COMMANDS[args.command]
+    if check:
+        check(subs[args.command], args)
+    importlib.import_module(f"{__package__}.{module}").run(args)
+
+
+def run_command(command: str, run: Callable[[argparse.Namespace], None], argv: Optional[List[str]] = None) -> None:
+    """`main()` of a runner module: `python -m src.<runner> ...` is `python -m src <command> ...`."""
+    module, desc, _, check = COMMANDS[command]
+    ap = command_parser(argparse.ArgumentParser(prog=f"python -m {__package__}.{module}", description=desc), command)
+    args = ap.parse_args(sys.argv[1:] if argv is None else argv)
+    if check:
+        check(ap, args)
+    run(args)
+
+
+def risk_params(args: argparse.Namespace):
+    from .risk import RiskParams
+    return RiskParams(risk_pct=args.risk_pct, rr=args.rr, atr_mult=args.atr_mult)
+
+
+def day_policy(args: argparse.Namespace):
+    from .policy import DayPolicy
+    return DayPolicy(max_trades=args.max_trades, dd_limit_r=args.dd_r)
+
+
+def scan_cache(args: argparse.Namespace):
+    """ScanCache of `--cache-dir` / `--cache-mb`, None with `--no-cache`."""
+    from .scan_cache import DEFAULT_DIR, ScanCache
+    return None if args.no_cache else ScanCache(args.cache_dir or DEFAULT_DIR, int(args.cache_mb * (1 << 20)))
@@ -0,0 +1,394 @@
+# -*- coding: utf-8 -*-
+"""
+Resident backtest daemon: datasets stay loaded across jobs.
+
+    python -m src.daemon serve --budget-mb 4096 --workers 4 &
+    python -m src.daemon multi --csv data/es.csv --rr 3        # same flags as `python -m src multi`
+    python -m src.daemon portfolio --csv ES:data/es.csv --csv NQ:data/nq.csv
+    python -m src.daemon stats
+    python -m src.daemon shutdown
+
+The server keeps every CSV it has read in a DatasetStore: the OHLCV frame, its resampled
+levels and its feature columns (ATR, ΔΦ, verdicts) per ATR period. The store is bounded
+by a byte budget, and the least recently used dataset is evicted beyond it. The budget also
+covers the process-wide caches the scans fill on their own (`features.feature_frame`, e.g.
+wf's per-split features, and `resample.pyramid_for`): they get what the datasets leave and
+are trimmed after every job. A file that changed on disk is reloaded.
+
+A job (multi, ab, portfolio, wf) is one JSON line on a Unix domain socket. It runs on a
+thread pool and streams back NDJSON events: "progress" (one per portfolio symbol), then
+"done" or "error". Artifacts go under the client's working directory, in the runners'
+layout. The client is thin: it parses with the `python -m src` schema (cli.py), so it
+never imports NumPy or pandas.
+
+Jobs share the store without copies. The feature passes are vectorised, but the bar loop
+holds the GIL, so for CPU-bound fan-out give wf / portfolio `--workers` (process pools)
+rather than running many daemon workers.
+"""
+from __future__ import annotations
+import argparse, asyncio, json, os, socket, sys, tempfile, threading, time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from .cli import COMMANDS, command_parser, day_policy, risk_params, scan_cache
+from .lazy import pandas as pd
+
+DEFAULT_SOCKET = os.environ.get("ENTROPY_DAEMON_SOCKET",
+                                os.path.join(tempfile.gettempdir(), f"entropy-{os.getuid()}.sock"))
+DEFAULT_BUDGET = 2 << 30
+JOBS = ("multi", "ab", "portfolio", "wf")
+
+
+def _nbytes(item: Any) -> int:
+    """Resident size of a stored frame or FeatureFrame."""
+    if isinstance(item, pd.DataFrame):
+        return int(item.memory_usage(index=True).sum())
+    return item.nbytes
+
+
+class _Dataset:
+    __slots__ = ("sig", "items", "nbytes", "lock")
+
+    def __init__(self, sig: Tuple[int, int]):
+        self.sig = sig                   # (size, mtime_ns) of the CSV when loaded
+        self.items: Dict[tuple, Any] = {}
+        self.nbytes = 0
+        self.lock = threading.RLock()    # one build at a time per file; features build on the frame
+
+
+class DatasetStore:
+    """Frames and feature columns per CSV, shared by jobs; LRU-evicted beyond `budget` bytes."""
+
+    def __init__(self, budget: int = DEFAULT_BUDGET):
+        self.budget = budget
+        self._data: "OrderedDict[str, _Dataset]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def frame(self, path: str, timeframe: Optional[str] = None) -> pd.DataFrame:
+        """OHLCV frame of `path` (resampled to `timeframe`)."""
+        if not timeframe:
+            from .data import load_csv
+            return self._get(path, ("frame", None), lambda: load_csv(path))
+        from .resample import parse_timeframe, resample_level
+        return self._get(path, ("frame", timeframe),
+                         lambda: resample_level(self.frame(path), parse_timeframe(timeframe)).frame)
+
+    def features(self, path: str, timeframe: Optional[str] = None, atr_period: int = 14):
+        """FeatureFrame of `frame(path, timeframe)`."""
+        from .features import build_features
+        return self._get(path, ("features", timeframe, atr_period),
+                         lambda: build_features(self.frame(path, timeframe), atr_period))
+
+    def _get(self, path: str, key: tuple, build: Callable[[], Any]) -> Any:
+        path = os.path.abspath(path)
+        st = os.stat(path)
+        sig = (st.st_size, st.st_mtime_ns)
+        with self._lock:
+            ds = self._data.get(path)
+            if ds is None or ds.sig != sig:
+                ds = self._data[path] = _Dataset(sig)
+            self._data.move_to_end(path)
+        with ds.lock:
+            item = ds.items.get(key)
+            hit = item is not None
+            if not hit:
+                item = ds.items[key] = build()
+                ds.nbytes += _nbytes(item)
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._evict(keep=path)
+        return item
+
+    def trim(self) -> None:
+        """Bring the store and the shared feature / pyramid caches back within budget."""
+        with self._lock:
+            self._evict(keep=None)
+
+    def _evict(self, keep: Optional[str]) -> None:
+        """
+        Drop least recently used datasets while over budget; `keep` (in use) always stays.
+        The feature and pyramid caches are then trimmed, least recently used first, to what is left.
+        """
+        from .features import trim_feature_cache
+        from .resample import trim_pyramids
+        total = sum(ds.nbytes for ds in self._data.values())
+        for path in list(self._data):
+            if total <= self.budget:
+                break
+            if path != keep:
+                total -= self._data.pop(path).nbytes
+                self.evictions += 1
+        spare = max(0, self.budget - total)
+        trim_pyramids(spare - trim_feature_cache(spare))
+
+    def stats(self) -> Dict[str, Any]:
+        """`bytes` held by the datasets and `cache_bytes` by the shared feature / pyramid caches."""
+        from .features import feature_cache_bytes
+        from .resample import pyramid_cache_bytes
+        with self._lock:
+            return {"datasets": list(self._data), "bytes": sum(ds.nbytes for ds in self._data.values()),
+                    "cache_bytes": feature_cache_bytes() + pyramid_cache_bytes(), "budget": self.budget, "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def _write_json(path: str, obj: Dict) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(obj, f, indent=2)
+
+
+# job: (store, args, artifacts dir, emit) -> (result, the runner's summary line)
+Job = Callable[[DatasetStore, argparse.Namespace, str, Callable[[Dict], None]], Tuple[Dict, str]]
+
+
+def _multi(store: DatasetStore, args: argparse.Namespace, out: str, emit) -> Tuple[Dict, str]:
+    from .scanner import multi_entry_scan
+    from .ticks import TickFile
+    if args.chunk_rows:
+        raise ValueError("--chunk-rows is for one-off out-of-core runs; the daemon keeps datasets in memory")
+    trades, cumR = multi_entry_scan(
+        df=store.frame(args.csv, args.timeframe), symbol=args.symbol, risk=risk_params(args), outdir=out,
+        atr_period=args.atr, look_ahead_bars=args.lookahead, cooldown_bars=args.cooldown,
+        day_policy=day_policy(args), confirm_tf=args.confirm_tf, confirm_glyphs=args.confirm,
+        ticks=TickFile(args.ticks) if args.ticks else None,
+        features=store.features(args.csv, args.timeframe, args.atr),
+        cache=None if args.ticks else scan_cache(args),
+    )
+    res = {"symbol": args.symbol, "trades": trades, "cumR": cumR}
+    _write_json(os.path.join(out, "session_summary.json"), res)
+    return res, f"[OK] {args.symbol} trades={trades} cumR={cumR:.2f}"
+
+
+def _ab(store: DatasetStore, args: argparse.Namespace, out: str, emit) -> Tuple[Dict, str]:
+    from .scanner import Variant, multi_variant_scan, parse_variant
+    base = Variant("base", rev_k=args.rev_k, ma_period=args.ma, risk=risk_params(args), day_policy=day_policy(args),
+                   look_ahead_bars=args.lookahead, cooldown_bars=args.cooldown)
+    specs = args.variant or ["A_collapse:mode=collapse", "B_recovery:mode=recovery"]
+    variants = [parse_variant(s, base) for s in specs]
+    outdirs = {v.name: os.path.join(out, f"{args.symbol}_{v.name if args.variant else v.name[0]}") for v in variants}
+    res = multi_variant_scan(store.frame(args.csv, args.timeframe), args.symbol, variants, outdirs,
+                             atr_period=args.atr, features=store.features(args.csv, args.timeframe, args.atr),
+                             cache=scan_cache(args))
+    summary = {"symbol": args.symbol, **{name: {"trades": n, "cumR": r} for name, (n, r) in res.items()}}
+    _write_json(os.path.join(out, "ab_summary.json"), summary)
+    return summary, "[A/B] " + " | ".join(f"{name}: trades={n} cumR={r:.2f}" for name, (n, r) in res.items())
+
+
+def _portfolio(store: DatasetStore, args: argparse.Namespace, out: str, emit) -> Tuple[Dict, str]:
+    from .portfolio import ScanParams, run_portfolio
+    from .portfolio_runner import parse_symbol_map
+    symmap = parse_symbol_map(args.csv)
+    # the store resamples, so the scan gets the frame as is
+    params = ScanParams(risk=risk_params(args), day_policy=day_policy(args), atr_period=args.atr,
+                        look_ahead_bars=args.lookahead, cooldown_bars=args.cooldown, cache=scan_cache(args))
+    summary = run_portfolio(symmap, params, outroot=out, workers=args.workers,
+                            max_rss=None if args.max_rss is None else int(args.max_rss * 2**20),
+                            on_result=lambda sym, res: emit({"event": "progress", "symbol": sym, **res}),
+                            load=lambda path: store.frame(path, args.timeframe))
+    return summary, (f"[OK] Portfolio symbols={list(symmap.keys())} total_trades={summary['total_trades']} "
+                     f"net_R={summary['net_R']:.2f}")
+
+
+def _wf(store: DatasetStore, args: argparse.Namespace, out: str, emit) -> Tuple[Dict, str]:
+    from .walkforward import WFSpec, evaluate_walkforward
+    from .sweep import SweepGrid, parse_grid
+    grid = None
+    if args.grid:
+        grid = parse_grid(args.grid, SweepGrid(rr=(args.rr,), atr_mult=(args.atr_mult,),
+                                               look_ahead_bars=(args.lookahead,), cooldown_bars=(args.cooldown,)))
+    summary = evaluate_walkforward(
+        df=store.frame(args.csv, args.timeframe), symbol=args.symbol, outdir=os.path.join(out, "wf"),
+        wf=WFSpec(train_bars=args.train_bars, test_bars=args.test_bars, step_bars=args.step_bars),
+        mode=args.mode, risk=risk_params(args), look_ahead_bars=args.lookahead, cooldown_bars=args.cooldown,
+        day_policy=day_policy(args), rev_k=args.rev_k, ma_period=args.ma, workers=args.workers,
+        grid=grid, rank_by=args.rank_by, cache=scan_cache(args),
+    )
+    return summary, (f"[WF] splits={summary['splits']} total_trades={summary['total_trades']} "
+                     f"net_R={summary['net_R']:.2f}")
+
+
+JOB_FUNCS: Dict[str, Job] = {"multi": _multi, "ab": _ab, "portfolio": _portfolio, "wf": _wf}
+
+
+class Daemon:
+    """Unix-socket server running jobs against one DatasetStore on a `workers`-thread pool."""
+
+    def __init__(self, path: str = DEFAULT_SOCKET, budget: int = DEFAULT_BUDGET, workers: int = 2):
+        self.path = path
+        self.store = DatasetStore(budget)
+        self.workers = workers
+        self.jobs = 0
+        self._stop: Optional[asyncio.Event] = None
+
+    def _run_job(self, req: Dict, emit: Callable[[Dict], None]) -> None:
+        """Worker thread: run one job, then emit its "done" or "error" event and the end marker."""
+        t = time.perf_counter()
+        try:
+            args = argparse.Namespace(**req["args"])
+            if getattr(args, "profile", False):
+                raise ValueError("--profile is per process; profile a `python -m src` run instead")
+            cwd = req.get("cwd") or os.getcwd()
+            if not args.no_cache and not args.cache_dir:
+                from .scan_cache import DEFAULT_DIR
+                args.cache_dir = os.path.join(cwd, DEFAULT_DIR)
+            res, line = JOB_FUNCS[req["command"]](self.store, args, os.path.join(cwd, "artifacts"), emit)
+            emit({"event": "done", "result": res, "line": line, "seconds": time.perf_counter() - t})
+        except Exception as e:
+            emit({"event": "error", "error": f"{type(e).__name__}: {e}"})
+        finally:
+            self.store.trim()
+            emit(None)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        def send(ev: Dict) -> None:
+            writer.write((json.dumps(ev, default=str) + "\n").encode())
+
+        try:
+            req = json.loads(await reader.readline())
+            cmd = req.get("command")
+            if cmd == "stats":
+                send({"event": "done", "result": {**self.store.stats(), "jobs": self.jobs, "workers": self.workers}})
+            elif cmd == "shutdown":
+                send({"event": "done", "result": {}})
+                self._stop.set()
+            elif cmd in JOB_FUNCS:
+                self.jobs += 1
+                loop = asyncio.get_running_loop()
+                events: asyncio.Queue = asyncio.Queue()
+                send({"event": "accepted", "command": cmd})
+                loop.run_in_executor(self._pool, self._run_job, req,
+                                     lambda ev: loop.call_soon_threadsafe(events.put_nowait, ev))
+                while (ev := await events.get()) is not None:
+                    send(ev)
+                    await writer.drain()
+            else:
+                send({"event": "error", "error": f"unknown command {cmd!r}"})
+            await writer.drain()
+        except (ValueError, ConnectionError) as e:
+            try:
+                send({"event": "error", "error": f"{type(e).__name__}: {e}"})
+                await writer.drain()
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+    async def _serve(self, ready: Optional[threading.Event]) -> None:
+        self._stop = asyncio.Event()
+        server = await asyncio.start_unix_server(self._handle, path=self.path)
+        if ready:
+            ready.set()
+        async with server:
+            await self._stop.wait()
+
+    def serve(self, ready: Optional[threading.Event] = None) -> None:
+        """Serve until a "shutdown" request; `ready` is set once the socket accepts connections."""
+        if os.path.exists(self.path):
+            try:
+                DaemonClient(self.path).stats()
+            except OSError:
+                os.remove(self.path)        # stale socket of a daemon that did not shut down
+            else:
+                raise RuntimeError(f"a daemon is already listening on {self.path}")
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="daemon-job")
+        try:
+            asyncio.run(self._serve(ready))
+        finally:
+            self._pool.shutdown(wait=True)
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+class DaemonClient:
+    """Requests to a running Daemon; events are the decoded NDJSON lines."""
+
+    def __init__(self, path: str = DEFAULT_SOCKET):
+        self.path = path
+
+    def request(self, req: Dict) -> Iterator[Dict]:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.connect(self.path)
+            s.sendall((json.dumps(req) + "\n").encode())
+            with s.makefile("r", encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+
+    def submit(self, command: str, args: Dict, cwd: Optional[str] = None) -> Iterator[Dict]:
+        """Run a job; `args` are the command's parsed options (vars of the cli namespace)."""
+        return self.request({"command": command, "args": args, "cwd": cwd or os.getcwd()})
+
+    def stats(self) -> Dict:
+        return _last(self.request({"command": "stats"}))
+
+    def shutdown(self) -> None:
+        _last(self.request({"command": "shutdown"}))
+
+
+def _last(events: Iterator[Dict]) -> Dict:
+    ev = list(events)[-1]
+    if ev["event"] == "error":
+        raise RuntimeError(ev["error"])
+    return ev["result"]
+
+
+def _absolute(command: str, args: argparse.Namespace) -> None:
+    """The daemon has its own working directory: send file paths absolute."""
+    if command == "portfolio":
+        args.csv = [f"{p.split(':', 1)[0]}:{os.path.abspath(p.split(':', 1)[1])}" if ":" in p else p for p in args.csv]
+    else:
+        args.csv = os.path.abspath(args.csv)
+    if getattr(args, "ticks", None):
+        args.ticks = os.path.abspath(args.ticks)
+    if args.cache_dir:
+        args.cache_dir = os.path.abspath(args.cache_dir)
+
+
+def build_parser() -> Tuple[argparse.ArgumentParser, Dict[str, argparse.ArgumentParser]]:
+    ap = argparse.ArgumentParser(prog=f"python -m {__package__}.daemon", description="Resident backtest daemon")
+    ap.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path (default $ENTROPY_DAEMON_SOCKET)")
+    sub = ap.add_subparsers(dest="command", required=True, metavar="COMMAND")
+    srv = sub.add_parser("serve", help="run the daemon in the foreground")
+    srv.add_argument("--budget-mb", type=float, default=DEFAULT_BUDGET / 2**20,
+                     help="memory for resident datasets; least recently used beyond it are dropped")
+    srv.add_argument("--workers", type=int, default=2, help="jobs run concurrently")
+    sub.add_parser("stats", help="resident datasets, hits and evictions")
+    sub.add_parser("shutdown", help="stop the daemon once running jobs finish")
+    subs = {name: command_parser(sub.add_parser(name, help=COMMANDS[name][1], description=COMMANDS[name][1]), name)
+            for name in JOBS}
+    return ap, subs
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap, subs = build_parser()
+    args = ap.parse_args(argv)
+    if args.command == "serve":
+        Daemon(args.socket, int(args.budget_mb * 2**20), args.workers).serve()
+        return
+    client = DaemonClient(args.socket)
+    if args.command == "stats":
+        print(json.dumps(client.stats(), indent=2))
+        return
+    if args.command == "shutdown":
+        client.shutdown()
+        return
+    check = COMMANDS[args.command][3]
+    if check:
+        check(subs[args.command], args)
+    command = args.__dict__.pop("command")
+    args.__dict__.pop("socket")
+    _absolute(command, args)
+    for ev in client.submit(command, vars(args)):
+        if ev["event"] == "progress":
+            print(f"[..] {ev['symbol']} trades={ev['trades']} cumR={ev['cumR']:.2f}", flush=True)
+        elif ev["event"] == "done":
+            print(ev["line"])
+        elif ev["event"] == "error":
+            print(f"[ERR] {ev['error']}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Shared OHLCV loader. CSVs are parsed with explicit dtypes and timestamp format; the
+first load writes a sidecar binary cache (<csv>.cache/: one .npy per column plus int64
+epoch-ns timestamps) that later loads memory-map. The cache is keyed by file size,
+mtime and a content hash.
+"""
+from __future__ import annotations
+import hashlib, json, os, shutil, tempfile
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, Optional, Sequence
+import numpy as np
+from .calendar_index import NS_PER_HOUR, NS_PER_MIN, format_stamp, utc_offsets
+from .lazy import pandas as pd
+
+OHLCV_DTYPES = {"open": "float64", "high": "float64", "low": "float64", "close": "float64", "volume": "float64"}
+TS_COLUMN = "timestamp"
+TS_FORMAT = "ISO8601"
+CACHE_VERSION = 1
+_HASH_CHUNK = 1 << 22
+
+
+@dataclass
+class Bars:
+    """Column arrays of one OHLCV file; `ts` is epoch ns (UTC when `tz` is set), None without a timestamp column."""
+    columns: Dict[str, np.ndarray]
+    ts: Optional[np.ndarray] = None
+    tz: Optional[str] = None
+    meta: Dict = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def index(self) -> pd.Index:
+        if self.ts is None:
+            return pd.RangeIndex(len(self))
+        idx = pd.DatetimeIndex(np.asarray(self.ts).view("datetime64[ns]"), name=TS_COLUMN)
+        return idx.tz_localize("UTC").tz_convert(self.tz) if self.tz else idx
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({c: np.asarray(a) for c, a in self.columns.items()}, index=self.index())
+
+
+class BarStamps:
+    """`str(bars.index()[j])` without pandas, for the timestamps scans print into capsules."""
+
+    def __init__(self, bars: Bars):
+        self.ts, self.tz = bars.ts, bars.tz
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def __getitem__(self, j: int) -> str:
+        utc = int(self.ts[j])
+        if self.tz is None:
+            return format_stamp(utc)
+        off = int(utc_offsets(np.array([utc // NS_PER_HOUR]), self.tz)[0])
+        return format_stamp(utc + off * NS_PER_MIN, off)
+
+
+def file_hash(path: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_dir(path: str) -> str:
+    return path + ".cache"
+
+
+def read_csv(path: str, ts_format: str = TS_FORMAT) -> pd.DataFrame:
+    """Parse a CSV (no cache): explicit float64 OHLCV dtypes and timestamp format."""
+    head = pd.read_csv(path, nrows=0)
+    dtypes = {c: t for c, t in OHLCV_DTYPES.items() if c in head.columns}
+    return _index_ts(pd.read_csv(path, dtype=dtypes, engine="c"), ts_format)
+
+
+def _index_ts(df: pd.DataFrame, ts_format: str) -> pd.DataFrame:
+    if TS_COLUMN in df.columns:
+        try:
+            ts = pd.to_datetime(df[TS_COLUMN], format=ts_format)
+        except ValueError:  # mixed UTC offsets
+            ts = pd.to_datetime(df[TS_COLUMN], format=ts_format, utc=True)
+        df[TS_COLUMN] = ts
+        df = df.set_index(TS_COLUMN)
+    return df
+
+
+def _frame_to_bars(df: pd.DataFrame) -> Bars:
+    cols = {c: np.ascontiguousarray(df[c].values) for c in df.columns}
+    if not isinstance(df.index, pd.DatetimeIndex):
+        return Bars(cols)
+    idx = df.index
+    tz = None if idx.tz is None else str(idx.tz)
+    if tz:
+        idx = idx.tz_convert("UTC").tz_localize(None)
+    return Bars(cols, idx.as_unit("ns").asi8.copy(), tz)
+
+
+def _cache_valid(path: str, meta: Dict) -> bool:
+    st = os.stat(path)
+    if meta.get("version") != CACHE_VERSION or meta.get("size") != st.st_size:
+        return False
+    if meta.get("mtime_ns") == st.st_mtime_ns:
+        return True
+    if meta.get("hash") != file_hash(path):
+        return False
+    # touched but unchanged content: remember the new mtime so the next load skips the hash
+    meta["mtime_ns"] = st.st_mtime_ns
+    _write_meta(cache_dir(path), meta)
+    return True
+
+
+def _write_meta(d: str, meta: Dict) -> None:
+    tmp = os.path.join(d, "meta.json.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(d, "meta.json"))
+    except OSError:
+        pass  # read-only cache: stays valid, just re-hashed next time
+
+
+def _read_cache(path: str, columns: Optional[Sequence[str]] = None) -> Optional[Bars]:
+    d = cache_dir(path)
+    try:
+        with open(os.path.join(d, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if not _cache_valid(path, meta):
+            return None
+        cols = {c: np.load(os.path.join(d, f"col_{i}.npy"), mmap_mode="r") for i, c in enumerate(meta["columns"])
+                if columns is None or c in columns}
+        ts = np.load(os.path.join(d, "ts.npy"), mmap_mode="r") if meta["has_ts"] else None
+    except (OSError, ValueError, KeyError):
+        return None
+    return Bars(cols, ts, meta.get("tz"), meta)
+
+
+def _write_cache(path: str, bars: Bars) -> None:
+    if not all(np.asarray(a).dtype.kind in "biuf" for a in bars.columns.values()):
+        return  # only numeric frames are cached
+    d = cache_dir(path)
+    st = os.stat(path)
+    meta = {"version": CACHE_VERSION, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "hash": file_hash(path),
+            "columns": list(bars.columns), "has_ts": bars.ts is not None, "tz": bars.tz, "rows": len(bars)}
+    try:
+        tmp = tempfile.mkdtemp(prefix=os.path.basename(d) + ".tmp", dir=os.path.dirname(os.path.abspath(path)))
+    except OSError:
+        return  # read-only data directory: just don't cache
+    try:
+        for i, a in enumerate(bars.columns.values()):
+            np.save(os.path.join(tmp, f"col_{i}.npy"), np.ascontiguousarray(a))
+        if bars.ts is not None:
+            np.save(os.path.join(tmp, "ts.npy"), bars.ts)
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        shutil.rmtree(d, ignore_errors=True)
+        os.replace(tmp, d)
+    except OSError:
+        pass  # another process won the race, or the disk is read-only
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def load_bars(path: str, cache: bool = True, ts_format: str = TS_FORMAT,
+              columns: Optional[Sequence[str]] = None) -> Bars:
+    """
+    Column arrays for `path`; memory-mapped from the sidecar cache when it is valid.
+    `columns` limits which columns a valid cache maps (a fresh parse returns them all).
+    """
+    if cache:
+        bars = _read_cache(path, columns)
+        if bars is not None:
+            return bars
+    bars = _frame_to_bars(read_csv(path, ts_format))
+    if cache:
+        _write_cache(path, bars)
+    return bars
+
+
+def load_csv(path: str, cache: bool = True, ts_format: str = TS_FORMAT) -> pd.DataFrame:
+    """OHLCV DataFrame indexed by timestamp (when present); shared by every runner."""
+    if not cache:
+        return read_csv(path, ts_format)
+    bars = load_bars(path, cache=True, ts_format=ts_format)
+    return bars.to_frame()
+
+
+def iter_frames(path: str, chunk_rows: int = 1_000_000, ts_format: str = TS_FORMAT) -> Iterator[pd.DataFrame]:
+    """
+    OHLCV DataFrames of at most `chunk_rows` rows, in file order, for out-of-core scans.
+    Slices the memory-mapped sidecar cache when it is valid; otherwise the CSV is parsed
+    chunk by chunk (and no cache is written, which would need the whole file in memory).
+    Each CSV chunk parses its timestamps on its own, so a file mixing UTC offsets should
+    be cached once with `load_bars` first.
+    """
+    bars = _read_cache(path)
+    if bars is not None:
+        for s in range(0, len(bars), chunk_rows):
+            part = Bars({c: a[s: s + chunk_rows] for c, a in bars.columns.items()},
+                        None if bars.ts is None else bars.ts[s: s + chunk_rows], bars.tz)
+            yield part.to_frame()
+        return
+    head = pd.read_csv(path, nrows=0)
+    dtypes = {c: t for c, t in OHLCV_DTYPES.items() if c in head.columns}
+    for chunk in pd.read_csv(path, dtype=dtypes, engine="c", chunksize=chunk_rows):
+        yield _index_ts(chunk, ts_format)
@@ -2,10 +2,12 @@
 from __future__ import annotations
 import numpy as np
 from dataclasses import dataclass
+from .indicators import ATR
 
 NP_WALL = 0.09
 RECOV_EPS = 0.045
 RECOV_WIN = 8  # bars
+GLYPHS = ("⚖", "⟿", "☑")  # glyph codes 0, 1, 2 used by column-wise verdicts
 
 @dataclass
 class Verdict:
@@ -16,13 +18,8 @@ class Verdict:
     delta_phi: float
 
 def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> np.ndarray:
-    prev_close = np.r_[close[0], close[:-1]]
-    tr = np.maximum.reduce([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
-    period = min(period, tr.size)
-    kernel = np.ones(period) / period
-    atr_val = np.convolve(tr, kernel, mode='same')
-    atr_val[:period] = np.maximum.accumulate(atr_val[:period])
-    return atr_val[:tr.size]
+    # trailing mean of true range (causal; bit-identical to ATR(period).update per bar)
+    return ATR(period).compute(high, low, close)
 
 def delta_phi(atr_vals: np.ndarray, close: np.ndarray) -> np.ndarray:
     # normalize ATR by close to approximate “entropy” scale
@@ -47,3 +44,94 @@ def verdict_from_series(dphi: np.ndarray) -> Verdict:
 
     glyph = "⟿" if (np_wall and no_recovery and not sat_like) else ("⚖" if sat_like else "☑")
     return Verdict(np_wall, no_recovery, sat_like, glyph, float(dphi[-1]))
+
+
+def verdict_columns(dphi: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Verdict of every prefix dphi[: i + 1] at once: (np_wall, no_recovery, sat_like, glyph_code),
+    with glyph_code indexing GLYPHS. Row i equals `verdict_from_series(dphi[: i + 1])`.
+    """
+    pos = np.arange(dphi.size)
+    last_spike = np.maximum.accumulate(np.where(dphi > NP_WALL, pos, -1))
+    np_wall = last_spike >= 0
+    # recovered iff nothing above RECOV_EPS in (last_spike, min(i, last_spike + RECOV_WIN)]
+    last_bad = np.maximum.accumulate(np.where(~(dphi <= RECOV_EPS), pos, -1))
+    tail_end = np.minimum(pos, last_spike + RECOV_WIN)
+    recovered = np_wall & (pos > last_spike) & (last_bad[tail_end] == last_spike)
+    no_recovery = ~recovered
+    with np.errstate(invalid="ignore"):
+        sat_like = np.logical_and.accumulate(np.r_[True, np.diff(dphi) <= 1e-9][: dphi.size])
+    glyph = np.where(np_wall & no_recovery & ~sat_like, 1, np.where(sat_like, 0, 2)).astype(np.int8)
+    return np_wall, no_recovery, sat_like, glyph
+
+
+class ChunkedVerdict:
+    """
+    `verdict_columns` over a series fed in chunks: rows returned by `extend(chunk)` equal
+    the rows of `verdict_columns` on the whole series so far. Keeps the last RECOV_WIN + 1
+    ΔΦ values (enough to see a spike and its recovery tail across the boundary) plus the
+    verdict flags at the end of the previous chunk.
+    """
+
+    def __init__(self) -> None:
+        self.tail = np.empty(0)
+        self.np_wall = False
+        self.recovered = False
+        self.sat_like = True
+
+    def extend(self, dphi: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        k = self.tail.size
+        x = np.r_[self.tail, np.asarray(dphi, dtype=float)]
+        np_wall, no_recovery, sat_like, _ = (c[k:] for c in verdict_columns(x))
+        if self.np_wall:
+            # no spike in the carried tail or after it yet: the older spike's tail is complete
+            old = ~np_wall
+            no_recovery = np.where(old, not self.recovered, no_recovery)
+            np_wall = np.ones_like(np_wall)
+        sat_like = sat_like & self.sat_like
+        glyph = np.where(np_wall & no_recovery & ~sat_like, 1, np.where(sat_like, 0, 2)).astype(np.int8)
+        if x.size:
+            self.tail = x[-(RECOV_WIN + 1):].copy()
+        if np_wall.size:
+            self.np_wall, self.recovered, self.sat_like = bool(np_wall[-1]), not no_recovery[-1], bool(sat_like[-1])
+        return np_wall, no_recovery, sat_like, glyph
+
+
+class StreamingVerdict:
+    """
+    Incremental twin of `verdict_from_series`: feed ΔΦ one bar at a time with
+    `update(x)`; `verdict()` equals `verdict_from_series` over everything fed so far.
+    O(1) state: last NP_WALL spike, recovery tail after it, running non-increasing flag.
+    """
+    __slots__ = ("n", "np_wall", "tail_len", "tail_ok", "sat_like", "last")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.np_wall = False
+        self.tail_len = 0      # bars seen after the last spike, capped at RECOV_WIN
+        self.tail_ok = True    # every tail bar so far <= RECOV_EPS
+        self.sat_like = True
+        self.last = 0.0
+
+    def update(self, x: float) -> None:
+        if self.n and not (x - self.last <= 1e-9):
+            self.sat_like = False
+        if x > NP_WALL:
+            self.np_wall = True
+            self.tail_len = 0
+            self.tail_ok = True
+        elif self.np_wall and self.tail_len < RECOV_WIN:
+            self.tail_len += 1
+            if not (x <= RECOV_EPS):
+                self.tail_ok = False
+        self.last = x
+        self.n += 1
+
+    def verdict(self) -> Verdict:
+        if self.n == 0:
+            return Verdict(False, False, True, "⚖", 0.0)
+        recovered = self.np_wall and self.tail_len > 0 and self.tail_ok
+        no_recovery = not recovered
+        sat_like = self.sat_like
+        glyph = "⟿" if (self.np_wall and no_recovery and not sat_like) else ("⚖" if sat_like else "☑")
+        return Verdict(self.np_wall, no_recovery, sat_like, glyph, float(self.last))
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-from typing import Literal, Tuple
+from typing import Literal, Optional, Tuple
 import numpy as np
 
 ExitReason = Literal["target", "stop", "time"]
@@ -47,3 +47,80 @@ def fill_trade(
     # Timeout: exit at last bar mid-price
     last_close = (float(highs[-1]) + float(lows[-1])) * 0.5 if n > 0 else entry
     return (last_close, "time", n)
+
+
+EXIT_REASONS: Tuple[ExitReason, ...] = ("target", "stop", "time")  # reason codes for fill_trades
+
+
+def fill_trades(
+    entry_idx: np.ndarray,
+    sides: np.ndarray,
+    stops: np.ndarray,
+    targets: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    look_ahead_bars: int = 64,
+    max_bars: int = 200,
+    stop_first: bool = True,
+    entries: Optional[np.ndarray] = None,
+    chunk_cells: int = 1 << 21,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Batched `fill_trade`: trade k enters at the close of bar entry_idx[k] and sees
+    high/low[entry_idx[k] + 1 : entry_idx[k] + 1 + look_ahead_bars] (full-series arrays).
+    `sides` holds "long"/"short" (or +1/-1). Returns (exit_price, reason_code, bars_held)
+    with reason_code indexing EXIT_REASONS; results equal per-trade `fill_trade` calls.
+    `entries` is only needed for trades with no bars after entry (time exit at entry).
+    """
+    idx = np.asarray(entry_idx, dtype=np.int64)
+    sides = np.asarray(sides)
+    is_long = (sides == "long") if sides.dtype.kind in "UO" else (sides > 0)
+    stops = np.asarray(stops, dtype=float)
+    targets = np.asarray(targets, dtype=float)
+    hi = np.asarray(high, dtype=float)
+    lo = np.asarray(low, dtype=float)
+    n_bars, t = hi.size, idx.size
+
+    width = max(0, min(look_ahead_bars, max_bars))
+    avail = np.clip(np.minimum(look_ahead_bars, n_bars - 1 - idx), 0, None)  # bars in the look-ahead slice
+    n_scan = np.minimum(avail, max_bars)
+
+    exit_px = np.empty(t)
+    reason = np.full(t, 2, dtype=np.int8)
+    bars = n_scan.copy()
+
+    # time exits: mid of the last bar of the look-ahead slice (entry price if the slice is empty)
+    last = np.clip(idx + avail, 0, max(0, n_bars - 1))
+    if n_bars:
+        exit_px[:] = (hi[last] + lo[last]) * 0.5
+    empty = avail == 0
+    if empty.any():
+        if entries is None:
+            raise ValueError("entries is required when a trade has no bars after entry")
+        exit_px[empty] = np.asarray(entries, dtype=float)[empty]
+
+    if width and t:
+        pad = np.full(width, np.nan)
+        win_hi = np.lib.stride_tricks.sliding_window_view(np.r_[hi, pad], width)
+        win_lo = np.lib.stride_tricks.sliding_window_view(np.r_[lo, pad], width)
+        step = max(1, chunk_cells // width)
+        cols = np.arange(width)
+        for s in range(0, t, step):
+            sl = slice(s, min(t, s + step))
+            rows = np.clip(idx[sl] + 1, 0, n_bars)
+            h, l = win_hi[rows], win_lo[rows]
+            lg = is_long[sl, None]
+            st, tg = stops[sl, None], targets[sl, None]
+            inside = cols < n_scan[sl, None]
+            hit_stop = np.where(lg, l <= st, h >= st) & inside
+            hit_tgt = np.where(lg, h >= tg, l <= tg) & inside
+            first = (hit_stop | hit_tgt).argmax(axis=1)
+            r = np.arange(first.size)
+            s_hit, t_hit = hit_stop[r, first], hit_tgt[r, first]
+            done = s_hit | t_hit
+            take_stop = s_hit if stop_first else (s_hit & ~t_hit)
+            seg_px, seg_reason, seg_bars = exit_px[sl], reason[sl], bars[sl]
+            seg_px[done] = np.where(take_stop, stops[sl], targets[sl])[done]
+            seg_reason[done] = np.where(take_stop, 1, 0)[done]
+            seg_bars[done] = first[done] + 1
+    return exit_px, reason, bars
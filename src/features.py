@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""Per-bar feature columns computed once per (data, atr_period) and shared by every scan."""
+from __future__ import annotations
+import hashlib, threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List
+import numpy as np
+from .lazy import pandas as pd
+from .entropy_engine import atr, delta_phi, verdict_columns, Verdict, GLYPHS
+from .calendar_index import calendar_index, calendar_utc
+from .data import Bars
+from .session import weight_table
+from .indicators import RollingSMA
+
+
+@dataclass
+class FeatureFrame:
+    close: np.ndarray
+    atr: np.ndarray
+    dphi: np.ndarray
+    np_wall: np.ndarray
+    no_recovery: np.ndarray
+    sat_like: np.ndarray
+    glyph: np.ndarray          # int8 codes into entropy_engine.GLYPHS
+    day: np.ndarray            # int day ids, 0..len(day_keys)-1
+    day_keys: List[str]        # ISO date per day id
+    session_w: np.ndarray      # session position-size multiplier per bar (DST-aware sessions)
+    _sma: Dict[int, np.ndarray] = field(default_factory=dict, repr=False)
+
+    def __len__(self) -> int:
+        return self.close.size
+
+    @property
+    def nbytes(self) -> int:
+        """Resident size of the columns, computed SMAs included."""
+        arrays = [v for v in vars(self).values() if isinstance(v, np.ndarray)] + list(self._sma.values())
+        return sum(a.nbytes for a in arrays)
+
+    def sma(self, period: int) -> np.ndarray:
+        """Trailing simple moving average of close (expanding mean during warmup)."""
+        if period not in self._sma:
+            self._sma[period] = RollingSMA(period).compute(self.close)
+        return self._sma[period]
+
+    def verdict(self, i: int) -> Verdict:
+        return Verdict(bool(self.np_wall[i]), bool(self.no_recovery[i]), bool(self.sat_like[i]),
+                       GLYPHS[self.glyph[i]], float(self.dphi[i]))
+
+
+def build_features(df: pd.DataFrame | Bars, atr_period: int = 14) -> FeatureFrame:
+    """Feature columns of a DataFrame, or of `Bars` arrays without pandas (same result as `bars.to_frame()`)."""
+    bars = isinstance(df, Bars)
+    high, low, close = (np.array(df.columns[c] if bars else df[c].values, dtype=float) for c in ("high", "low", "close"))
+    a = atr(high, low, close, atr_period)
+    dphi = delta_phi(a, close)
+    np_wall, no_recovery, sat_like, glyph = verdict_columns(dphi)
+    if bars and df.ts is not None or not bars and isinstance(df.index, pd.DatetimeIndex):
+        cal = calendar_utc(df.ts, df.tz) if bars else calendar_index(df.index)
+        day, day_keys = cal.day, cal.day_keys
+        w = weight_table()[cal.session]
+    else:
+        day, day_keys = np.zeros(close.size, dtype=np.int64), [""]
+        w = np.ones(close.size)
+    return FeatureFrame(close, a, dphi, np_wall, no_recovery, sat_like, glyph, day, day_keys, w)
+
+
+def data_fingerprint(df: pd.DataFrame | Bars) -> str:
+    """Content hash of the bars; `Bars` hash equal to their `to_frame()`."""
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(df, Bars) and df.ts is None:
+        df = df.to_frame()
+    bars = isinstance(df, Bars)
+    if bars:
+        h.update(str(df.tz).encode())
+        h.update(np.ascontiguousarray(df.ts, dtype=np.int64).tobytes())
+    elif isinstance(df.index, pd.DatetimeIndex):
+        h.update(str(df.index.tz).encode())
+        h.update(df.index.as_unit("ns").asi8.tobytes())
+    else:
+        h.update(pd.util.hash_pandas_object(df.index).values.tobytes())
+    for c in ("high", "low", "close"):
+        h.update(np.ascontiguousarray(df.columns[c] if bars else df[c].values, dtype=float).tobytes())
+    return h.hexdigest()
+
+
+_CACHE: "OrderedDict[tuple, FeatureFrame]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+CACHE_SIZE = 32
+
+
+def feature_frame(df: pd.DataFrame | Bars, atr_period: int = 14) -> FeatureFrame:
+    """LRU-cached `build_features`, keyed by data content and parameters."""
+    key = (data_fingerprint(df), atr_period)
+    with _CACHE_LOCK:
+        ff = _CACHE.get(key)
+        if ff is not None:
+            _CACHE.move_to_end(key)
+            return ff
+    ff = build_features(df, atr_period)
+    with _CACHE_LOCK:
+        _CACHE[key] = ff
+        while len(_CACHE) > CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    return ff
+
+
+def clear_feature_cache() -> None:
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+def feature_cache_bytes() -> int:
+    with _CACHE_LOCK:
+        return sum(ff.nbytes for ff in _CACHE.values())
+
+
+def trim_feature_cache(max_bytes: int) -> int:
+    """Drop least recently used entries until the cache holds at most `max_bytes`; returns the bytes kept."""
+    with _CACHE_LOCK:
+        held = sum(ff.nbytes for ff in _CACHE.values())
+        while held > max_bytes:
+            held -= _CACHE.popitem(last=False)[1].nbytes
+    return held
@@ -1,10 +1,268 @@
 from __future__ import annotations
+import copy, math
+from abc import ABC, abstractmethod
+from collections import deque
 import numpy as np
 
+# Rolling kernels: `update(x)` advances one bar in O(1); `extend(xs)` advances many bars
+# vectorized from the current state; `compute(xs)` runs `extend` on a fresh copy.
+# All three produce bit-identical values, and every output at bar i only uses bars <= i.
+
+
+class _Kernel(ABC):
+    @abstractmethod
+    def reset(self) -> None:
+        """Return to the state before the first bar."""
+
+    def compute(self, *xs: np.ndarray) -> np.ndarray:
+        k = copy.copy(self)
+        k.reset()
+        return k.extend(*xs)
+
+
+class RollingSMA(_Kernel):
+    """Trailing mean over `period` bars (expanding mean during warmup), via running sums."""
+
+    def __init__(self, period: int):
+        self.period = max(1, int(period))
+        self.reset()
+
+    def reset(self) -> None:
+        self.n = 0
+        self._total = 0.0
+        self._hist: deque = deque(maxlen=self.period)  # last `period` running totals
+
+    def update(self, x: float) -> float:
+        old = self._hist[0] if self.n >= self.period else 0.0
+        self._total += x
+        self._hist.append(self._total)
+        self.n += 1
+        if self.n <= self.period:
+            return self._total / self.n
+        return (self._total - old) / self.period
+
+    def extend(self, xs: np.ndarray) -> np.ndarray:
+        xs = np.asarray(xs, dtype=float)
+        if xs.size == 0:
+            return np.empty(0)
+        p, n0, prev = self.period, self.n, np.array(self._hist, dtype=float)
+        c = np.cumsum(np.r_[self._total, xs])[1:]
+        out = c / np.arange(n0 + 1, n0 + xs.size + 1)
+        full = np.arange(n0, n0 + xs.size) >= p
+        if full.any():
+            allc = np.r_[prev, c]
+            k = np.flatnonzero(full)
+            out[k] = (c[k] - allc[prev.size + k - p]) / p
+        self._total = float(c[-1])
+        self._hist.extend(c[-p:].tolist())
+        self.n += xs.size
+        return out
+
+
+class RollingEMA(_Kernel):
+    """EMA with alpha = 2 / (period + 1), seeded with the first value."""
+
+    def __init__(self, period: int):
+        self.period = max(1, int(period))
+        self.alpha = 2.0 / (self.period + 1)
+        self.reset()
+
+    def reset(self) -> None:
+        self.n = 0
+        self.value = 0.0
+
+    def update(self, x: float) -> float:
+        self.value = x if self.n == 0 else self.value + self.alpha * (x - self.value)
+        self.n += 1
+        return self.value
+
+    def extend(self, xs: np.ndarray) -> np.ndarray:
+        # recursive filter: a tight scalar loop is the only bit-exact form
+        return np.array([self.update(x) for x in np.asarray(xs, dtype=float).tolist()], dtype=float)
+
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray, prev_close: float | None = None) -> np.ndarray:
+    """True range; the first bar uses its own close when no previous close is given."""
+    high, low, close = (np.asarray(a, dtype=float) for a in (high, low, close))
+    if close.size == 0:
+        return np.empty(0)
+    pc = np.r_[close[0] if prev_close is None else prev_close, close[:-1]]
+    return np.maximum.reduce([high - low, np.abs(high - pc), np.abs(low - pc)])
+
+
+def _tr(h: float, l: float, pc: float) -> float:
+    return max(h - l, abs(h - pc), abs(l - pc))
+
+
+class ATR(_Kernel):
+    """Trailing simple average of true range over `period` bars."""
+
+    def __init__(self, period: int = 14):
+        self.period = max(1, int(period))
+        self.reset()
+
+    def reset(self) -> None:
+        self.prev_close: float | None = None
+        self._sma = RollingSMA(self.period)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tr = _tr(high, low, close if self.prev_close is None else self.prev_close)
+        self.prev_close = close
+        return self._sma.update(tr)
+
+    def extend(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        tr = true_range(high, low, close, self.prev_close)
+        if tr.size:
+            self.prev_close = float(close[-1])
+        return self._sma.extend(tr)
+
+
+class WilderATR(_Kernel):
+    """Wilder's ATR: mean true range over the first `period` bars, then a 1/period smoother."""
+
+    def __init__(self, period: int = 14):
+        self.period = max(1, int(period))
+        self.reset()
+
+    def reset(self) -> None:
+        self.n = 0
+        self.value = 0.0
+        self.prev_close: float | None = None
+
+    def update(self, high: float, low: float, close: float) -> float:
+        tr = _tr(high, low, close if self.prev_close is None else self.prev_close)
+        self.prev_close = close
+        self.n += 1
+        self.value += (tr - self.value) / min(self.n, self.period)
+        return self.value
+
+    def extend(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+        h, l, c = (np.asarray(a, dtype=float).tolist() for a in (high, low, close))
+        return np.array([self.update(*bar) for bar in zip(h, l, c)], dtype=float)
+
+
+class _RollingExtreme(_Kernel):
+    _fill = 0.0
+
+    def __init__(self, period: int):
+        self.period = max(1, int(period))
+        self.reset()
+
+    def reset(self) -> None:
+        self.n = 0
+        self._win: deque = deque(maxlen=self.period)   # raw values in the window
+        self._mono: deque = deque()                    # (bar, value) candidates, best first
+
+    @abstractmethod
+    def _beats(self, a: float, b: float) -> bool:
+        """True when `a` stays ahead of a later `b` in the window."""
+
+    def update(self, x: float) -> float:
+        while self._mono and not self._beats(self._mono[-1][1], x):
+            self._mono.pop()
+        self._mono.append((self.n, x))
+        if self._mono[0][0] <= self.n - self.period:
+            self._mono.popleft()
+        self._win.append(x)
+        self.n += 1
+        return self._mono[0][1]
+
+    @abstractmethod
+    def _reduce(self, windows: np.ndarray) -> np.ndarray:
+        """Row-wise extreme of a (n, period) window view."""
+
+    def extend(self, xs: np.ndarray) -> np.ndarray:
+        xs = np.asarray(xs, dtype=float)
+        if xs.size == 0:
+            return np.empty(0)
+        prev = np.array(self._win, dtype=float)
+        padded = np.r_[np.full(self.period - 1, self._fill), prev, xs]
+        windows = np.lib.stride_tricks.sliding_window_view(padded, self.period)
+        out = self._reduce(windows[prev.size:])
+        # rebuild the O(1) state from the new window
+        start = self.n + xs.size
+        self.reset()
+        self.n = start - min(start, self.period)
+        for x in np.r_[prev, xs][-self.period:].tolist():
+            self.update(x)
+        return out
+
+
+class RollingMax(_RollingExtreme):
+    """Trailing max over `period` bars (monotonic deque)."""
+    _fill = -np.inf
+
+    def _beats(self, a: float, b: float) -> bool:
+        return a > b
+
+    def _reduce(self, windows: np.ndarray) -> np.ndarray:
+        return windows.max(axis=1)
+
+
+class RollingMin(_RollingExtreme):
+    """Trailing min over `period` bars (monotonic deque)."""
+    _fill = np.inf
+
+    def _beats(self, a: float, b: float) -> bool:
+        return a < b
+
+    def _reduce(self, windows: np.ndarray) -> np.ndarray:
+        return windows.min(axis=1)
+
+
+class RollingStd(_Kernel):
+    """Trailing population std over `period` bars; sums are shifted by the first value for stability."""
+
+    def __init__(self, period: int):
+        self.period = max(1, int(period))
+        self.reset()
+
+    def reset(self) -> None:
+        self.n = 0
+        self.shift: float | None = None
+        self._s1 = 0.0
+        self._s2 = 0.0
+        self._hist: deque = deque(maxlen=self.period)  # (s1, s2) running totals
+
+    def update(self, x: float) -> float:
+        if self.shift is None:
+            self.shift = x
+        o1, o2 = self._hist[0] if self.n >= self.period else (0.0, 0.0)
+        d = x - self.shift
+        self._s1 += d
+        self._s2 += d * d
+        self._hist.append((self._s1, self._s2))
+        self.n += 1
+        cnt = min(self.n, self.period)
+        mean = (self._s1 - o1) / cnt
+        return math.sqrt(max((self._s2 - o2) / cnt - mean * mean, 0.0))
+
+    def extend(self, xs: np.ndarray) -> np.ndarray:
+        xs = np.asarray(xs, dtype=float)
+        if xs.size == 0:
+            return np.empty(0)
+        if self.shift is None:
+            self.shift = float(xs[0])
+        p, n0 = self.period, self.n
+        prev = np.array(self._hist, dtype=float).reshape(-1, 2)
+        d = xs - self.shift
+        s1 = np.cumsum(np.r_[self._s1, d])[1:]
+        s2 = np.cumsum(np.r_[self._s2, d * d])[1:]
+        g = np.arange(n0, n0 + xs.size)
+        o1, o2 = np.zeros(xs.size), np.zeros(xs.size)
+        k = np.flatnonzero(g >= p)
+        if k.size:
+            a1, a2 = np.r_[prev[:, 0], s1], np.r_[prev[:, 1], s2]
+            o1[k], o2[k] = a1[prev.shape[0] + k - p], a2[prev.shape[0] + k - p]
+        cnt = np.minimum(g + 1, p)
+        mean = (s1 - o1) / cnt
+        out = np.sqrt(np.maximum((s2 - o2) / cnt - mean * mean, 0.0))
+        self._s1, self._s2 = float(s1[-1]), float(s2[-1])
+        self._hist.extend(zip(s1[-p:].tolist(), s2[-p:].tolist()))
+        self.n += xs.size
+        return out
+
+
 def sma(x: np.ndarray, period: int) -> np.ndarray:
-    period = max(1, min(period, x.size))
-    k = np.ones(period) / period
-    y = np.convolve(x, k, mode="same")
-    # warmup stabilize
-    y[:period] = np.maximum.accumulate(y[:period])
-    return y
+    """Trailing SMA (no lookahead); expanding mean for the first period - 1 bars."""
+    return RollingSMA(period).compute(x)
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+Deferred imports for heavy dependencies. `from .lazy import pandas as pd` binds a module
+whose body runs on the first attribute access, so importing a runner (or `--help`) does not
+pay for pandas, and code paths that never touch `pd.` (binary-cache scans) never load it.
+"""
+from __future__ import annotations
+import importlib.util, sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """`name` from sys.modules if already imported, else a module executed on first use."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+pandas = lazy_import("pandas")
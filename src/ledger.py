@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+Columnar trade ledger: one directory of append-only segments, each column a
+fixed-width .npy file readable through np.memmap without copies. Low-cardinality
+string columns are dictionary-encoded (int32 codes; the dictionaries are append-only
+text files next to meta.json), capsule ids are stored per segment as a UTF-8 blob plus
+end offsets, and timestamps are int64 epoch ns. Per-row `present` / `null` bitmasks
+record which capsule fields were absent or None, so NDJSON round-trips are lossless for
+capsules of the `capsule_logger.trade_capsule` schema; other keys are rejected.
+"""
+from __future__ import annotations
+import json, numbers, os, shutil, tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+import numpy as np
+from .lazy import pandas as pd
+
+# (column, dtype, capsule path); verdict fields are nested under "verdict"
+SCHEMA = [
+    ("capsule_id", "<i8", ("capsule_id",)),   # end offsets into capsule_id.bin
+    ("symbol", "<i4", ("symbol",)),
+    ("side", "<i4", ("side",)),
+    ("entry", "<f8", ("entry",)),
+    ("exit", "<f8", ("exit",)),
+    ("pnl", "<f8", ("pnl",)),
+    ("glyph", "<i4", ("verdict", "glyph")),
+    ("np_wall", "?", ("verdict", "np_wall")),
+    ("no_recovery", "?", ("verdict", "no_recovery")),
+    ("sat_like", "?", ("verdict", "sat_like")),
+    ("dphi_last", "<f8", ("verdict", "ΔΦ_last")),
+    ("size", "<i8", ("verdict", "size")),
+    ("stop", "<f8", ("verdict", "stop")),
+    ("target", "<f8", ("verdict", "target")),
+    ("exit_reason", "<i4", ("verdict", "exit_reason")),
+    ("bars_held", "<i8", ("verdict", "bars_held")),
+    ("R", "<f8", ("verdict", "R")),
+    ("t0", "<i8", ("t0",)),
+    ("t1", "<i8", ("t1",)),
+    ("t0_off", "<i2", ()),     # UTC offset (minutes) printed with t0; NO_TZ for naive stamps
+    ("t1_off", "<i2", ()),
+    ("present", "<u4", ()),    # bit k: field of FIELDS[k] was in the capsule
+    ("null", "<u4", ()),       # bit k: field of FIELDS[k] was None
+]
+LEDGER_DTYPE = np.dtype([(name, dt) for name, dt, _ in SCHEMA])
+FIELDS = [(name, path) for name, _, path in SCHEMA if path]
+VERDICT_BIT = len(FIELDS)      # "verdict" dict itself present
+DICT_COLUMNS = ("symbol", "side", "glyph", "exit_reason")
+STRING_COLUMNS = ("capsule_id",)
+TIME_COLUMNS = ("t0", "t1")
+NO_TZ = np.iinfo(np.int16).min
+LEDGER_VERSION = 2
+_META = "meta.json"
+_TOP_KEYS = {p[0] for _, p in FIELDS}
+_VERDICT_KEYS = {p[1] for _, p in FIELDS if p[0] == "verdict"}
+
+
+def _get(cap: Dict[str, Any], path: tuple) -> tuple[bool, Any]:
+    v: Any = cap
+    for k in path:
+        if not isinstance(v, dict) or k not in v:
+            return False, None
+        v = v[k]
+    return True, v
+
+
+def _check_keys(cap: Dict[str, Any]) -> None:
+    extra = set(cap) - _TOP_KEYS
+    v = cap.get("verdict")
+    if isinstance(v, dict):
+        extra |= {f"verdict.{k}" for k in set(v) - _VERDICT_KEYS}
+    elif "verdict" in cap:
+        raise ValueError(f"capsule verdict must be a dict, got {v!r}")
+    if extra:
+        raise ValueError(f"capsule fields not in the ledger schema: {sorted(extra)}")
+
+
+def _parse_times(values: List[Any]) -> tuple[np.ndarray, np.ndarray]:
+    """Timestamp strings → (wall-clock ns, UTC offset minutes or NO_TZ)."""
+    s = pd.Series([None if v is None else str(v) for v in values], dtype=object)
+    parts = s.str.extract(r"^(.*?)(?:([+-])(\d{2}):(\d{2}))?$")
+    local = pd.to_datetime(parts[0], format="ISO8601")
+    ns = local.astype("datetime64[ns]").to_numpy().view(np.int64).copy()
+    sign = parts[1].map({"+": 1, "-": -1})
+    off = sign * (pd.to_numeric(parts[2]) * 60 + pd.to_numeric(parts[3]))
+    return ns, off.fillna(NO_TZ).to_numpy(dtype=np.int16)
+
+
+def _format_times(ns: np.ndarray, off: np.ndarray) -> List[Optional[str]]:
+    out: List[Optional[str]] = []
+    for t, o in zip(pd.to_datetime(np.asarray(ns, dtype=np.int64), unit="ns"), np.asarray(off).tolist()):
+        if t is pd.NaT:
+            out.append(None)
+        elif o == NO_TZ:
+            out.append(str(t))
+        else:
+            out.append(f"{t}{'-' if o < 0 else '+'}{abs(o) // 60:02d}:{abs(o) % 60:02d}")
+    return out
+
+
+def _dict_path(root: str, name: str) -> str:
+    return os.path.join(root, f"dict_{name}.txt")
+
+
+def _load_meta(path: str) -> Dict[str, Any]:
+    with open(os.path.join(path, _META), encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("version") != LEDGER_VERSION:
+        raise ValueError(f"ledger {path} has version {meta.get('version')}, expected {LEDGER_VERSION}; rebuild it")
+    return meta
+
+
+class Ledger:
+    """Read side. `column(name)` memory-maps only that column's files; dictionaries load on first use."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.meta = _load_meta(path)
+        self._dicts: Dict[str, List[str]] = {}
+
+    @property
+    def segments(self) -> List[Dict[str, Any]]:
+        return self.meta["segments"]
+
+    def __len__(self) -> int:
+        return sum(s["rows"] for s in self.segments)
+
+    def segment_column(self, k: int, name: str) -> np.ndarray:
+        return np.load(os.path.join(self.path, self.segments[k]["dir"], f"{name}.npy"), mmap_mode="r")
+
+    def column(self, name: str) -> np.ndarray:
+        """Whole column; zero-copy memmap for a single segment, one concatenation otherwise.
+        String columns (capsule_id) come back as an object array of str / None."""
+        if name not in LEDGER_DTYPE.names:
+            raise KeyError(name)
+        if name in STRING_COLUMNS:
+            return np.array([s for k in range(len(self.segments)) for s in self.segment_strings(k, name)], dtype=object)
+        parts = [self.segment_column(k, name) for k in range(len(self.segments))]
+        if not parts:
+            return np.empty(0, dtype=LEDGER_DTYPE[name])
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def segment_strings(self, k: int, name: str) -> List[Optional[str]]:
+        ends = self.segment_column(k, name).tolist()
+        null = self.segment_column(k, "null")
+        bit = np.uint32(1 << [n for n, _ in FIELDS].index(name))
+        with open(os.path.join(self.path, self.segments[k]["dir"], f"{name}.bin"), "rb") as f:
+            blob = f.read()
+        starts = [0] + ends[:-1]
+        return [None if null[i] & bit else blob[a:b].decode("utf-8") for i, (a, b) in enumerate(zip(starts, ends))]
+
+    def dictionary(self, name: str) -> List[str]:
+        if name not in self._dicts:
+            nbytes = self.meta["dicts"][name]["bytes"]
+            if not nbytes:
+                return self._dicts.setdefault(name, [])
+            with open(_dict_path(self.path, name), "rb") as f:
+                text = f.read(nbytes).decode("utf-8")
+            self._dicts[name] = [json.loads(line) for line in text.splitlines()]
+        return self._dicts[name]
+
+    def decoded(self, name: str) -> np.ndarray:
+        """Dictionary column as an object array of strings (None for missing)."""
+        vocab = np.array(self.dictionary(name) + [None], dtype=object)
+        return vocab[self.column(name)]  # code -1 → None
+
+    def iter_capsules(self) -> Iterator[Dict[str, Any]]:
+        dicts = {name: self.dictionary(name) for name in DICT_COLUMNS}
+        for k in range(len(self.segments)):
+            cols = {name: self.segment_column(k, name) for name in LEDGER_DTYPE.names if name not in STRING_COLUMNS}
+            strings = {name: self.segment_strings(k, name) for name in STRING_COLUMNS}
+            yield from _to_capsules(cols, strings, dicts)
+
+
+def _to_capsules(cols: Dict[str, np.ndarray], strings: Dict[str, List], dicts: Dict[str, List[str]]
+                 ) -> Iterator[Dict[str, Any]]:
+    py: Dict[str, list] = dict(strings)
+    for name, _ in FIELDS:
+        if name in STRING_COLUMNS:
+            continue
+        if name in DICT_COLUMNS:
+            vocab = dicts[name] + [None]
+            py[name] = [vocab[c] for c in cols[name].tolist()]
+        elif name in TIME_COLUMNS:
+            py[name] = _format_times(cols[name], cols[f"{name}_off"])
+        else:
+            py[name] = cols[name].tolist()
+    present, null = cols["present"].tolist(), cols["null"].tolist()
+    for i in range(len(present)):
+        cap: Dict[str, Any] = {}
+        has, nul = present[i], null[i]
+        for k, (name, path) in enumerate(FIELDS):
+            if path[0] == "verdict" and not (has >> VERDICT_BIT) & 1:
+                continue
+            if not (has >> k) & 1:
+                if path[0] == "verdict":
+                    cap.setdefault("verdict", {})
+                continue
+            v = None if (nul >> k) & 1 else py[name][i]
+            if path[0] == "verdict":
+                cap.setdefault("verdict", {})[path[1]] = v
+            else:
+                cap[path[0]] = v
+        yield cap
+
+
+_FILL = {"?": False, "<i8": 0}
+_TYPE_OK = {"?": lambda v: isinstance(v, (bool, np.bool_)),
+            "<i8": lambda v: isinstance(v, numbers.Integral) and not isinstance(v, (bool, np.bool_))}
+
+
+class LedgerWriter:
+    """Append side: every `append` call writes one new segment atomically."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, _META)):
+            self.meta = _load_meta(path)
+            led = Ledger(path)
+            vocab = {c: list(led.dictionary(c)) for c in DICT_COLUMNS}
+        else:
+            self.meta = {"version": LEDGER_VERSION, "dtype": LEDGER_DTYPE.descr,
+                         "dicts": {c: {"n": 0, "bytes": 0} for c in DICT_COLUMNS}, "segments": []}
+            vocab = {c: [] for c in DICT_COLUMNS}
+        self._vocab = vocab
+        self._codes = {c: {v: i for i, v in enumerate(vocab[c])} for c in DICT_COLUMNS}
+        self._drop_orphans()
+
+    def _drop_orphans(self) -> None:
+        """Remove segments and temp dirs of an append that crashed before meta.json listed them."""
+        listed = {s["dir"] for s in self.segments}
+        for e in os.scandir(self.path):
+            if e.is_dir() and (e.name.startswith(".tmp_") or e.name.startswith("seg_") and e.name not in listed):
+                shutil.rmtree(e.path, ignore_errors=True)
+
+    def _encode(self, name: str, values: Iterable[Any]) -> np.ndarray:
+        codes, vocab = self._codes[name], self._vocab[name]
+        out = []
+        for v in values:
+            if v is None:
+                out.append(-1)
+                continue
+            v = str(v)
+            c = codes.get(v)
+            if c is None:
+                c = codes[v] = len(vocab)
+                vocab.append(v)
+            out.append(c)
+        return np.array(out, dtype=np.int32)
+
+    def append(self, capsules: List[Dict[str, Any]]) -> int:
+        """Append NDJSON-schema capsules (dicts) as one segment; returns rows written.
+        Raises ValueError for keys outside the schema or values of the wrong type."""
+        if not capsules:
+            return 0
+        for c in capsules:
+            _check_keys(c)
+        cols: Dict[str, np.ndarray] = {}
+        present = np.zeros(len(capsules), dtype=np.uint32)
+        null = np.zeros(len(capsules), dtype=np.uint32)
+        present |= np.array([isinstance(c.get("verdict"), dict) for c in capsules], dtype=np.uint32) << VERDICT_BIT
+        blobs: Dict[str, bytes] = {}
+        for k, (name, path) in enumerate(FIELDS):
+            dt = LEDGER_DTYPE[name].str if LEDGER_DTYPE[name].kind != "b" else "?"
+            got = [_get(c, path) for c in capsules]
+            has = np.array([h for h, _ in got], dtype=bool)
+            raw = [v for _, v in got]
+            isnull = has & np.array([v is None for v in raw], dtype=bool)
+            present |= has.astype(np.uint32) << k
+            null |= isnull.astype(np.uint32) << k
+            if name in STRING_COLUMNS:
+                enc = [b"" if v is None else str(v).encode("utf-8") for v in raw]
+                cols[name] = np.cumsum([len(b) for b in enc], dtype=np.int64)
+                blobs[name] = b"".join(enc)
+            elif name in DICT_COLUMNS:
+                cols[name] = self._encode(name, raw)
+            elif name in TIME_COLUMNS:
+                cols[name], cols[f"{name}_off"] = _parse_times(raw)
+            elif dt in _FILL:
+                for v in raw:
+                    if v is not None and not _TYPE_OK[dt](v):
+                        raise ValueError(f"{name}: expected {'bool' if dt == '?' else 'int'}, got {v!r}")
+                cols[name] = np.array([_FILL[dt] if v is None else v for v in raw], dtype=LEDGER_DTYPE[name])
+            else:
+                cols[name] = np.array([np.nan if v is None else float(v) for v in raw], dtype=float)
+        cols["present"], cols["null"] = present, null
+        return self._write_segment(cols, blobs)
+
+    def append_columns(self, cols: Dict[str, np.ndarray], blobs: Optional[Dict[str, bytes]] = None) -> int:
+        """Append already-encoded columns (dict codes, epoch ns, string end offsets + `blobs`) as one segment.
+        `present` / `null` default to every field present and non-null."""
+        rows = len(cols["R"])
+        cols = dict(cols)
+        cols.setdefault("present", np.full(rows, (1 << (VERDICT_BIT + 1)) - 1, dtype=np.uint32))
+        cols.setdefault("null", np.zeros(rows, dtype=np.uint32))
+        return self._write_segment(cols, blobs or {name: b"" for name in STRING_COLUMNS})
+
+    def _write_segment(self, cols: Dict[str, np.ndarray], blobs: Dict[str, bytes]) -> int:
+        rows = len(cols["R"])
+        if rows == 0:
+            return 0
+        seg = f"seg_{len(self.segments):06d}"
+        tmp = tempfile.mkdtemp(prefix=".tmp_", dir=self.path)
+        try:
+            for name in LEDGER_DTYPE.names:
+                a = np.ascontiguousarray(cols[name], dtype=LEDGER_DTYPE[name])
+                if a.shape != (rows,):
+                    raise ValueError(f"column {name} has shape {a.shape}, expected ({rows},)")
+                np.save(os.path.join(tmp, f"{name}.npy"), a)
+            for name in STRING_COLUMNS:
+                with open(os.path.join(tmp, f"{name}.bin"), "wb") as f:
+                    f.write(blobs[name])
+            os.replace(tmp, os.path.join(self.path, seg))
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self._write_dicts()
+        self.meta["segments"].append({"dir": seg, "rows": rows})
+        self._write_meta()
+        return rows
+
+    @property
+    def segments(self) -> List[Dict[str, Any]]:
+        return self.meta["segments"]
+
+    def _write_dicts(self) -> None:
+        # append-only; meta.json (written after) holds the committed byte length of each file,
+        # so bytes left by an append that never reached meta.json are cut off first
+        for name in DICT_COLUMNS:
+            vocab, committed = self._vocab[name], self.meta["dicts"][name]
+            new = "".join(json.dumps(v, ensure_ascii=False) + "\n" for v in vocab[committed["n"]:]).encode("utf-8")
+            with open(_dict_path(self.path, name), "ab") as f:
+                f.truncate(committed["bytes"])
+                f.write(new)
+            self.meta["dicts"][name] = {"n": len(vocab), "bytes": committed["bytes"] + len(new)}
+
+    def _write_meta(self) -> None:
+        tmp = os.path.join(self.path, _META + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, ensure_ascii=False)
+        os.replace(tmp, os.path.join(self.path, _META))
+
+
+def ndjson_to_ledger(src: str, dst: str, segment_rows: int = 1_000_000) -> Ledger:
+    """Stream a trades.ndjson into a ledger directory (appending if it exists)."""
+    w = LedgerWriter(dst)
+    batch: List[Dict[str, Any]] = []
+    with open(src, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                batch.append(json.loads(line))
+            if len(batch) >= segment_rows:
+                w.append(batch)
+                batch = []
+    w.append(batch)
+    return Ledger(dst)
+
+
+def ledger_to_ndjson(src: str, dst: str) -> int:
+    """Write a ledger back out as NDJSON capsules; returns lines written."""
+    n = 0
+    d = os.path.dirname(dst)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    with open(dst, "w", encoding="utf-8") as f:
+        for cap in Ledger(src).iter_capsules():
+            f.write(json.dumps(cap, separators=(",", ":")) + "\n")
+            n += 1
+    return n
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Asyncio bar feeds for `EntropyStrategy.on_bar`: tail a growing CSV, read CSV lines from a
+local socket, or replay a recorded frame. Every source goes through `run_feed`, which
+times each decision with `perf_counter_ns`.
+"""
+from __future__ import annotations
+import asyncio, time
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+import numpy as np
+from .lazy import pandas as pd
+from .data import TS_COLUMN
+from .strategy import Bar, EntropyStrategy
+
+BAR_FIELDS = (TS_COLUMN, "open", "high", "low", "close", "volume")
+_EPOCH = datetime(1970, 1, 1)
+
+
+def utc_ns(text: str) -> int:
+    """ISO-8601 timestamp → epoch ns in UTC (naive timestamps are taken as UTC)."""
+    dt = datetime.fromisoformat(text.strip())
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    d = dt - _EPOCH
+    return (d.days * 86_400 + d.seconds) * 1_000_000_000 + d.microseconds * 1_000
+
+
+class LineParser:
+    """CSV line → Bar, with column positions taken from a header (default: BAR_FIELDS order)."""
+
+    def __init__(self, header: Optional[Sequence[str]] = None):
+        cols = [c.strip() for c in (header or BAR_FIELDS)]
+        missing = [c for c in BAR_FIELDS[:5] if c not in cols]
+        if missing:
+            raise ValueError(f"bar header lacks columns {missing}: {cols}")
+        self._pos = [cols.index(c) for c in BAR_FIELDS[:5]]
+        self._vol = cols.index("volume") if "volume" in cols else None
+
+    def __call__(self, line: str) -> Bar:
+        f = line.rstrip("\r\n").split(",")
+        t, o, h, l, c = (f[k] for k in self._pos)
+        v = float(f[self._vol]) if self._vol is not None else 0.0
+        return Bar(utc_ns(t), float(o), float(h), float(l), float(c), v)
+
+
+def frame_bars(df: pd.DataFrame) -> Iterator[Bar]:
+    """Bars of a loaded OHLCV frame (UTC epoch ns, like `LineParser` on the CSV it came from)."""
+    idx = df.index.tz_convert("UTC").tz_localize(None) if df.index.tz is not None else df.index
+    vol = df["volume"].values if "volume" in df.columns else np.zeros(len(df))
+    cols = (idx.as_unit("ns").asi8, df["open"].values if "open" in df.columns else df["close"].values,
+            df["high"].values, df["low"].values, df["close"].values, vol)
+    for ts, o, h, l, c, v in zip(*(a.tolist() for a in cols)):
+        yield Bar(ts, o, h, l, c, v)
+
+
+async def iter_bars(bars: Iterable[Bar]) -> AsyncIterator[Bar]:
+    """Replay source: yields recorded bars as fast as the consumer takes them."""
+    for bar in bars:
+        yield bar
+
+
+async def tail_csv(path: str, poll_interval: float = 0.05, idle_timeout: Optional[float] = None,
+                   from_start: bool = True) -> AsyncIterator[Bar]:
+    """
+    Follow a CSV that another process appends to. Only complete lines are parsed; the feed
+    ends after `idle_timeout` seconds without a new line (never, if None).
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        header = ""
+        while not header.endswith("\n"):
+            header += f.readline()
+            if not header.endswith("\n"):
+                await asyncio.sleep(poll_interval)
+        parse = LineParser(header.rstrip("\r\n").split(","))
+        if not from_start:
+            f.seek(0, 2)
+        partial, idle_since = "", time.monotonic()
+        while True:
+            line = f.readline()
+            if line:
+                partial += line
+                if partial.endswith("\n"):
+                    if partial.strip():
+                        yield parse(partial)
+                    partial, idle_since = "", time.monotonic()
+                continue
+            if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                return
+            await asyncio.sleep(poll_interval)
+
+
+async def socket_bars(host: Optional[str] = None, port: Optional[int] = None,
+                      path: Optional[str] = None) -> AsyncIterator[Bar]:
+    """CSV bar lines from a TCP or Unix socket (`path`); an optional first header line sets the columns."""
+    if path is not None:
+        reader, writer = await asyncio.open_unix_connection(path)
+    else:
+        reader, writer = await asyncio.open_connection(host or "127.0.0.1", port)
+    try:
+        parse: Optional[LineParser] = None
+        while True:
+            raw = await reader.readline()
+            if not raw:
+                return
+            line = raw.decode("utf-8")
+            if not line.strip():
+                continue
+            if parse is None:
+                first = line.split(",", 1)[0].strip()
+                if first == TS_COLUMN:
+                    parse = LineParser(line.rstrip("\r\n").split(","))
+                    continue
+                parse = LineParser()
+            yield parse(line)
+    finally:
+        writer.close()
+
+
+async def run_feed(strategy: EntropyStrategy, bars: AsyncIterator[Bar],
+                   on_decision: Optional[Callable[[dict], None]] = None) -> np.ndarray:
+    """Drive `strategy.on_bar` from an async feed; returns the per-bar decision latency in ns."""
+    lat: List[int] = []
+    clock = time.perf_counter_ns
+    async for bar in bars:
+        t0 = clock()
+        d = strategy.on_bar(bar)
+        lat.append(clock() - t0)
+        if on_decision is not None:
+            on_decision(d)
+    return np.array(lat, dtype=np.int64)
+
+
+def replay(strategy: EntropyStrategy, df: pd.DataFrame,
+           on_decision: Optional[Callable[[dict], None]] = None) -> np.ndarray:
+    """Play a recorded frame through the live path (`run_feed`); returns latencies in ns."""
+    return asyncio.run(run_feed(strategy, iter_bars(frame_bars(df)), on_decision))
+
+
+def latency_summary(lat_ns: np.ndarray) -> Dict[str, float]:
+    """Decision latency percentiles in microseconds."""
+    if lat_ns.size == 0:
+        return {"bars": 0}
+    p50, p99, p999 = np.percentile(lat_ns, [50, 99, 99.9]) / 1e3
+    return {"bars": int(lat_ns.size), "p50_us": float(p50), "p99_us": float(p99), "p999_us": float(p999),
+            "max_us": float(lat_ns.max() / 1e3), "mean_us": float(lat_ns.mean() / 1e3)}
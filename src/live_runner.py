@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import argparse, json, os
+from .cli import risk_params, run_command
+
+
+def run(args: argparse.Namespace) -> None:
+    import asyncio
+    from .capsule_logger import CapsuleSink
+    from .data import load_csv
+    from .live import latency_summary, replay, run_feed, socket_bars, tail_csv
+    from .strategy import EntropyStrategy, Params
+    from .profiling import profiled
+    with profiled(args):
+        bot = EntropyStrategy(args.symbol, Params(risk=risk_params(args), atr_period=args.atr))
+        with CapsuleSink(args.decisions) as out:
+            def on_decision(d: dict) -> None:
+                if d["side"] != "wait":
+                    out.write(d)
+
+            if args.source == "replay":
+                lat = replay(bot, load_csv(args.csv), on_decision)
+            elif args.source == "tail":
+                lat = asyncio.run(run_feed(bot, tail_csv(args.csv, idle_timeout=args.idle_timeout), on_decision))
+            else:
+                lat = asyncio.run(run_feed(bot, socket_bars(args.host, args.port, args.unix), on_decision))
+
+        summary = {"symbol": args.symbol, "source": args.source, **latency_summary(lat)}
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"[LIVE] {args.symbol} bars={summary['bars']} entries={out.written} "
+              + " ".join(f"{k}={summary[k]:.1f}" for k in ("p50_us", "p99_us", "p999_us") if k in summary))
+
+
+def main(argv=None):
+    run_command("live", run, argv)
+
+
+if __name__ == "__main__":
+    main()
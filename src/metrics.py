@@ -1,6 +1,14 @@
 from __future__ import annotations
 import json, os
-from typing import List, Dict
+import numpy as np
+from .lazy import pandas as pd
+from typing import Any, List, Dict, Optional, Sequence, Tuple
+from .calendar_index import session_ids_utc
+from .ledger import NO_TZ
+from .session import SESSION_NAMES
+
+R_BINS = np.arange(-3.0, 5.5, 0.5)  # default R histogram edges (outer bins catch the tails)
+GROUP_KEYS = ("day", "session", "glyph", "side", "exit_reason", "symbol")
 
 
 def load_trades(ndjson_path: str) -> List[Dict]:
@@ -15,51 +23,188 @@ def load_trades(ndjson_path: str) -> List[Dict]:
     return out
 
 
-def compute_metrics(trades: List[Dict]) -> Dict:
-    """Supports either PnL-based or R-multiple-based capsules."""
-    pnl = []
-    rvals = []
-    for t in trades:
-        if "pnl" in t:
-            pnl.append(float(t.get("pnl", 0.0)))
-        v = t.get("verdict", {})
-        if isinstance(v, dict) and "R" in v:
-            try:
-                rvals.append(float(v["R"]))
-            except Exception:
-                pass
-
-    # Equity curve for maxDD
-    eq = 0.0
-    peak = 0.0
-    maxdd = 0.0
-    for x in pnl:
-        eq += x
-        peak = max(peak, eq)
-        maxdd = min(maxdd, eq - peak)
-
-    wins = sum(1 for x in rvals if x > 0)
-    losses = sum(1 for x in rvals if x <= 0)
-    win_rate = (wins / len(rvals)) if rvals else 0.0
-    expectancy_R = (sum(rvals) / len(rvals)) if rvals else 0.0
-
-    pos = [x for x in rvals if x > 0]
-    neg = [x for x in rvals if x <= 0]
-    avg_win = sum(pos) / len(pos) if pos else 0.0
-    avg_loss = sum(neg) / len(neg) if neg else 0.0  # negative or zero
+def _as_float(v: Any) -> Optional[float]:
+    try:
+        return float(v)
+    except Exception:
+        return None
+
+
+def _pnl_r(trades) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    pnl / R arrays. Columnar sources (anything with `column(name)`, e.g. ledger.Ledger, TradeBatch)
+    are read column-wise with missing values dropped; capsule dicts are walked once,
+    keeping trades that carry the field (unparsable R is skipped, as before).
+    """
+    if hasattr(trades, "column"):
+        pnl = np.asarray(trades.column("pnl"), dtype=float)
+        r = np.asarray(trades.column("R"), dtype=float)
+        return pnl[np.isfinite(pnl)], r[np.isfinite(r)]
+    pnl = np.array([float(t.get("pnl", 0.0)) for t in trades if "pnl" in t], dtype=float)
+    vs = (t.get("verdict", {}) for t in trades)
+    raw = [_as_float(v["R"]) for v in vs if isinstance(v, dict) and "R" in v]
+    return pnl, np.array([x for x in raw if x is not None], dtype=float)
+
+
+def _panel(pnl: np.ndarray, r: np.ndarray, count: int) -> Dict:
+    # Equity curve for maxDD (peak starts at 0)
+    if pnl.size:
+        eq = np.cumsum(pnl)
+        maxdd = float(min(0.0, (eq - np.maximum(np.maximum.accumulate(eq), 0.0)).min()))
+    else:
+        maxdd = 0.0
+
+    n = r.size
+    win = r > 0
+    lose = r <= 0
+    wins, losses = int(win.sum()), int(lose.sum())
+    cum_r = float(r.sum()) if n else 0.0
+    pos_sum, neg_sum = float(r[win].sum()), float(r[lose].sum())
+    avg_win = pos_sum / wins if wins else 0.0
+    avg_loss = neg_sum / losses if losses else 0.0  # negative or zero
     payoff = (avg_win / abs(avg_loss)) if avg_loss < 0 else 0.0
-    profit_factor = (sum(pos) / abs(sum(neg))) if neg and sum(neg) < 0 else (sum(pos) if pos else 0.0)
+    profit_factor = (pos_sum / abs(neg_sum)) if losses and neg_sum < 0 else (pos_sum if wins else 0.0)
 
     return {
-        "count": len(trades),
-        "pnl_sum": sum(pnl) if pnl else 0.0,
+        "count": count,
+        "pnl_sum": float(pnl.sum()) if pnl.size else 0.0,
         "max_drawdown": maxdd,
-        "wins": wins, "losses": losses, "win_rate": win_rate,
-        "cum_R": sum(rvals) if rvals else 0.0,
-        "avg_R": expectancy_R,
+        "wins": wins, "losses": losses, "win_rate": (wins / n) if n else 0.0,
+        "cum_R": cum_r,
+        "avg_R": cum_r / n if n else 0.0,
         "avg_win_R": avg_win,
         "avg_loss_R": avg_loss,
         "payoff_ratio": payoff,
         "profit_factor_R": profit_factor,
     }
 
+
+def compute_metrics(trades: List[Dict]) -> Dict:
+    """Supports either PnL-based or R-multiple-based capsules, as dicts or a columnar source."""
+    pnl, r = _pnl_r(trades)
+    return _panel(pnl, r, len(trades))
+
+
+def _longest_run(mask: np.ndarray) -> int:
+    if not mask.any():
+        return 0
+    edges = np.flatnonzero(np.diff(np.r_[0, mask.astype(np.int8), 0]))
+    return int((edges[1::2] - edges[::2]).max())
+
+
+def _risk_stats(r: np.ndarray, bins: np.ndarray) -> Dict:
+    n = r.size
+    if n:
+        eq = np.cumsum(r)
+        peak = np.maximum(np.maximum.accumulate(eq), 0.0)
+        under = eq < peak
+        max_dd_r = float(min(0.0, (eq - peak).min()))
+    else:
+        under = np.zeros(0, dtype=bool)
+        max_dd_r = 0.0
+    mean = float(r.mean()) if n else 0.0
+    sd = float(r.std(ddof=1)) if n > 1 else 0.0
+    downside = float(np.sqrt(np.mean(np.minimum(r, 0.0) ** 2))) if n else 0.0
+    counts, _ = np.histogram(np.clip(r, bins[0], bins[-1]), bins=bins)
+    return {
+        "sharpe_R": mean / sd if sd > 0 else 0.0,
+        "sortino_R": mean / downside if downside > 0 else 0.0,
+        "max_drawdown_R": max_dd_r,
+        "max_dd_duration": _longest_run(under),  # trades spent below the prior R peak
+        "max_win_streak": _longest_run(r > 0),
+        "max_loss_streak": _longest_run(r <= 0),
+        "R_hist": {"edges": bins.tolist(), "counts": counts.tolist()},
+    }
+
+
+def metrics_panel(trades, bins: Optional[Sequence[float]] = None) -> Dict:
+    """`compute_metrics` plus Sharpe/Sortino on R, R drawdown and its duration, streaks and an R histogram."""
+    pnl, r = _pnl_r(trades)
+    out = _panel(pnl, r, len(trades))
+    out.update(_risk_stats(r, np.asarray(R_BINS if bins is None else bins, dtype=float)))
+    return out
+
+
+def r_metrics(r: np.ndarray) -> Dict:
+    """R-only panel for a bare array of R multiples (no pnl fields, no histogram)."""
+    r = np.asarray(r, dtype=float)
+    out = _panel(np.zeros(0), r, r.size)
+    del out["pnl_sum"], out["max_drawdown"]
+    out.update(_risk_stats(r, R_BINS))
+    del out["R_hist"]
+    return out
+
+
+def _key_codes(trades, by: str) -> Tuple[np.ndarray, List[str], np.ndarray]:
+    """(group code per trade, label per code, R per trade) for one of GROUP_KEYS."""
+    if by not in GROUP_KEYS:
+        raise ValueError(f"group by one of {GROUP_KEYS}, got {by!r}")
+    if hasattr(trades, "column"):
+        r = np.asarray(trades.column("R"), dtype=float)
+        if by in ("day", "session"):
+            t0 = np.asarray(trades.column("t0"), dtype=np.int64)  # wall-clock ns
+            if by == "session":
+                off = np.asarray(trades.column("t0_off"), dtype=np.int64)
+                utc = t0 - np.where(off == NO_TZ, 0, off) * 60_000_000_000
+                return session_ids_utc(utc).astype(np.int64), list(SESSION_NAMES), r
+            days, codes = np.unique(t0 // 86_400_000_000_000, return_inverse=True)
+            return codes.astype(np.int64), [str(np.datetime64(int(d), "D")) for d in days], r
+        vocab = list(trades.dictionary(by)) + ["?"]
+        return np.asarray(trades.column(by), dtype=np.int64) % len(vocab), vocab, r  # -1 (missing) → "?"
+
+    def verdict(t):
+        v = t.get("verdict", {})
+        return v if isinstance(v, dict) else {}
+
+    r = np.array([_as_float(verdict(t).get("R", np.nan)) for t in trades], dtype=float)
+    if by == "session":
+        t0 = pd.to_datetime(pd.Series([t.get("t0") for t in trades], dtype=object), utc=True, format="ISO8601",
+                            errors="coerce")
+        utc = t0.dt.tz_localize(None).to_numpy("datetime64[ns]").view(np.int64)
+        ids = np.where(t0.isna().to_numpy(), 0, session_ids_utc(np.where(t0.isna().to_numpy(), 0, utc)))
+        return ids.astype(np.int64), list(SESSION_NAMES), r
+    if by == "day":
+        raw = [str(t.get("t0", ""))[:10] for t in trades]
+    elif by in ("side", "symbol"):
+        raw = [str(t.get(by, "?")) for t in trades]
+    else:
+        raw = [str(verdict(t).get(by, "?")) for t in trades]
+    labels, codes = np.unique(np.array(raw), return_inverse=True)
+    return codes.astype(np.int64), labels.tolist(), r
+
+
+def group_metrics(trades, by: str = "day") -> Dict[str, Dict]:
+    """
+    Per-group R stats (count, wins, losses, win_rate, cum_R, avg_R, avg_win_R,
+    avg_loss_R, profit_factor_R, max_drawdown_R) via one stable sort + segment reductions.
+    Trades without an R are excluded. Keys: "day", "session", "glyph", "side", "exit_reason", "symbol".
+    """
+    codes, labels, r = _key_codes(trades, by)
+    keep = np.isfinite(r)
+    codes, r = codes[keep], r[keep]
+    if r.size == 0:
+        return {}
+    order = np.argsort(codes, kind="stable")  # stable: trade order kept inside each group
+    codes, r = codes[order], r[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    counts = np.diff(np.r_[starts, r.size])
+    pos, neg = np.where(r > 0, r, 0.0), np.where(r <= 0, r, 0.0)
+    wins = np.add.reduceat((r > 0).astype(np.int64), starts)
+    cum = np.add.reduceat(r, starts)
+    pos_sum, neg_sum = np.add.reduceat(pos, starts), np.add.reduceat(neg, starts)
+
+    out: Dict[str, Dict] = {}
+    for g, (s, n) in enumerate(zip(starts.tolist(), counts.tolist())):
+        w = int(wins[g])
+        l = n - w
+        ps, ns = float(pos_sum[g]), float(neg_sum[g])
+        eq = np.cumsum(r[s:s + n])
+        dd = float(min(0.0, (eq - np.maximum(np.maximum.accumulate(eq), 0.0)).min()))
+        out[labels[codes[s]]] = {
+            "count": n, "wins": w, "losses": l, "win_rate": w / n,
+            "cum_R": float(cum[g]), "avg_R": float(cum[g]) / n,
+            "avg_win_R": ps / w if w else 0.0, "avg_loss_R": ns / l if l else 0.0,
+            "profit_factor_R": (ps / abs(ns)) if l and ns < 0 else (ps if w else 0.0),
+            "max_drawdown_R": dd,
+        }
+    return out
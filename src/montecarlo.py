@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Monte Carlo on trade R sequences: resample the realised R multiples into many paths and
+report drawdown quantiles, risk of ruin and confidence intervals on expectancy.
+
+Paths are generated in chunks sized to a byte budget and walked one trade at a time, so
+memory stays bounded at any path count. The three schemes are:
+- "iid": single trades drawn with replacement.
+- "block": moving blocks of consecutive trades, wrapping around at the end.
+- "day": whole trading days drawn with replacement, which keeps intraday clustering.
+  Only this scheme can also re-apply the per-day `max_trades` / `dd_limit_r` clamp.
+"""
+from __future__ import annotations
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+from .metrics import _key_codes
+from .policy import DayPolicy
+from .profiling import active, clock
+
+METHODS = ("iid", "block", "day")
+DD_QUANTILES = (0.5, 0.75, 0.9, 0.95, 0.99)
+
+
+def trade_r_days(trades) -> Tuple[np.ndarray, np.ndarray]:
+    """(R per trade, day id per trade) in trade order, from capsule dicts or a Ledger."""
+    days, _, r = _key_codes(trades, "day")
+    keep = np.isfinite(r)
+    return r[keep], days[keep]
+
+
+def _day_table(r: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """(n_days, max trades per day) R matrix, NaN-padded, trades in their original order."""
+    _, d = np.unique(days, return_inverse=True)
+    order = np.argsort(d, kind="stable")
+    d = d[order]
+    counts = np.bincount(d)
+    slot = np.arange(d.size) - np.repeat(np.cumsum(counts) - counts, counts)
+    table = np.full((counts.size, int(counts.max()) if counts.size else 0), np.nan)
+    table[d, slot] = r[order]
+    return table
+
+
+def _clamp_days(x: np.ndarray, policy: DayPolicy) -> np.ndarray:
+    """
+    Apply the per-day clamp to a (days, slots) R table: a trade is taken while fewer than
+    max_trades were taken that day and the day's R so far is above dd_limit_r. Skipped
+    trades become NaN.
+    """
+    v = np.nan_to_num(x)
+    before = np.cumsum(v, axis=1) - v                   # day R before each trade
+    ok = (np.arange(x.shape[1]) < policy.max_trades) & ~np.isnan(x)
+    ok &= np.minimum.accumulate(before, axis=1) > policy.dd_limit_r
+    return np.where(ok, x, np.nan)
+
+
+def _day_summary(table: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Reduce each day to what a path needs to step over it whole: R total, lowest and highest
+    running R within the day, the day's own max drawdown and its trade count.
+    """
+    run = np.cumsum(np.nan_to_num(table), axis=1)
+    run = np.concatenate([np.zeros((run.shape[0], 1)), run], axis=1)   # day opens at 0
+    return {"total": run[:, -1], "low": run.min(axis=1), "high": run.max(axis=1),
+            "dd": (run - np.maximum.accumulate(run, axis=1)).min(axis=1),
+            "n": np.count_nonzero(~np.isnan(table), axis=1)}
+
+
+class _Paths:
+    """Running equity state of a chunk of paths, advanced one trade (or one day) at a time."""
+
+    def __init__(self, c: int):
+        self.eq, self.peak, self.dd, self.low = (np.zeros(c) for _ in range(4))
+        self.n = np.zeros(c, dtype=np.int64)
+        self._tmp = np.empty(c)
+
+    def step(self, v: np.ndarray) -> None:
+        self.eq += v
+        np.maximum(self.peak, self.eq, out=self.peak)
+        np.subtract(self.eq, self.peak, out=self._tmp)
+        np.minimum(self.dd, self._tmp, out=self.dd)
+        np.minimum(self.low, self.eq, out=self.low)
+
+    def step_day(self, total, low, high, dd) -> None:
+        # inside the day the drawdown is either from the prior peak down to the day's low,
+        # or one that opens and closes within the day
+        np.add(self.eq, low, out=self._tmp)
+        np.minimum(self.low, self._tmp, out=self.low)
+        self._tmp -= self.peak
+        np.minimum(self.dd, np.minimum(self._tmp, dd), out=self.dd)
+        np.maximum(self.peak, self.eq + high, out=self.peak)
+        self.eq += total
+
+
+def simulate(
+    r: np.ndarray,
+    days: Optional[np.ndarray] = None,
+    paths: int = 100_000,
+    method: str = "iid",
+    block: int = 5,
+    horizon: Optional[int] = None,
+    day_policy: Optional[DayPolicy] = None,
+    ruin_r: float = 10.0,
+    seed: int = 0,
+    chunk_bytes: int = 8 << 20,
+    dd_quantiles: Sequence[float] = DD_QUANTILES,
+    ci: float = 0.95,
+) -> Dict:
+    """
+    Bootstrap `paths` R paths. `horizon` is trades per path ("iid"/"block") or days per
+    path ("day"); it defaults to the history's length. `ruin_r` is the drawdown from the
+    starting equity, in R, that counts as ruin. With `day_policy` (method "day" only) each
+    sampled day is replayed through the clamp and the odds of hitting `dd_limit_r` are reported.
+
+    A chunk of paths draws its indices as one (horizon, chunk) block of about `chunk_bytes`,
+    then walks it column by column, so only O(chunk) floats of equity state are live. The
+    "day" scheme reduces every (clamped) day to its total/low/high/drawdown once and steps
+    paths a whole day at a time. Results are reproducible for a given seed and chunk_bytes.
+    """
+    if method not in METHODS:
+        raise ValueError(f"method must be one of {METHODS}, got {method!r}")
+    r = np.asarray(r, dtype=float)
+    if r.size == 0:
+        raise ValueError("no trades with an R multiple to resample")
+    if method == "day" and days is None:
+        raise ValueError('method "day" needs the day id of every trade')
+    if day_policy is not None and method != "day":
+        raise ValueError('per-day rules need method "day"')
+    prof = active()
+    t = clock() if prof else 0
+    rng = np.random.default_rng(seed)
+    days_r = None
+    if method == "day":
+        table = _day_table(r, np.asarray(days))
+        if day_policy is not None:
+            table = _clamp_days(table, day_policy)
+        days_r = _day_summary(table)
+        days_r["hit"] = (days_r["n"] > 0) & (days_r["total"] <= day_policy.dd_limit_r) if day_policy else None
+    pool = days_r["total"].size if days_r is not None else r.size
+    length = int(horizon or pool)
+    b = max(1, min(int(block), r.size))
+    chunk = int(max(1, min(paths, chunk_bytes // (4 * length))))
+
+    out = {k: [] for k in ("final", "max_dd", "low", "n")}
+    day_hits = paths_with_hit = 0
+    for start in range(0, paths, chunk):
+        c = min(chunk, paths - start)
+        if prof:
+            t = prof.lap("mc.prepare" if start == 0 else "mc.paths", t)
+        st = _Paths(c)
+        if method == "block":
+            draws = rng.integers(0, r.size, size=(-(-length // b), c), dtype=np.int32)
+        else:
+            draws = rng.integers(0, pool, size=(length, c), dtype=np.int32)
+        any_hit = np.zeros(c, dtype=bool) if day_policy is not None else None
+        for j in range(length):
+            if method == "iid":
+                st.step(r.take(draws[j]))
+            elif method == "block":
+                st.step(r.take((draws[j // b] + j % b) % r.size))
+            else:
+                d = draws[j]
+                st.step_day(*(days_r[k].take(d) for k in ("total", "low", "high", "dd")))
+                st.n += days_r["n"].take(d)
+                if any_hit is not None:
+                    hit = days_r["hit"].take(d)
+                    day_hits += int(hit.sum())
+                    any_hit |= hit
+        if method != "day":
+            st.n[:] = length
+        if any_hit is not None:
+            paths_with_hit += int(any_hit.sum())
+        for k, v in (("final", st.eq), ("max_dd", st.dd), ("low", st.low), ("n", st.n)):
+            out[k].append(v)
+    s = {k: np.concatenate(v) for k, v in out.items()}
+    if prof:
+        t = prof.lap("mc.paths", t)
+        prof.count("mc.paths", paths)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        exp = np.where(s["n"] > 0, s["final"] / s["n"], np.nan)
+    lo, hi = (1 - ci) / 2, 1 - (1 - ci) / 2
+    tag = f"ci{round(ci * 100)}"
+    q = lambda a, p: float(np.nanquantile(a, p))
+    res = {
+        "method": method, "paths": int(paths), "horizon": length, "seed": seed,
+        "block": b if method == "block" else None,
+        "history": {"trades": int(r.size), "avg_R": float(r.mean()), "cum_R": float(r.sum())},
+        "expectancy_R": {"mean": float(np.nanmean(exp)), tag: [q(exp, lo), q(exp, hi)]},
+        "final_R": {"mean": float(s["final"].mean()), tag: [q(s["final"], lo), q(s["final"], hi)],
+                    "p_loss": float((s["final"] < 0).mean())},
+        "max_drawdown_R": {f"q{round(p * 100)}": q(s["max_dd"], 1 - p) for p in dd_quantiles},
+        "risk_of_ruin": {"ruin_R": ruin_r, "p": float((s["low"] <= -ruin_r).mean())},
+        "trades_per_path": {"mean": float(s["n"].mean()), "min": int(s["n"].min()), "max": int(s["n"].max())},
+    }
+    if day_policy is not None:
+        res["day_rules"] = {"max_trades": day_policy.max_trades, "dd_limit_r": day_policy.dd_limit_r,
+                            "p_day_hits_dd_limit": day_hits / (paths * length),
+                            "p_path_any_dd_limit_day": paths_with_hit / paths}
+    if prof:
+        prof.lap("mc.summary", t)
+    return res
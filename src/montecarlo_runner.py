@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import argparse, json, os
+from .cli import day_policy, run_command
+
+
+def run(args: argparse.Namespace) -> None:
+    from .metrics import load_trades
+    from .ledger import Ledger
+    from .montecarlo import simulate, trade_r_days
+    from .profiling import profiled
+    with profiled(args):
+        r, days = trade_r_days(Ledger(args.ledger) if args.ledger else load_trades(args.trades))
+        res = simulate(r, days, paths=args.paths, method=args.method, block=args.block, horizon=args.horizon or None,
+                       day_policy=day_policy(args) if args.day_rules else None, ruin_r=args.ruin_r, seed=args.seed,
+                       chunk_bytes=int(args.chunk_mb * (1 << 20)))
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(res, f, indent=2)
+        dd = res["max_drawdown_R"]
+        print(f"[MC] {res['method']} paths={res['paths']} E[R]={res['expectancy_R']['mean']:.3f} "
+              f"maxDD q50={dd['q50']:.2f} q95={dd['q95']:.2f} ruin(-{args.ruin_r:g}R)={res['risk_of_ruin']['p']:.4f}")
+
+
+def main(argv=None):
+    run_command("mc", run, argv)
+
+
+if __name__ == "__main__":
+    main()
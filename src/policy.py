@@ -1,6 +1,7 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Dict
+from dataclasses import dataclass
+from typing import List
+import numpy as np
 
 @dataclass
 class DayPolicy:
@@ -16,15 +17,40 @@ class DayPolicy:
         self._count += 1
         self._cum_r += r_mult
 
-@dataclass
 class DailyBook:
-    policy_template: DayPolicy = field(default_factory=DayPolicy)
-    days: Dict[str, DayPolicy] = field(default_factory=dict)
-
-    def policy_for(self, day_key: str) -> DayPolicy:
-        if day_key not in self.days:
-            self.days[day_key] = DayPolicy(
-                max_trades=self.policy_template.max_trades,
-                dd_limit_r=self.policy_template.dd_limit_r
-            )
-        return self.days[day_key]
+    """
+    Per-day clamp state for every day of a series, kept in arrays indexed by integer day
+    id (`FeatureFrame.day` / `calendar_index`), so the per-bar path does no string or
+    Timestamp work. Same rules as one DayPolicy per day.
+    """
+
+    def __init__(self, policy_template: DayPolicy = DayPolicy(), n_days: int = 0):
+        self.policy_template = policy_template
+        self._max = policy_template.max_trades
+        self._dd = policy_template.dd_limit_r
+        self._count: List[int] = [0] * n_days
+        self._cum_r: List[float] = [0.0] * n_days
+
+    def _grow(self, day: int) -> None:
+        extra = day + 1 - len(self._count)
+        self._count += [0] * extra
+        self._cum_r += [0.0] * extra
+
+    def can_enter(self, day: int) -> bool:
+        if day >= len(self._count):
+            return self._max > 0 and 0.0 > self._dd
+        return self._count[day] < self._max and self._cum_r[day] > self._dd
+
+    def register(self, day: int, r_mult: float) -> None:
+        if day >= len(self._count):
+            self._grow(day)
+        self._count[day] += 1
+        self._cum_r[day] += r_mult
+
+    @property
+    def counts(self) -> np.ndarray:
+        return np.array(self._count, dtype=np.int64)
+
+    @property
+    def cum_r(self) -> np.ndarray:
+        return np.array(self._cum_r, dtype=float)
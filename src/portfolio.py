@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Portfolio backtest: one multi-entry scan per symbol.
+
+With `workers > 1`, a thread pool loads CSVs (I/O) while a process pool scans (CPU). Each
+loaded frame reaches its scan process through shared memory. The number of symbols in
+flight is capped by `workers` and by a memory budget estimated per symbol. Results stream
+out as they finish; the summary always lists symbols in input order.
+"""
+from __future__ import annotations
+import json, os, threading
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+from .lazy import pandas as pd
+from .data import load_csv, cache_dir
+from .features import build_features, feature_frame
+from .metrics import compute_metrics
+from .policy import DayPolicy
+from .risk import RiskParams
+from .scanner import multi_entry_scan
+from .scan_cache import ScanCache
+from .shared import SharedFrame, FrameSpec, run_on_frame
+from .profiling import PROFILER
+from .resample import at_timeframe, parse_timeframe, resample_level
+
+BYTES_PER_ROW = 256       # frame + shm copy + feature columns + scan temporaries, per bar
+BYTES_PER_CSV_BYTE = 4    # fallback estimate when the row count is not known yet
+
+
+def estimate_bytes(path: str) -> int:
+    """Peak memory of one symbol in flight: rows from the sidecar cache, else the CSV size."""
+    try:
+        with open(os.path.join(cache_dir(path), "meta.json"), encoding="utf-8") as f:
+            return int(json.load(f)["rows"]) * BYTES_PER_ROW
+    except (OSError, ValueError, KeyError):
+        pass
+    try:
+        return os.path.getsize(path) * BYTES_PER_CSV_BYTE
+    except OSError:
+        return 0
+
+
+class MemoryBudget:
+    """Counting budget in bytes; one holder may always exceed it so large symbols still run."""
+
+    def __init__(self, limit: Optional[int]):
+        self.limit = limit
+        self.used = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, n: int) -> None:
+        with self._cond:
+            while self.limit is not None and self.used > 0 and self.used + n > self.limit:
+                self._cond.wait()
+            self.used += n
+
+    def release(self, n: int) -> None:
+        with self._cond:
+            self.used -= n
+            self._cond.notify_all()
+
+
+@dataclass
+class ScanParams:
+    risk: RiskParams = field(default_factory=RiskParams)
+    day_policy: DayPolicy = field(default_factory=DayPolicy)
+    atr_period: int = 14
+    look_ahead_bars: int = 64
+    cooldown_bars: int = 10
+    timeframe: Optional[str] = None  # resample every symbol first, e.g. "15m"
+    cache: Optional[ScanCache] = None  # scan result cache shared by every symbol
+
+
+def _scan_symbol(df: pd.DataFrame, sym: str, outdir: str, p: ScanParams, cached: bool = True) -> Dict:
+    if p.timeframe:
+        df = at_timeframe(df, p.timeframe) if cached else resample_level(df, parse_timeframe(p.timeframe)).frame
+    ff = feature_frame(df, p.atr_period) if cached else build_features(df, p.atr_period)  # no LRU in workers
+    res = multi_entry_scan(
+        df=df,
+        symbol=sym,
+        risk=p.risk,
+        outdir=outdir,                # per-symbol capsules
+        atr_period=p.atr_period,
+        look_ahead_bars=p.look_ahead_bars,
+        cooldown_bars=p.cooldown_bars,
+        day_policy=p.day_policy,
+        features=ff,
+        cache=p.cache,
+    )
+    trades, cumR = res
+    return {"trades": trades, "cumR": cumR, "metrics": compute_metrics(res.batch)}  # metrics per symbol
+
+
+def _scan_task(spec: FrameSpec, sym: str, outdir: str, p: ScanParams, profile: bool = False) -> Dict:
+    PROFILER.reset()
+    PROFILER.enabled = profile
+    res = run_on_frame(spec, _scan_symbol, sym, outdir, p, cached=False)
+    if profile:
+        res["_profile"] = PROFILER.snapshot()
+    return res
+
+
+def _summary(symmap: Dict[str, str], done: Dict[str, Dict]) -> Dict:
+    order = [s for s in symmap if s in done]
+    out = {"symbols": list(symmap), "total_trades": sum(done[s]["trades"] for s in order),
+           "net_R": sum((done[s]["cumR"] for s in order), 0.0), "by_symbol": {s: done[s] for s in order}}
+    pending = [s for s in symmap if s not in done]
+    if pending:
+        out["pending"] = pending
+    return out
+
+
+def _write_json(path: str, obj: Dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(obj, f, indent=2)
+    os.replace(tmp, path)
+
+
+def run_portfolio(
+    symmap: Dict[str, str],
+    params: ScanParams = ScanParams(),
+    outroot: str = "artifacts",
+    workers: int = 1,
+    max_rss: Optional[int] = None,
+    on_result: Optional[Callable[[str, Dict], None]] = None,
+    load: Callable[[str], pd.DataFrame] = load_csv,
+) -> Dict:
+    """
+    Scan every SYMBOL → csv path into {outroot}/{SYMBOL}/ and write
+    {outroot}/portfolio_summary.json. The summary is rewritten after each symbol finishes
+    (with a "pending" list until the run is done). `max_rss` is a byte budget for symbols
+    in flight. `on_result(sym, result)` is called in completion order. `load(path)` reads
+    a symbol's bars (a resident process passes frames it already holds).
+    """
+    os.makedirs(outroot, exist_ok=True)
+    summary_path = os.path.join(outroot, "portfolio_summary.json")
+    done: Dict[str, Dict] = {}
+
+    def finish(sym: str, res: Dict) -> None:
+        snap = res.pop("_profile", None)
+        if snap:
+            PROFILER.merge(snap)
+        done[sym] = res
+        _write_json(summary_path, _summary(symmap, done))
+        if on_result:
+            on_result(sym, res)
+
+    if workers <= 1 or len(symmap) <= 1:
+        for sym, path in symmap.items():
+            finish(sym, _scan_symbol(load(path), sym, os.path.join(outroot, sym), params))
+        return _summary(symmap, done)
+
+    budget = MemoryBudget(max_rss)
+    # spawn: the loader threads are live when worker processes start
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as procs:
+
+        def load_and_scan(sym: str, path: str) -> Dict:
+            need = estimate_bytes(path)
+            budget.acquire(need)
+            try:
+                df = load(path)
+                with SharedFrame(df) as shared:
+                    del df
+                    return procs.submit(_scan_task, shared.spec, sym, os.path.join(outroot, sym), params,
+                                        PROFILER.enabled).result()
+            finally:
+                budget.release(need)
+
+        # one extra loader so the next CSV is read while every process is busy
+        with ThreadPoolExecutor(max_workers=workers + 1, thread_name_prefix="portfolio-load") as loaders:
+            futs = {loaders.submit(load_and_scan, sym, path): sym for sym, path in symmap.items()}
+            for fut in as_completed(futs):
+                finish(futs[fut], fut.result())
+    return _summary(symmap, done)
@@ -1,20 +1,8 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-import argparse, json, os
-import pandas as pd
+import argparse
 from typing import Dict
-from .risk import RiskParams
-from .policy import DayPolicy
-from .scanner import multi_entry_scan
-from .metrics import load_trades, compute_metrics
-
-
-def load_csv(path: str) -> pd.DataFrame:
-    df = pd.read_csv(path)
-    if "timestamp" in df.columns:
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
-        df = df.set_index("timestamp")
-    return df
+from .cli import day_policy, risk_params, run_command, scan_cache
 
 
 def parse_symbol_map(pairs: list[str]) -> Dict[str, str]:
@@ -27,54 +15,29 @@ def parse_symbol_map(pairs: list[str]) -> Dict[str, str]:
     return out
 
 
-def main():
-    ap = argparse.ArgumentParser(description="Portfolio multi-entry backtest")
-    ap.add_argument("--csv", action="append", required=True,
-                    help="SYMBOL:path.csv (repeatable). Example: --csv ES:data/es.csv --csv NQ:data/nq.csv")
-    ap.add_argument("--atr", type=int, default=14)
-    ap.add_argument("--lookahead", type=int, default=64)
-    ap.add_argument("--cooldown", type=int, default=10)
-    ap.add_argument("--max-trades", type=int, default=8)
-    ap.add_argument("--dd-r", type=float, default=-5.0)
-    ap.add_argument("--risk-pct", type=float, default=0.016)
-    ap.add_argument("--rr", type=float, default=2.5)
-    ap.add_argument("--atr-mult", type=float, default=1.5)
-    args = ap.parse_args()
+def run(args: argparse.Namespace) -> None:
+    from .portfolio import ScanParams, run_portfolio
+    from .profiling import profiled
+    with profiled(args):
+        symmap = parse_symbol_map(args.csv)
+        params = ScanParams(
+            risk=risk_params(args), day_policy=day_policy(args),
+            atr_period=args.atr, look_ahead_bars=args.lookahead, cooldown_bars=args.cooldown,
+            timeframe=args.timeframe, cache=scan_cache(args),
+        )
 
-    symmap = parse_symbol_map(args.csv)
-    risk = RiskParams(risk_pct=args.risk_pct, rr=args.rr, atr_mult=args.atr_mult)
-    policy = DayPolicy(max_trades=args.max_trades, dd_limit_r=args.dd_r)
+        def progress(sym: str, res: Dict) -> None:
+            if args.workers > 1:
+                print(f"[..] {sym} trades={res['trades']} cumR={res['cumR']:.2f}", flush=True)
 
-    os.makedirs("artifacts", exist_ok=True)
-    portfolio = {}
-    net_R = 0.0
-    total_trades = 0
+        summary = run_portfolio(symmap, params, outroot="artifacts", workers=args.workers,
+                                max_rss=None if args.max_rss is None else int(args.max_rss * 2**20), on_result=progress)
+        print(f"[OK] Portfolio symbols={list(symmap.keys())} total_trades={summary['total_trades']} net_R={summary['net_R']:.2f}")
 
-    for sym, path in symmap.items():
-        df = load_csv(path)
-        outdir = f"artifacts/{sym}"
-        trades, cumR = multi_entry_scan(
-            df=df,
-            symbol=sym,
-            risk=risk,
-            outdir=outdir,                # per-symbol capsules
-            atr_period=args.atr,
-            look_ahead_bars=args.lookahead,
-            cooldown_bars=args.cooldown,
-            day_policy=policy,
-        )
-        # metrics per symbol
-        m = compute_metrics(load_trades(f"{outdir}/trades.ndjson"))
-        portfolio[sym] = {"trades": trades, "cumR": cumR, "metrics": m}
-        net_R += cumR
-        total_trades += trades
 
-    summary = {"symbols": list(symmap.keys()), "total_trades": total_trades, "net_R": net_R, "by_symbol": portfolio}
-    with open("artifacts/portfolio_summary.json", "w") as f:
-        json.dump(summary, f, indent=2)
-    print(f"[OK] Portfolio symbols={list(symmap.keys())} total_trades={total_trades} net_R={net_R:.2f}")
+def main(argv=None):
+    run_command("portfolio", run, argv)
 
 
 if __name__ == "__main__":
     main()
-
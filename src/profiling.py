@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Per-stage timers and counters for the scan hot paths.
+
+`PROFILER` is disabled by default. Hot loops take `prof = active()` once (None when
+disabled) and guard each probe with `if prof:`, so a disabled run pays one truth test
+per probe. Timers are cumulative ns per stage plus a call count.
+
+    prof = active()
+    t = clock() if prof else 0
+    ...stage work...
+    if prof: t = prof.lap("fill", t)
+"""
+from __future__ import annotations
+import cProfile, json, os, time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+clock = time.perf_counter_ns
+
+
+class Profiler:
+    __slots__ = ("enabled", "ns", "calls", "counts")
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.reset()
+
+    def reset(self) -> None:
+        self.ns: Dict[str, int] = {}
+        self.calls: Dict[str, int] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, stage: str, ns: int) -> None:
+        self.ns[stage] = self.ns.get(stage, 0) + ns
+        self.calls[stage] = self.calls.get(stage, 0) + 1
+
+    def lap(self, stage: str, t0: int) -> int:
+        """Charge `clock() - t0` to `stage`; returns the new clock for the next stage."""
+        now = clock()
+        self.add(stage, now - t0)
+        return now
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a coarse block (use `lap` inside per-bar loops)."""
+        if not self.enabled:
+            yield
+            return
+        t0 = clock()
+        try:
+            yield
+        finally:
+            self.add(name, clock() - t0)
+
+    def snapshot(self) -> Dict:
+        stages = {k: {"seconds": self.ns[k] / 1e9, "calls": self.calls[k]}
+                  for k in sorted(self.ns, key=self.ns.get, reverse=True)}
+        return {"stages": stages, "counters": dict(sorted(self.counts.items()))}
+
+    def merge(self, snap: Dict) -> None:
+        """Fold a `snapshot()` from another process into this profiler."""
+        for k, s in snap.get("stages", {}).items():
+            self.ns[k] = self.ns.get(k, 0) + int(round(s["seconds"] * 1e9))
+            self.calls[k] = self.calls.get(k, 0) + s["calls"]
+        for k, n in snap.get("counters", {}).items():
+            self.count(k, n)
+
+
+PROFILER = Profiler()
+
+
+def active() -> Optional[Profiler]:
+    return PROFILER if PROFILER.enabled else None
+
+
+def add_profile_args(ap) -> None:
+    ap.add_argument("--profile", action="store_true",
+                    help="write per-stage timers and counters to artifacts/profile.json")
+    ap.add_argument("--profile-out", default="artifacts/profile.json")
+    ap.add_argument("--cprofile", default=None,
+                    help="also dump cProfile stats here (pstats format: snakeviz, flameprof, gprof2dot)")
+
+
+@contextmanager
+def profiled(args) -> Iterator[Optional[Profiler]]:
+    """Runner helper: enable PROFILER (and cProfile) for the block when `--profile` is set."""
+    if not getattr(args, "profile", False):
+        yield None
+        return
+    PROFILER.reset()
+    PROFILER.enabled = True
+    cprof = cProfile.Profile() if args.cprofile else None
+    t0 = clock()
+    if cprof:
+        cprof.enable()
+    try:
+        yield PROFILER
+    finally:
+        if cprof:
+            cprof.disable()
+        PROFILER.add("total", clock() - t0)
+        PROFILER.enabled = False
+        os.makedirs(os.path.dirname(args.profile_out) or ".", exist_ok=True)
+        with open(args.profile_out, "w") as f:
+            json.dump(PROFILER.snapshot(), f, indent=2)
+        if cprof:
+            os.makedirs(os.path.dirname(args.cprofile) or ".", exist_ok=True)
+            cprof.dump_stats(args.cprofile)
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Higher-timeframe bars from one base series. Each bar gets an epoch bucket id
+(wall-clock ns // step), and a single `reduceat` per column over the bucket starts builds
+the OHLCV of every level. A `BarPyramid` caches its levels. It also maps every base bar to
+the last higher-timeframe bar that had closed by then, so HTF ΔΦ and verdicts can be read
+per base bar without lookahead.
+"""
+from __future__ import annotations
+import re, threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence
+import numpy as np
+from .lazy import pandas as pd
+from .entropy_engine import GLYPHS
+from .features import FeatureFrame, data_fingerprint, feature_frame
+
+_UNITS = {"s": 1, "sec": 1, "m": 60, "min": 60, "t": 60, "h": 3600, "hr": 3600, "d": 86400, "day": 86400}
+_TF = re.compile(r"^\s*(\d+)\s*([a-zA-Z]+)\s*$")
+
+
+def parse_timeframe(tf: str) -> int:
+    """"15m" / "15min" / "1h" / "1d" → seconds."""
+    m = _TF.match(tf)
+    unit = _UNITS.get(m.group(2).lower()) if m else None
+    if unit is None or int(m.group(1)) <= 0:
+        raise ValueError(f"bad timeframe {tf!r}; use e.g. 5m, 15min, 1h, 1d")
+    return int(m.group(1)) * unit
+
+
+def _wall_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    """Wall-clock epoch ns (local time for tz-aware indexes, so 1d buckets are local days)."""
+    idx = index.tz_localize(None) if index.tz is not None else index
+    return idx.as_unit("ns").asi8
+
+
+@dataclass
+class Level:
+    """One pyramid level: HTF bars plus, per HTF bar, the base bar at which it is complete."""
+    seconds: int
+    frame: pd.DataFrame
+    first: np.ndarray     # base index of each HTF bar's first base bar
+    done_at: np.ndarray   # base index from which the HTF bar counts as closed (n if never)
+
+    def align(self, values: np.ndarray, n: int, fill=np.nan) -> np.ndarray:
+        """Per base bar (n of them): `values` of the last HTF bar closed at that bar, else `fill`."""
+        k = np.searchsorted(self.done_at, np.arange(n), side="right") - 1
+        out = np.asarray(values)[np.maximum(k, 0)]
+        if out.dtype.kind in "iub" and isinstance(fill, float):
+            out = out.astype(float)
+        return np.where(k >= 0, out, fill)
+
+
+def resample_level(df: pd.DataFrame, seconds: int, base_seconds: Optional[int] = None) -> Level:
+    """
+    OHLCV bars of `seconds` from a sorted base frame, one reduceat pass per column. Each HTF
+    bar is labelled with its bucket start. It counts as closed on the base bar that reaches
+    the bucket end (its timestamp + `base_seconds`, by default the median bar spacing).
+    Otherwise it closes on the first base bar of a later bucket.
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        raise ValueError("resampling needs a DatetimeIndex")
+    wall = _wall_ns(df.index)
+    n = wall.size
+    step = seconds * 1_000_000_000
+    if n == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return Level(seconds, df.iloc[:0].copy(), empty, empty)
+    bucket = wall // step
+    first = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    last = np.r_[first[1:] - 1, n - 1]
+    if base_seconds is None:
+        base_ns = int(np.median(np.diff(wall))) if n > 1 else step
+    else:
+        base_ns = base_seconds * 1_000_000_000
+    b = bucket[first]
+    closes_in_bucket = wall[last] + base_ns >= (b + 1) * step
+    done_at = np.where(closes_in_bucket, last, last + 1)
+
+    cols: Dict[str, np.ndarray] = {}
+    if "open" in df.columns:
+        cols["open"] = df["open"].to_numpy(dtype=float)[first]
+    cols["high"] = np.maximum.reduceat(df["high"].to_numpy(dtype=float), first)
+    cols["low"] = np.minimum.reduceat(df["low"].to_numpy(dtype=float), first)
+    cols["close"] = df["close"].to_numpy(dtype=float)[last]
+    if "volume" in df.columns:
+        cols["volume"] = np.add.reduceat(df["volume"].to_numpy(dtype=float), first)
+    # label = bucket start, shifted from the first bar's own instant (no tz_localize of wall times)
+    utc = df.index[first]
+    label = utc - pd.to_timedelta(wall[first] - b * step, unit="ns")
+    label = label.as_unit(df.index.unit).rename(df.index.name)
+    return Level(seconds, pd.DataFrame(cols, index=label), first, done_at)
+
+
+class BarPyramid:
+    """Base frame plus lazily built, cached higher-timeframe levels."""
+
+    def __init__(self, df: pd.DataFrame, base_seconds: Optional[int] = None):
+        self.base = df
+        self.base_seconds = base_seconds
+        self._levels: Dict[int, Level] = {}
+        self._lock = threading.Lock()
+
+    def level(self, timeframe: str) -> Level:
+        sec = parse_timeframe(timeframe)
+        with self._lock:
+            lv = self._levels.get(sec)
+            if lv is None:
+                lv = self._levels[sec] = resample_level(self.base, sec, self.base_seconds)
+        return lv
+
+    def frame(self, timeframe: str) -> pd.DataFrame:
+        return self.level(timeframe).frame
+
+    @property
+    def nbytes(self) -> int:
+        """Resident size of the built levels (the base frame belongs to the caller)."""
+        with self._lock:
+            levels = list(self._levels.values())
+        return sum(int(lv.frame.memory_usage(index=True).sum()) + lv.first.nbytes + lv.done_at.nbytes for lv in levels)
+
+    def features(self, timeframe: str, atr_period: int = 14) -> FeatureFrame:
+        return feature_frame(self.level(timeframe).frame, atr_period)
+
+    def aligned_dphi(self, timeframe: str, atr_period: int = 14) -> np.ndarray:
+        """HTF ΔΦ of the last closed HTF bar, per base bar (NaN before the first one closes)."""
+        return self.level(timeframe).align(self.features(timeframe, atr_period).dphi, len(self.base))
+
+    def aligned_glyph(self, timeframe: str, atr_period: int = 14) -> np.ndarray:
+        """HTF glyph code (into GLYPHS) of the last closed HTF bar, per base bar (-1 before)."""
+        g = self.features(timeframe, atr_period).glyph.astype(np.int8)
+        return self.level(timeframe).align(g, len(self.base), fill=-1).astype(np.int8)
+
+    def confluence(self, timeframe: str, glyphs: Sequence[str] = ("⟿",), atr_period: int = 14) -> np.ndarray:
+        """Bool per base bar: the last closed HTF bar's glyph is one of `glyphs`."""
+        codes = [GLYPHS.index(g) for g in glyphs]
+        return np.isin(self.aligned_glyph(timeframe, atr_period), codes)
+
+
+_PYRAMIDS: "OrderedDict[str, BarPyramid]" = OrderedDict()
+_PYRAMIDS_LOCK = threading.Lock()
+PYRAMID_CACHE_SIZE = 8
+
+
+def pyramid_for(df: pd.DataFrame) -> BarPyramid:
+    """LRU-cached BarPyramid per data content, so every runner/variant shares the levels."""
+    key = data_fingerprint(df)
+    with _PYRAMIDS_LOCK:
+        p = _PYRAMIDS.get(key)
+        if p is not None:
+            _PYRAMIDS.move_to_end(key)
+            return p
+        p = _PYRAMIDS[key] = BarPyramid(df)
+        while len(_PYRAMIDS) > PYRAMID_CACHE_SIZE:
+            _PYRAMIDS.popitem(last=False)
+    return p
+
+
+def pyramid_cache_bytes() -> int:
+    with _PYRAMIDS_LOCK:
+        return sum(p.nbytes for p in _PYRAMIDS.values())
+
+
+def trim_pyramids(max_bytes: int) -> int:
+    """Drop least recently used pyramids until their levels hold at most `max_bytes`; returns the bytes kept."""
+    with _PYRAMIDS_LOCK:
+        held = sum(p.nbytes for p in _PYRAMIDS.values())
+        while held > max_bytes:
+            held -= _PYRAMIDS.popitem(last=False)[1].nbytes
+    return held
+
+
+def at_timeframe(df: pd.DataFrame, timeframe: Optional[str]) -> pd.DataFrame:
+    """Runner helper for `--timeframe`: the frame itself when None, else its cached HTF level."""
+    return df if not timeframe else pyramid_for(df).frame(timeframe)
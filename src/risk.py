@@ -1,6 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass
 import math
+import numpy as np
 
 
 @dataclass
@@ -19,7 +20,18 @@ def position_size(equity: float, atr_value: float, price: float, p: RiskParams)
     return max(p.min_size, size)
 
 
+def stops_targets_arrays(entry, sign, atr_value, atr_mult, rr) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized `stops_targets` (arguments broadcast): sign is +1 long, -1 short, 0 for
+    no trade (stop = target = entry). Values are bit-identical to the scalar version.
+    """
+    sdist = np.maximum(1e-6, np.multiply(atr_value, atr_mult))
+    sign = np.asarray(sign, dtype=float)
+    return np.subtract(entry, sign * sdist), np.add(entry, sign * sdist * rr)
+
+
 def stops_targets(entry: float, side: str, atr_value: float, p: RiskParams) -> tuple[float, float]:
+    """Per-trade path in plain floats; same values as `stops_targets_arrays` for one trade."""
     sdist = max(1e-6, atr_value * p.atr_mult)
     if side == "long":
         return entry - sdist, entry + sdist * p.rr
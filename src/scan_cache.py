@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Content-addressed on-disk cache of scan results.
+
+A key hashes everything that decides a scan's capsules: the bar data fingerprint, symbol,
+ATR period, every result-affecting Variant field (mode, rev_k, ma_period, RiskParams,
+DayPolicy limits, look-ahead, cooldown, equity, confluence), the verdict thresholds, the
+session weights and a salt over the source of the modules the scan runs through, so an
+edit to any of them misses instead of replaying stale trades.
+
+An entry is one NDJSON file: a summary line, then the capsules. Entries are written to a
+temp file and renamed into place, so concurrent jobs sharing a directory only ever see
+whole files. Reads refresh the mtime, and the oldest entries are evicted once the
+directory outgrows `max_bytes`.
+"""
+from __future__ import annotations
+import functools, hashlib, json, os, tempfile
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Tuple
+from . import entropy_engine
+from .calendar_index import DEFAULT_SESSIONS
+from .profiling import active
+from .session import weight_table
+
+CACHE_VERSION = 1
+DEFAULT_DIR = os.environ.get("ENTROPY_SCAN_CACHE", os.path.join("artifacts", ".scan_cache"))
+DEFAULT_MAX_BYTES = 512 << 20
+SALT_MODULES = ("scanner", "entropy_engine", "features", "indicators", "strategies", "risk", "execution",
+                "policy", "session", "calendar_index", "resample", "capsule_logger", "ledger", "data", "ticks",
+                "trade_batch")
+
+
+@functools.lru_cache(maxsize=None)
+def code_salt() -> str:
+    """Hash of CACHE_VERSION and the source of SALT_MODULES."""
+    h = hashlib.blake2b(str(CACHE_VERSION).encode(), digest_size=16)
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in SALT_MODULES:
+        with open(os.path.join(here, name + ".py"), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def scan_key(fingerprint: str, symbol: str, variant: Any, atr_period: int) -> str:
+    """Cache key of one variant's scan over the data with `fingerprint` (features.data_fingerprint)."""
+    v = asdict(variant)
+    v.pop("name")                                   # only picks the output directory
+    v["day_policy"] = {"max_trades": variant.day_policy.max_trades, "dd_limit_r": variant.day_policy.dd_limit_r}
+    payload = {
+        "data": fingerprint, "symbol": symbol, "atr_period": atr_period, "variant": v,
+        "thresholds": [entropy_engine.NP_WALL, entropy_engine.RECOV_EPS, entropy_engine.RECOV_WIN],
+        "sessions": [[s.name, s.tz, s.start] for s in DEFAULT_SESSIONS] + [weight_table().tolist()],
+        "salt": code_salt(),
+    }
+    return hashlib.blake2b(json.dumps(payload, sort_keys=True, default=repr).encode(), digest_size=20).hexdigest()
+
+
+class ScanCache:
+    def __init__(self, root: str = DEFAULT_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key + ".ndjson")
+
+    def get(self, key: str) -> Optional[Tuple[int, float, List[Dict[str, Any]]]]:
+        """(num_trades, cumR, capsules) of a stored scan, or None."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                head = json.loads(f.readline())
+                caps = [json.loads(line) for line in f]
+            if head.get("version") != CACHE_VERSION or len(caps) != head["trades"]:
+                raise ValueError("stale or truncated entry")
+        except (OSError, ValueError, KeyError):
+            self._count("cache.miss")
+            return None
+        try:
+            os.utime(path)                          # LRU: most recently used last to go
+        except OSError:
+            pass
+        self._count("cache.hit")
+        return int(head["trades"]), float(head["cumR"]), caps
+
+    def put(self, key: str, trades: int, cum_r: float, caps: List[Dict[str, Any]]) -> None:
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=key[:8], suffix=".tmp", dir=self.root)
+        except OSError:
+            return                                  # read-only location: run uncached
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"version": CACHE_VERSION, "trades": trades, "cumR": cum_r}) + "\n")
+                for cap in caps:
+                    f.write(json.dumps(cap, separators=(",", ":")) + "\n")
+            os.replace(tmp, self._path(key))
+        except OSError:
+            pass
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self.evict()
+
+    def size(self) -> int:
+        return sum(e.stat().st_size for e in self._entries())
+
+    def _entries(self) -> List[os.DirEntry]:
+        try:
+            return [e for e in os.scandir(self.root) if e.name.endswith(".ndjson")]
+        except OSError:
+            return []
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the cache fits `max_bytes`; returns how many."""
+        stats = []
+        for e in self._entries():
+            try:
+                st = e.stat()
+            except OSError:
+                continue                            # removed by another job
+            stats.append((st.st_mtime_ns, st.st_size, e.path))
+        total = sum(s for _, s, _ in stats)
+        dropped = 0
+        for _, size, path in sorted(stats):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                dropped += 1
+            except OSError:
+                pass
+            total -= size
+        return dropped
+
+    def clear(self) -> None:
+        for e in self._entries():
+            try:
+                os.remove(e.path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _count(name: str) -> None:
+        prof = active()
+        if prof:
+            prof.count(name)
@@ -1,23 +1,82 @@
 from __future__ import annotations
-import pandas as pd
+from .lazy import pandas as pd
 import numpy as np
-from typing import Iterable, Tuple
-from .entropy_engine import atr, delta_phi, verdict_from_series
+from contextlib import ExitStack
+from dataclasses import dataclass, field, fields, replace
+from typing import Dict, Iterable, List, Optional, Sequence
+from .entropy_engine import atr, delta_phi, verdict_from_series, ChunkedVerdict, Verdict, GLYPHS
+from .calendar_index import calendar_index
+from .data import Bars, BarStamps
+from .indicators import ATR, RollingSMA
+from .session import weight_table
+from .features import FeatureFrame, data_fingerprint, feature_frame
 from .risk import RiskParams, position_size, stops_targets
-from .session import session_weight
 from .execution import fill_trade
-from .capsule_logger import trade_capsule, write_ndjson
+from .ticks import TickFile, TickFill
+from .scan_cache import ScanCache, scan_key
+from .capsule_logger import CapsuleSink
 from .policy import DailyBook, DayPolicy
+from .profiling import active, clock
+from .resample import pyramid_for
 from .strategies import entry_side, Mode
+from .trade_batch import ScanResult, TradeBatch
 def stream_dphi(high: np.ndarray, low: np.ndarray, close: np.ndarray, atr_period: int) -> np.ndarray:
     a = atr(high, low, close, atr_period)
     return delta_phi(a, close)
 
+
+@dataclass
+class Variant:
+    """One strategy configuration scanned by `multi_variant_scan`."""
+    name: str
+    mode: Mode = "collapse"
+    rev_k: float = 1.0
+    ma_period: int = 20
+    risk: RiskParams = field(default_factory=RiskParams)
+    day_policy: DayPolicy = field(default_factory=DayPolicy)
+    look_ahead_bars: int = 64
+    cooldown_bars: int = 10
+    equity: float = 50_000.0
+    confirm_tf: Optional[str] = None   # higher timeframe for confluence, e.g. "1h"
+    confirm_glyphs: str = "⟿"         # glyphs its last closed bar must show
+
+
+VARIANT_ALIASES = {"ma": "ma_period", "confirm": "confirm_glyphs", "lookahead": "look_ahead_bars", "cooldown": "cooldown_bars",
+                   "max_trades": "day_policy.max_trades", "dd_r": "day_policy.dd_limit_r",
+                   "rr": "risk.rr", "atr_mult": "risk.atr_mult", "risk_pct": "risk.risk_pct"}
+
+
+def parse_variant(spec: str, base: Variant) -> Variant:
+    """`"B2:mode=recovery,rev_k=1.5,ma=30"` → Variant named B2; keys not given keep `base` values."""
+    name, _, body = spec.partition(":")
+    if not name.strip():
+        raise ValueError(f"bad variant spec {spec!r}; use NAME:key=v,key=v")
+    v = replace(base, name=name.strip(), risk=replace(base.risk), day_policy=replace(base.day_policy))
+    for item in filter(None, (s.strip() for s in body.split(","))):
+        key, _, val = item.partition("=")
+        path = VARIANT_ALIASES.get(key.strip(), key.strip())
+        owner, _, attr = path.rpartition(".")
+        obj = getattr(v, owner) if owner else v
+        types = {f.name: f.type for f in fields(obj)}
+        if attr in ("name", "risk", "day_policy") or attr not in types or not val or attr.startswith("_"):
+            raise ValueError(f"bad variant key {key!r} in {spec!r}")
+        if attr == "mode":
+            if val not in ("collapse", "recovery"):
+                raise ValueError(f"bad mode {val!r} in {spec!r}")
+            conv = str
+        elif "str" in str(types[attr]):
+            conv = str
+        else:
+            conv = int if types[attr] in (int, "int") else float
+        setattr(obj, attr, conv(val))
+    return v
+
+
 def multi_entry_scan(
-    df: pd.DataFrame,
+    df: pd.DataFrame | Bars,
     symbol: str,
     risk: RiskParams,
-    outdir: str = "artifacts",
+    outdir: Optional[str] = "artifacts",
     atr_period: int = 14,
     look_ahead_bars: int = 64,
     cooldown_bars: int = 10,
@@ -26,74 +85,354 @@ def multi_entry_scan(
     mode: Mode = "collapse",
     rev_k: float = 1.0,
     ma_period: int = 20,
-) -> Tuple[int, float]:
+    reference: bool = False,
+    features: Optional[FeatureFrame] = None,
+    sink: Optional[CapsuleSink] = None,
+    confirm_tf: Optional[str] = None,
+    confirm_glyphs: str = "⟿",
+    ticks: Optional[TickFile] = None,
+    cache: Optional[ScanCache] = None,
+) -> ScanResult:
     """
     Walks the chart; on each bar i, compute verdict from a rolling window (up to i),
     fire on collapse (⟿), then simulate bar-by-bar fills forward.
-    Returns (num_trades, cumR).
+    Per-bar inputs come from a FeatureFrame (cached per data/atr_period unless passed in);
+    only bars whose glyph matches the mode are visited.
+    Verdicts come from the precomputed `verdict_columns` of the FeatureFrame;
+    `reference=True` re-scans the ΔΦ prefix every bar instead (quadratic, for checks).
+    With `confirm_tf` (e.g. "1h"), a bar is only taken when the last closed bar of that
+    timeframe has a glyph in `confirm_glyphs` (confluence, no lookahead; see resample.py).
+    With `ticks`, exits resolve at the first touching tick (see ticks.TickFill).
+    With `cache`, a scan already run on the same data and parameters is replayed from disk.
+    Capsules go to `sink` if given, else to a CapsuleSink on {outdir}/trades.ndjson
+    (`outdir=None`: no disk output).
+    Returns (num_trades, cumR) as a ScanResult whose `.batch` holds the trades (TradeBatch).
     """
-    assert isinstance(df.index, pd.DatetimeIndex), "df index must be DatetimeIndex"
-    high, low, close = df["high"].values, df["low"].values, df["close"].values
-    dphi_all = stream_dphi(high, low, close, atr_period)
-    book = DailyBook(day_policy)
-
-    trades = 0
-    cumR = 0.0
-    cooldown = 0
-
-    warmup = max(atr_period + 20, 30)
-    for i in range(warmup, len(close) - 2):
-        ts = df.index[i]
-        day_key = ts.date().isoformat()
-        policy = book.policy_for(day_key)
-
-        if cooldown > 0:
-            cooldown -= 1
-            continue
-        if not policy.can_enter():
-            continue
-
-        # verdict from series up to i (rolling)
-        v = verdict_from_series(dphi_all[: i + 1])
-
-        # Gate by glyph according to mode
-        if mode == "collapse":
-            if v.glyph != "⟿":
-                continue
-        else:  # recovery mode
-            if v.glyph != "☑":
+    v = Variant(symbol, mode, rev_k, ma_period, risk, day_policy, look_ahead_bars, cooldown_bars, equity,
+                confirm_tf, confirm_glyphs)
+    res = multi_variant_scan(df, symbol, [v], {symbol: outdir}, atr_period, reference, features,
+                             None if sink is None else {symbol: sink}, ticks, cache)
+    return res[symbol]
+
+
+def multi_variant_scan(
+    df: pd.DataFrame | Bars,
+    symbol: str,
+    variants: Sequence[Variant],
+    outdirs: Optional[Dict[str, str]] = None,
+    atr_period: int = 14,
+    reference: bool = False,
+    features: Optional[FeatureFrame] = None,
+    sinks: Optional[Dict[str, CapsuleSink]] = None,
+    ticks: Optional[TickFile] = None,
+    cache: Optional[ScanCache] = None,
+) -> Dict[str, ScanResult]:
+    """
+    `multi_entry_scan` for several variants in one walk over the bars. The verdict of a bar
+    is evaluated once and shared; cooldown, DailyBook, side and fills are per variant.
+    Capsules of variant `name` go to `sinks[name]` if given, else to
+    {outdirs[name]}/trades.ndjson (default artifacts/{name}; None writes nothing).
+    `df` may also be an iterable of consecutive DataFrame chunks (see `chunked_scan`), or
+    `data.Bars` (e.g. the memory-mapped CSV cache), scanned without pandas unless a
+    reference, tick or confluence scan needs the DataFrame.
+    With `cache` (not for reference, tick or chunked scans), variants whose data and
+    parameters were scanned before replay their stored capsules; the rest are scanned and stored.
+    Returns {name: ScanResult}, each equal to a separate `multi_entry_scan`.
+    """
+    if isinstance(df, Bars):
+        if df.ts is None or reference or ticks is not None or any(v.confirm_tf for v in variants):
+            df = df.to_frame()
+    elif not isinstance(df, pd.DataFrame):
+        if reference or features is not None or ticks is not None or cache is not None:
+            raise ValueError("chunked scans take no reference/features/ticks/cache")
+        return chunked_scan(df, symbol, variants, outdirs, atr_period, sinks)
+    assert isinstance(df, Bars) or isinstance(df.index, pd.DatetimeIndex), "df index must be DatetimeIndex"
+    _check_names(variants)
+    if cache is not None and not reference and ticks is None:
+        return _cached_scan(df, symbol, variants, outdirs, atr_period, features, sinks, cache)
+    prof = active()
+    t = clock() if prof else 0
+    ff = features if features is not None else feature_frame(df, atr_period)
+    if isinstance(df, Bars):
+        high, low, index = df.columns["high"], df.columns["low"], BarStamps(df)
+    else:
+        high, low, index = df["high"].values, df["low"].values, df.index
+    if prof:
+        t = prof.lap("scan.features", t)
+
+    warmup = _warmup(atr_period)
+    stop_bar = len(ff) - 2
+    wants = _wants(variants)
+    ref = None
+    if reference:
+        ref = {i: verdict_from_series(ff.dphi[: i + 1]) for i in range(warmup, stop_bar)}
+        codes = np.array([GLYPHS.index(ref[i].glyph) for i in range(warmup, stop_bar)], dtype=np.int8)
+    else:
+        codes = ff.glyph[warmup:stop_bar]
+    candidates = np.flatnonzero(np.isin(codes, wants)) + warmup
+    if prof:
+        t = prof.lap("scan.verdicts" if reference else "scan.candidates", t)
+        prof.count("scan.bars", len(ff))
+        prof.count("scan.glyph_hits", sum(int(np.count_nonzero(codes == w)) for w in wants))
+
+    confirms = [pyramid_for(df).confluence(v.confirm_tf, tuple(v.confirm_glyphs), atr_period) if v.confirm_tf
+                else None for v in variants]
+    tick_fill = TickFill(ticks, df) if ticks is not None else None
+    with ExitStack() as stack:
+        walk = _Walk(symbol, variants, len(ff.day_keys), warmup, _sinks(stack, variants, outdirs, sinks),
+                     confirms, tick_fill)
+        walk.run(candidates, codes[candidates - warmup], ff, high, low, index, 0, len(ff), ref)
+        if prof:
+            t = clock()
+    if prof:
+        prof.lap("scan.sink_close", t)
+    return walk.result()
+
+
+def _cached_scan(df: pd.DataFrame | Bars, symbol: str, variants: Sequence[Variant], outdirs: Optional[Dict[str, str]],
+                 atr_period: int, features: Optional[FeatureFrame], sinks: Optional[Dict[str, CapsuleSink]],
+                 cache: ScanCache) -> Dict[str, ScanResult]:
+    fp = data_fingerprint(df)
+    keys = {v.name: scan_key(fp, symbol, v, atr_period) for v in variants}
+    res: Dict[str, ScanResult] = {}
+    with ExitStack() as stack:
+        outs = dict(zip(keys, _sinks(stack, variants, outdirs, sinks)))
+        misses = []
+        for v in variants:
+            hit = cache.get(keys[v.name])
+            if hit is None:
+                misses.append(v)
                 continue
+            batch = TradeBatch()
+            for cap in hit[2]:
+                cap["capsule_id"] = batch.next_id()      # a replay is a new run: fresh ids
+                batch.write(cap)
+                if outs[v.name] is not None:
+                    outs[v.name].write(cap)
+            res[v.name] = ScanResult(*hit[:2], batch)
+        if misses:
+            res.update(multi_variant_scan(df, symbol, misses, atr_period=atr_period, features=features,
+                                          sinks={v.name: outs[v.name] for v in misses}))
+            for v in misses:
+                cache.put(keys[v.name], *res[v.name], list(res[v.name].batch.capsules()))
+    return {v.name: res[v.name] for v in variants}
+
+
+def _check_names(variants: Sequence[Variant]) -> None:
+    names = [v.name for v in variants]
+    if len(set(names)) != len(names):
+        raise ValueError(f"variant names must be unique: {names}")
+
+
+def _warmup(atr_period: int) -> int:
+    return max(atr_period + 20, 30)
+
+
+def _wants(variants: Sequence[Variant]) -> List[int]:
+    return [GLYPHS.index("⟿" if v.mode == "collapse" else "☑") for v in variants]
+
+
+def _sinks(stack: ExitStack, variants: Sequence[Variant], outdirs: Optional[Dict[str, str]],
+           sinks: Optional[Dict[str, CapsuleSink]]) -> List[Optional[CapsuleSink]]:
+    outs: List[Optional[CapsuleSink]] = []
+    for v in variants:
+        outdir = (outdirs or {}).get(v.name, f"artifacts/{v.name}")
+        if sinks and v.name in sinks:
+            outs.append(sinks[v.name])
+        elif outdir is None:
+            outs.append(None)
+        else:
+            outs.append(stack.enter_context(CapsuleSink(f"{outdir}/trades.ndjson")))
+    return outs
+
+
+class _Walk:
+    """
+    Per-variant entry state of one scan (cooldown, DailyBook, totals, TradeBatch, optional
+    sink), advanced over candidate bars. Bar numbers are global; the arrays given to `run` hold bar `off + j` at
+    position j, so the chunked scan can feed one window at a time.
+    """
+
+    def __init__(self, symbol: str, variants: Sequence[Variant], n_days: int, warmup: int,
+                 outs: List[Optional[CapsuleSink]], confirms: Optional[List] = None, tick_fill: Optional[TickFill] = None):
+        self.symbol, self.variants, self.outs = symbol, list(variants), outs
+        self.wants = _wants(variants)
+        self.books = [DailyBook(v.day_policy, n_days) for v in variants]
+        self.confirms = confirms or [None] * len(self.variants)
+        self.tick_fill = tick_fill
+        self.next_free = [warmup] * len(self.variants)  # first bar after the cooldown of the previous entry
+        self.trades = [0] * len(self.variants)
+        self.cum_r = [0.0] * len(self.variants)
+        self.batches = [TradeBatch() for _ in self.variants]
+
+    def result(self) -> Dict[str, ScanResult]:
+        return {v.name: ScanResult(self.trades[k], self.cum_r[k], self.batches[k]) for k, v in enumerate(self.variants)}
+
+    def run(self, candidates: np.ndarray, glyphs: np.ndarray, ff: FeatureFrame, high: np.ndarray,
+            low: np.ndarray, index: pd.Index | BarStamps, off: int, n_bars: int, ref: Optional[Dict[int, Verdict]] = None) -> None:
+        """Visit `candidates` (global bars, glyph codes in `glyphs`); `n_bars` is the series length."""
+        prof = active()
+        t = 0
+        variants, books, confirms, next_free = self.variants, self.books, self.confirms, self.next_free
+        close = ff.close
+        ma_cols = [ff.sma(v.ma_period) if v.mode == "recovery" else None for v in variants]
+        for i, g in zip(candidates.tolist(), glyphs.tolist()):
+            j = i - off
+            verdict: Optional[Verdict] = None  # shared by every variant taking bar i
+            for k, v in enumerate(variants):
+                if self.wants[k] != g:
+                    continue
+                if i < next_free[k]:
+                    if prof:
+                        prof.count("skip.cooldown")
+                    continue
+                if confirms[k] is not None and not confirms[k][i]:
+                    if prof:
+                        prof.count("skip.confluence")
+                    continue
+                day = int(ff.day[j])
+                if not books[k].can_enter(day):
+                    if prof:
+                        prof.count("skip.policy")
+                    continue
+
+                if prof:
+                    t = clock()
+                atr_i = float(ff.atr[j])  # ATR at i
+                ma_col = ma_cols[k]
+                side = entry_side(v.mode, close[: j + 1], atr_i, lookback=20, k=v.rev_k, ma_period=v.ma_period,
+                                  ma=None if ma_col is None else float(ma_col[j]))
+                if prof:
+                    t = prof.lap("scan.entry_side", t)
+                if side == "wait":
+                    if prof:
+                        prof.count("skip.wait")
+                    continue
+                if verdict is None:
+                    verdict = ref[i] if ref is not None else ff.verdict(j)
+
+                entry = float(close[j])
+                w = float(ff.session_w[j])
+                size = max(1, int(position_size(v.equity, atr_i, entry, v.risk) * w))
+                stop, target = stops_targets(entry, side, atr_i, v.risk)
+                if prof:
+                    t = prof.lap("scan.sizing", t)
+
+                if self.tick_fill is not None:
+                    exit_px, reason, bars_held = self.tick_fill.fill(i, entry, side, stop, target, v.look_ahead_bars)
+                else:
+                    highs_next = high[j + 1 : j + 1 + v.look_ahead_bars]
+                    lows_next  = low [j + 1 : j + 1 + v.look_ahead_bars]
+                    exit_px, reason, bars_held = fill_trade(entry, side, stop, target, highs_next, lows_next)
+                if prof:
+                    t = prof.lap("scan.fill", t)
+
+                risk_per_unit = abs(entry - stop)
+                r_mult = ((exit_px - entry) if side == "long" else (entry - exit_px)) / risk_per_unit if risk_per_unit > 0 else 0.0
+                self.cum_r[k] += r_mult
+                self.trades[k] += 1
+                books[k].register(day, r_mult)
+                next_free[k] = i + v.cooldown_bars + 1
+
+                batch = self.batches[k]
+                pnl = (exit_px - entry) * (1 if side == "long" else -1)
+                batch.append((batch.next_id(), self.symbol, side, entry, exit_px, pnl,
+                              verdict.glyph, verdict.np_wall, verdict.no_recovery, verdict.sat_like, verdict.delta_phi,
+                              size, stop, target, reason, bars_held, r_mult,
+                              str(index[j]), str(index[min(n_bars - 1, i + 1 + bars_held) - off])))
+                if self.outs[k] is not None:
+                    self.outs[k].write(batch.capsule(len(batch) - 1))
+                if prof:
+                    prof.lap("scan.capsule", t)
+                    prof.count("trades")
+
+
+def _feature_chunk(df: pd.DataFrame, atr_k: ATR, smas: Dict[int, RollingSMA], verdicts: ChunkedVerdict,
+                   day_ids: Dict[str, int]) -> Dict[str, np.ndarray]:
+    """Feature columns of the next chunk, continuing the carried kernel / verdict / day state."""
+    high, low, close = (np.array(df[c].values, dtype=float) for c in ("high", "low", "close"))
+    a = atr_k.extend(high, low, close)
+    dphi = delta_phi(a, close)
+    np_wall, no_recovery, sat_like, glyph = verdicts.extend(dphi)
+    cal = calendar_index(df.index)
+    day = np.array([day_ids.setdefault(key, len(day_ids)) for key in cal.day_keys], dtype=np.int64)[cal.day]
+    cols = {"high": high, "low": low, "close": close, "atr": a, "dphi": dphi, "np_wall": np_wall,
+            "no_recovery": no_recovery, "sat_like": sat_like, "glyph": glyph, "day": day,
+            "session_w": weight_table()[cal.session]}
+    cols.update({f"sma{p}": k.extend(close) for p, k in smas.items()})
+    return cols
+
+
+def chunked_scan(
+    chunks: Iterable[pd.DataFrame],
+    symbol: str,
+    variants: Sequence[Variant],
+    outdirs: Optional[Dict[str, str]] = None,
+    atr_period: int = 14,
+    sinks: Optional[Dict[str, CapsuleSink]] = None,
+) -> Dict[str, ScanResult]:
+    """
+    `multi_variant_scan` over consecutive DataFrame chunks (e.g. `data.iter_frames`), with
+    trades, cumR and capsules identical to the in-memory scan of the concatenated series.
+    Kernel state (ATR, SMAs, verdict, day ids) continues across chunks, and a window keeps
+    the entry-side history behind the next undecided bar plus the look-ahead bars after the
+    last decided one, so bar memory is bounded by the chunk size (trades stay in the batches). Confluence (`confirm_tf`)
+    needs the whole series and is not available here.
+    """
+    _check_names(variants)
+    if any(v.confirm_tf for v in variants):
+        raise ValueError("confirm_tf needs the whole series; use multi_variant_scan on a DataFrame")
+    prof = active()
+    t = clock() if prof else 0
+    warmup = _warmup(atr_period)
+    wants = _wants(variants)
+    hold = max(v.look_ahead_bars for v in variants) + 2     # bars after a decided bar: fills, exit stamps
+    keep = max([21] + [v.ma_period for v in variants]) + 1  # bars before an undecided bar: entry_side
+    atr_k = ATR(atr_period)
+    smas = {v.ma_period: RollingSMA(v.ma_period) for v in variants if v.mode == "recovery"}
+    verdicts, day_ids = ChunkedVerdict(), {}
+    buf: Dict[str, np.ndarray] = {}
+    index: Optional[pd.Index] = None
+    off = done = 0                                           # global bar of buf[0]; first undecided bar
 
-        atr_i = float(atr(high, low, close, atr_period)[i])  # ATR at i
-        side = entry_side(mode, close[: i + 1], atr_i, lookback=20, k=rev_k, ma_period=ma_period)
-        if side == "wait":
-            continue
-
-        entry = float(close[i])
-        w = session_weight(ts)
-        size = max(1, int(position_size(equity, atr_i, entry, risk) * w))
-        stop, target = stops_targets(entry, side, atr_i, risk)
-
-        highs_next = high[i + 1 : i + 1 + look_ahead_bars]
-        lows_next  = low [i + 1 : i + 1 + look_ahead_bars]
-        exit_px, reason, bars_held = fill_trade(entry, side, stop, target, highs_next, lows_next)
-
-        risk_per_unit = abs(entry - stop)
-        r_mult = ((exit_px - entry) if side == "long" else (entry - exit_px)) / risk_per_unit if risk_per_unit > 0 else 0.0
-        cumR += r_mult
-        trades += 1
-        policy.register(r_mult)
-        cooldown = cooldown_bars
-
-        cap = trade_capsule(
-            symbol, side, entry, exit_px,
-            {
-                "glyph": v.glyph, "np_wall": v.np_wall, "no_recovery": v.no_recovery,
-                "sat_like": v.sat_like, "ΔΦ_last": v.delta_phi, "size": size,
-                "stop": stop, "target": target, "exit_reason": reason, "bars_held": bars_held, "R": r_mult
-            },
-            str(ts), str(df.index[min(len(df.index) - 1, i + 1 + bars_held)])
-        )
-        write_ndjson(f"{outdir}/trades.ndjson", cap)
-
-    return trades, cumR
+    with ExitStack() as stack:
+        walk = _Walk(symbol, variants, 0, warmup, _sinks(stack, variants, outdirs, sinks))
+        it = iter(chunks)
+        cur = next(it, None)
+        while cur is not None:
+            nxt = next(it, None)
+            assert isinstance(cur.index, pd.DatetimeIndex), "df index must be DatetimeIndex"
+            if len(cur):
+                cols = _feature_chunk(cur, atr_k, smas, verdicts, day_ids)
+                buf = {k: np.concatenate([buf[k], c]) if buf else c for k, c in cols.items()}
+                index = cur.index if index is None else index.append(cur.index)
+            seen = off + len(index) if index is not None else 0
+            end = seen - 2 if nxt is None else seen - hold  # candidates below `end` are decided now
+            if prof:
+                t = prof.lap("scan.features", t)
+                prof.count("scan.bars", len(cur))
+            if end > max(done, warmup):
+                lo = max(done, warmup)
+                codes = buf["glyph"][lo - off: end - off]
+                hits = np.flatnonzero(np.isin(codes, wants))
+                ff = FeatureFrame(buf["close"], buf["atr"], buf["dphi"], buf["np_wall"], buf["no_recovery"],
+                                  buf["sat_like"], buf["glyph"], buf["day"], [], buf["session_w"],
+                                  {p: buf[f"sma{p}"] for p in smas})
+                if prof:
+                    t = prof.lap("scan.candidates", t)
+                    prof.count("scan.glyph_hits", sum(int(np.count_nonzero(codes == w)) for w in wants))
+                walk.run(hits + lo, codes[hits], ff, buf["high"], buf["low"], index, off, seen)
+                done = end
+                if prof:
+                    t = clock()
+            cut = max(0, done - keep - off)
+            if cut:
+                buf = {k: c[cut:] for k, c in buf.items()}
+                index = index[cut:]
+                off += cut
+            cur = nxt
+        if prof:
+            t = clock()
+    if prof:
+        prof.lap("scan.sink_close", t)
+    return walk.result()
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import argparse, glob, os, time
+from .cli import run_command
+from .portfolio_runner import parse_symbol_map
+
+
+def run(args: argparse.Namespace) -> None:
+    from .screener import load_universe, screen
+    from .profiling import profiled
+    with profiled(args):
+        symmap = parse_symbol_map(args.csv)
+        if args.dir:
+            for path in sorted(glob.glob(os.path.join(args.dir, "*.csv"))):
+                symmap.setdefault(os.path.splitext(os.path.basename(path))[0], path)
+        t0 = time.perf_counter()
+        universe = load_universe(symmap, args.bars or None)
+        t1 = time.perf_counter()
+        table = screen(universe, args.atr)
+        t2 = time.perf_counter()
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        table.to_csv(args.out)
+        print(table.head(args.top)[["symbol", "glyph", "dphi_last", "side", "bars", "asof"]].to_string())
+        print(f"[SCREEN] symbols={len(table)} collapse={int((table['glyph'] == '⟿').sum())} "
+              f"in {t2 - t0:.3f}s (load {t1 - t0:.3f}s, screen {t2 - t1:.3f}s) → {args.out}")
+
+
+def main(argv=None):
+    run_command("screen", run, argv)
+
+
+if __name__ == "__main__":
+    main()
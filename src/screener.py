@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Cross-sectional screener: the current ΔΦ verdict of a whole universe in one pass.
+
+Symbols are stacked into (symbols × bars) arrays, right-aligned on each symbol's latest
+bar. Shorter histories are NaN-padded on the left and masked by `start` (the first own
+column of each row). ATR, ΔΦ and the verdict fields are computed along axis 1 for every
+row at once. Each row equals that symbol's own `build_features` / `verdict_from_series`
+over the same bars, and the side follows `EntropyStrategy.run`.
+"""
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List, Mapping, Optional, Tuple
+import numpy as np
+from .lazy import pandas as pd
+from .data import Bars, BarStamps, load_bars
+from .entropy_engine import GLYPHS, NP_WALL, RECOV_EPS, RECOV_WIN, delta_phi
+
+GLYPH_RANK = np.array([2, 0, 1])   # by glyph code: ⟿ (actionable) first, then ☑, then ⚖
+TREND_BARS = 20                    # side of a ⟿: close vs the close TREND_BARS - 1 bars back
+
+
+@dataclass
+class Universe:
+    symbols: List[str]
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    start: np.ndarray      # first own column per row; columns before it are padding
+    asof: List[str]        # latest bar's timestamp per symbol ("" without timestamps)
+
+    @property
+    def valid(self) -> np.ndarray:
+        return np.arange(self.close.shape[1]) >= self.start[:, None]
+
+
+def _last_stamp(df: Bars | pd.DataFrame) -> str:
+    if isinstance(df, Bars):
+        return BarStamps(df)[len(df) - 1] if df.ts is not None and len(df) else ""
+    return str(df.index[-1]) if isinstance(df.index, pd.DatetimeIndex) and len(df) else ""
+
+
+def stack_universe(series: Mapping[str, Bars | pd.DataFrame], bars: Optional[int] = None) -> Universe:
+    """Right-align each symbol's last `bars` bars (all when None) into 2-D arrays."""
+    cols = {c: [np.asarray(df.columns[c] if isinstance(df, Bars) else df[c].values, dtype=float)[-bars if bars else 0:]
+                for df in series.values()] for c in ("high", "low", "close")}
+    lens = np.array([a.size for a in cols["close"]], dtype=np.int64)
+    n = int(lens.max()) if lens.size else 0
+    stacked = {}
+    for c, arrays in cols.items():
+        out = stacked[c] = np.full((lens.size, n), np.nan)
+        for i, a in enumerate(arrays):
+            out[i, n - a.size:] = a
+    return Universe(list(series), stacked["high"], stacked["low"], stacked["close"], n - lens,
+                    [_last_stamp(df) for df in series.values()])
+
+
+def load_universe(paths: Mapping[str, str], bars: Optional[int] = None) -> Universe:
+    """`stack_universe` over SYMBOL → CSV, read through the binary cache (tails only with `bars`)."""
+    return stack_universe({sym: load_bars(path, columns=("high", "low", "close")) for sym, path in paths.items()}, bars)
+
+
+def atr_rows(high: np.ndarray, low: np.ndarray, close: np.ndarray, start: np.ndarray, period: int = 14) -> np.ndarray:
+    """`entropy_engine.atr` of every row's own bars (bit-identical); NaN in the padding."""
+    period = max(1, int(period))
+    rows, n = close.shape
+    k = np.arange(n) - start[:, None]                  # position within the row's own series
+    pc = np.empty_like(close)
+    pc[:, 1:] = close[:, :-1]
+    own = np.flatnonzero(start < n)
+    pc[own, start[own]] = close[own, start[own]]       # first own bar: its own close
+    tr = np.maximum(np.maximum(high - low, np.abs(high - pc)), np.abs(low - pc))
+    tr[k < 0] = 0.0                                    # padding adds exact zeros to the running sum
+    c = np.cumsum(tr, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = c / (k + 1)                              # warmup: expanding mean
+        if n > period:
+            full = k[:, period:] >= period
+            out[:, period:][full] = ((c[:, period:] - c[:, :-period]) / period)[full]
+    out[k < 0] = np.nan
+    return out
+
+
+def verdict_rows(dphi: np.ndarray, start: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Verdict of each row's whole own series, as `verdict_from_series` gives it:
+    (np_wall, no_recovery, sat_like, glyph_code) per row, glyph_code indexing GLYPHS.
+    """
+    rows, n = dphi.shape
+    cols = np.arange(n)
+    valid = cols >= start[:, None]
+    last_spike = np.where(valid & (dphi > NP_WALL), cols, -1).max(axis=1, initial=-1)
+    np_wall = last_spike >= 0
+    # recovered iff the RECOV_WIN bars after the last spike exist and all sit at or below RECOV_EPS
+    tail = (cols > last_spike[:, None]) & (cols <= last_spike[:, None] + RECOV_WIN)
+    bad = ~(dphi <= RECOV_EPS)
+    no_recovery = ~(np_wall & (last_spike < n - 1) & ~(bad & tail).any(axis=1)) & (start < n)  # empty: False
+    with np.errstate(invalid="ignore"):
+        rising = ~(np.diff(dphi, axis=1) <= 1e-9) & valid[:, :-1]
+    sat_like = ~rising.any(axis=1)
+    glyph = np.where(np_wall & no_recovery & ~sat_like, 1, np.where(sat_like, 0, 2)).astype(np.int8)
+    return np_wall, no_recovery, sat_like, glyph
+
+
+def screen(u: Universe, atr_period: int = 14) -> pd.DataFrame:
+    """
+    Ranked table of the universe: ⟿ first, then ☑, then ⚖, each by ΔΦ_last descending.
+    `side` is the `EntropyStrategy.run` bias of a ⟿ (long when close rose over the last
+    TREND_BARS bars, or over the whole history when it is shorter), else "wait".
+    """
+    rows, n = u.close.shape
+    dphi = delta_phi(atr_rows(u.high, u.low, u.close, u.start, atr_period), u.close)
+    np_wall, no_recovery, sat_like, glyph = verdict_rows(dphi, u.start)
+    empty = u.start >= n
+    last = np.where(empty, 0.0, dphi[:, -1] if n else 0.0)
+    if n:
+        ref = u.close[np.arange(rows), np.maximum(n - TREND_BARS, np.minimum(u.start, n - 1))]
+        side = np.where(glyph != 1, "wait", np.where(u.close[:, -1] > ref, "long", "short"))
+    else:
+        side = np.full(rows, "wait")
+    order = np.lexsort((-last, GLYPH_RANK[glyph]))
+    table = pd.DataFrame({
+        "symbol": np.array(u.symbols, dtype=object), "glyph": np.array(GLYPHS, dtype=object)[glyph],
+        "dphi_last": last, "side": side, "np_wall": np_wall, "no_recovery": no_recovery, "sat_like": sat_like,
+        "bars": n - u.start, "asof": np.array(u.asof, dtype=object),
+    }).iloc[order].reset_index(drop=True)
+    table.index = pd.RangeIndex(1, rows + 1, name="rank")
+    return table
@@ -1,6 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
-import pandas as pd
+from typing import Sequence
+import numpy as np
+from .lazy import pandas as pd
+from .calendar_index import DEFAULT_SESSIONS, Session, session_ids_utc, utc_ns
 
 
 @dataclass
@@ -10,12 +13,21 @@ class SessionWeights:
     ny: float = 1.5
 
 
-def session_weight(ts: pd.Timestamp, w: SessionWeights = SessionWeights()) -> float:
-    # Simple UTC bands (tweak to your feed TZ):
-    h = ts.hour
-    if 0 <= h < 8:     # Asia
-        return w.asia
-    if 8 <= h < 13:    # London
-        return w.london
-    return w.ny       # NY default
+SESSION_NAMES = tuple(s.name for s in DEFAULT_SESSIONS)
 
+
+def weight_table(w: SessionWeights = SessionWeights(), sessions: Sequence[Session] = DEFAULT_SESSIONS) -> np.ndarray:
+    """Position-size multiplier per session id (sessions without a weight get 1.0)."""
+    return np.array([float(getattr(w, s.name, 1.0)) for s in sessions])
+
+
+def session_weight(ts: pd.Timestamp, w: SessionWeights = SessionWeights(),
+                   sessions: Sequence[Session] = DEFAULT_SESSIONS) -> float:
+    # DST-aware sessions from calendar_index; naive timestamps are taken as UTC
+    return float(session_weights(pd.DatetimeIndex([ts]), w, sessions)[0])
+
+
+def session_weights(index: pd.DatetimeIndex, w: SessionWeights = SessionWeights(),
+                    sessions: Sequence[Session] = DEFAULT_SESSIONS) -> np.ndarray:
+    """Vectorized `session_weight` over a whole index."""
+    return weight_table(w, sessions)[session_ids_utc(utc_ns(index), sessions)]
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Share one OHLCV DataFrame with worker processes through a single shared-memory block,
+so pool tasks carry only (start, stop) slices instead of pickled frames.
+"""
+from __future__ import annotations
+import gc
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Callable, List, Optional, Tuple, TypeVar
+import numpy as np
+from .lazy import pandas as pd
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class FrameSpec:
+    """Picklable handle: shm block name plus the layout needed to rebuild the frame."""
+    name: str
+    rows: int
+    columns: Tuple[str, ...]
+    has_ts: bool
+    tz: Optional[str]
+    unit: str
+    index_name: Optional[str]
+
+
+class SharedFrame:
+    """Owner side: copies numeric columns (+ epoch-ns index) into shm; `close()` unlinks it."""
+
+    def __init__(self, df: pd.DataFrame):
+        cols = tuple(c for c in df.columns if df[c].dtype.kind in "biuf")
+        idx = df.index
+        has_ts = isinstance(idx, pd.DatetimeIndex)
+        tz = str(idx.tz) if has_ts and idx.tz is not None else None
+        rows = len(df)
+        width = len(cols) + has_ts
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, rows * width * 8))
+        block = np.ndarray((width, rows), dtype=np.float64, buffer=self._shm.buf)
+        for k, c in enumerate(cols):
+            block[k] = df[c].to_numpy(dtype=np.float64)
+        if has_ts:
+            utc = idx.tz_convert("UTC").tz_localize(None) if tz else idx
+            block[-1].view(np.int64)[:] = utc.as_unit("ns").asi8
+        unit = idx.unit if has_ts else "ns"
+        self.spec = FrameSpec(self._shm.name, rows, cols, has_ts, tz, unit, idx.name)
+
+    def close(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self) -> "SharedFrame":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_attached: List[shared_memory.SharedMemory] = []  # keep worker-side mappings alive
+
+
+def _frame_over(shm: shared_memory.SharedMemory, spec: FrameSpec) -> pd.DataFrame:
+    width = len(spec.columns) + spec.has_ts
+    block = np.ndarray((width, spec.rows), dtype=np.float64, buffer=shm.buf)
+    block.flags.writeable = False
+    index: pd.Index = pd.RangeIndex(spec.rows)
+    if spec.has_ts:
+        index = pd.DatetimeIndex(block[-1].view(np.int64).view("datetime64[ns]"), name=spec.index_name)
+        if spec.tz:
+            index = index.tz_localize("UTC").tz_convert(spec.tz)
+        index = index.as_unit(spec.unit)
+    return pd.DataFrame({c: block[k] for k, c in enumerate(spec.columns)}, index=index, copy=False)
+
+
+def attach_frame(spec: FrameSpec) -> pd.DataFrame:
+    """Worker side: rebuild the DataFrame over the shared block (columns are views, not copies)."""
+    shm = shared_memory.SharedMemory(name=spec.name)
+    _attached.append(shm)
+    return _frame_over(shm, spec)
+
+
+def run_on_frame(spec: FrameSpec, fn: Callable[..., T], *args, **kw) -> T:
+    """Worker side, one-shot: `fn(frame, *args, **kw)`, then unmap the block (for long-lived pools)."""
+    shm = shared_memory.SharedMemory(name=spec.name)
+    try:
+        return fn(_frame_over(shm, spec), *args, **kw)
+    finally:
+        gc.collect()  # drop frame views before unmapping
+        try:
+            shm.close()
+        except BufferError:  # fn kept a view alive; keep the mapping instead
+            _attached.append(shm)
@@ -10,13 +10,16 @@ def collapse_side(close: np.ndarray, lookback: int = 20) -> str:
         return "wait"
     return "long" if close[-1] > close[-lookback] else "short"
 
-def recovery_side(close: np.ndarray, atr_val: float, k: float = 1.0, ma_period: int = 20) -> str:
+def recovery_side(close: np.ndarray, atr_val: float, k: float = 1.0, ma_period: int = 20,
+                  ma: float | None = None) -> str:
     """
     Mean-reversion toward SMA. If price is > k*ATR above SMA → short, below → long.
+    `ma` is the precomputed SMA at the last bar (e.g. from a FeatureFrame).
     """
     if close.size < ma_period:
         return "wait"
-    ma = sma(close, ma_period)[-1]
+    if ma is None:
+        ma = sma(close[-ma_period:], ma_period)[-1]  # only the last window is needed
     px = float(close[-1])
     if px >= ma + k * atr_val:
         return "short"
@@ -31,4 +34,4 @@ def entry_side(mode: Mode, close: np.ndarray, atr_val: float, **kw) -> str:
     else:
         k = float(kw.get("k", 1.0))
         ma = int(kw.get("ma_period", 20))
-        return recovery_side(close, atr_val, k=k, ma_period=ma)
+        return recovery_side(close, atr_val, k=k, ma_period=ma, ma=kw.get("ma"))
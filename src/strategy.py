@@ -1,11 +1,18 @@
 from __future__ import annotations
-import pandas as pd
+from .lazy import pandas as pd
 from dataclasses import dataclass, field
-from .entropy_engine import atr, delta_phi, verdict_from_series
-from .capsule_logger import trade_capsule, write_ndjson
+from typing import NamedTuple, Optional
+from .entropy_engine import verdict_from_series, StreamingVerdict
+from .features import feature_frame
+from .capsule_logger import trade_capsule, CapsuleSink
 from .risk import RiskParams, position_size, stops_targets
-from .session import session_weight
 from .execution import fill_trade  # NEW
+from .indicators import ATR
+from .profiling import active, clock
+from .calendar_index import SessionClock
+from .session import SessionWeights, weight_table
+from .trade_batch import TradeBatch
+LOOKBACK = 20  # collapse side compares the close with the close LOOKBACK bars back (close[-20])
 
 
 @dataclass
@@ -15,18 +22,72 @@ class Params:
     look_ahead_bars: int = 64  # simulate into the future this many bars
 
 
+class Bar(NamedTuple):
+    """One OHLCV bar for `EntropyStrategy.on_bar`; `ts` is epoch ns in UTC (naive feed times are taken as UTC)."""
+    ts: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+
+
 class EntropyStrategy:
-    def __init__(self, symbol: str, params: Params, outdir: str = "artifacts", equity: float = 50000.0):
+    def __init__(self, symbol: str, params: Params, outdir: Optional[str] = "artifacts", equity: float = 50000.0,
+                 sink: Optional[CapsuleSink] = None):
         self.symbol = symbol
         self.p = params
         self.outdir = outdir
         self.equity = equity
+        self.sink = sink  # shared sink across runs; default is a one-shot sink on {outdir}/trades.ndjson (None: no file)
+        self.trades = TradeBatch()  # every trade of `run`, for metrics without a re-read
+        self.reset_live()
+
+    def reset_live(self, weights: SessionWeights = SessionWeights()) -> None:
+        """Clear the incremental state used by `on_bar`."""
+        self._atr = ATR(self.p.atr_period)
+        self._sv = StreamingVerdict()
+        self._ring = [0.0] * LOOKBACK  # last LOOKBACK closes, oldest at _n % LOOKBACK
+        self._n = 0
+        self._weights = weight_table(weights).tolist()
+        self._session = SessionClock()
+
+    def on_bar(self, bar: Bar) -> dict:
+        """
+        Live path: fold one bar into fixed-size state (ATR kernel, StreamingVerdict, ring of
+        the last closes) and decide at that bar in O(1). glyph, side and ΔΦ equal `run` over
+        every bar seen so far; an entry also carries entry/stop/target/size at this bar.
+        """
+        close = bar.close
+        a = self._atr.update(bar.high, bar.low, close)
+        x = a / max(1e-9, close)
+        dphi = 0.0 if x < 0.0 else (1.0 if x > 1.0 else x)  # delta_phi for one bar
+        self._sv.update(dphi)
+        v = self._sv.verdict()
+        self._ring[self._n % LOOKBACK] = close
+        self._n += 1
+
+        side = "wait"
+        if v.glyph == "⟿" and self._n >= LOOKBACK:
+            side = "long" if close > self._ring[self._n % LOOKBACK] else "short"
+        out = {"symbol": self.symbol, "ts": bar.ts, "glyph": v.glyph, "side": side, "delta_phi_last": v.delta_phi}
+        if side != "wait":
+            w = self._weights[self._session(bar.ts)]
+            stop, target = stops_targets(close, side, a, self.p.risk)
+            out.update(entry=close, stop=stop, target=target,
+                       size=max(1, int(position_size(self.equity, a, close, self.p.risk) * w)))
+        return out
 
     def run(self, df: pd.DataFrame, hud: bool = False) -> dict:
+        prof = active()
+        t = clock() if prof else 0
         high, low, close = df["high"].values, df["low"].values, df["close"].values
-        atr_vals = atr(high, low, close, self.p.atr_period)
-        dphi = delta_phi(atr_vals, close)
-        verdict = verdict_from_series(dphi)
+        ff = feature_frame(df, self.p.atr_period)
+        if prof:
+            t = prof.lap("run.features", t)
+            prof.count("run.calls")
+        atr_vals = ff.atr
+        verdict = ff.verdict(len(ff) - 1) if len(ff) else verdict_from_series(ff.dphi)
 
         side = "wait"
         # collapse → trend-follow bias
@@ -38,8 +99,7 @@ class EntropyStrategy:
             entry_idx = -2
             entry = float(close[entry_idx])
 
-            ts = df.index[entry_idx] if isinstance(df.index, pd.DatetimeIndex) else None
-            w = session_weight(ts) if ts is not None else 1.0
+            w = float(ff.session_w[entry_idx])
             size = max(1, int(position_size(self.equity, float(atr_vals[entry_idx]), entry, self.p.risk) * w))
             stop, target = stops_targets(entry, side, float(atr_vals[entry_idx]), self.p.risk)
 
@@ -49,6 +109,8 @@ class EntropyStrategy:
             exit_px, exit_reason, bars_held = fill_trade(
                 entry, side, stop, target, highs_next, lows_next, max_bars=self.p.look_ahead_bars, stop_first=True
             )
+            if prof:
+                t = prof.lap("run.fill", t)
 
             # R-multiple
             risk_per_unit = abs(entry - stop)
@@ -73,9 +135,18 @@ class EntropyStrategy:
                     "R": r_mult,
                 },
                 str(df.index[entry_idx]),
-                str(df.index[min(len(df.index)-1, entry_idx + bars_held)])
+                str(df.index[min(len(df.index)-1, entry_idx + bars_held)]),
+                capsule_id=self.trades.next_id(),
             )
-            write_ndjson(f"{self.outdir}/trades.ndjson", cap)
+            self.trades.write(cap)
+            if self.sink is not None:
+                self.sink.write(cap)
+            elif self.outdir is not None:
+                with CapsuleSink(f"{self.outdir}/trades.ndjson") as out:
+                    out.write(cap)
+            if prof:
+                prof.lap("run.capsule", t)
+                prof.count("trades")
 
         if hud:
             print(f"{self.symbol} ΔΦ={verdict.delta_phi:.3f} glyph={verdict.glyph} side={side}")
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Parameter sweep over (rr, atr_mult, look_ahead_bars, cooldown_bars).
+
+Data-dependent signals (features, candidate bars, entry sides) are computed once. Fills
+for every risk config that shares a look-ahead are resolved in one `fill_trades` call.
+Only the cheap cooldown / day-policy pass runs per grid point. Each grid point gives
+the same trades and cumR as `multi_entry_scan` run with those parameters.
+"""
+from __future__ import annotations
+import itertools
+from dataclasses import dataclass, replace
+from typing import Dict, Optional, Sequence
+import numpy as np
+from .lazy import pandas as pd
+from .entropy_engine import GLYPHS
+from .execution import fill_trades
+from .features import FeatureFrame, feature_frame
+from .metrics import r_metrics
+from .policy import DailyBook, DayPolicy
+from .risk import RiskParams, stops_targets_arrays
+from .strategies import entry_side, Mode
+
+GRID_KEYS = {"rr": float, "atr_mult": float, "look_ahead_bars": int, "cooldown_bars": int}
+GRID_ALIASES = {"lookahead": "look_ahead_bars", "cooldown": "cooldown_bars", "atr-mult": "atr_mult"}
+RANK_KEYS = ("cum_R", "avg_R", "win_rate", "profit_factor_R", "sharpe_R", "max_drawdown_R")
+
+
+@dataclass
+class SweepGrid:
+    rr: Sequence[float] = (2.5,)
+    atr_mult: Sequence[float] = (1.5,)
+    look_ahead_bars: Sequence[int] = (64,)
+    cooldown_bars: Sequence[int] = (10,)
+
+    def __len__(self) -> int:
+        return len(self.rr) * len(self.atr_mult) * len(self.look_ahead_bars) * len(self.cooldown_bars)
+
+
+def parse_grid(specs: Sequence[str], base: Optional[SweepGrid] = None) -> SweepGrid:
+    """`["rr=2,2.5,3", "cooldown=5,10"]` → SweepGrid; keys not given keep `base` values."""
+    grid = base or SweepGrid()
+    for spec in specs:
+        key, _, vals = spec.partition("=")
+        key = GRID_ALIASES.get(key.strip(), key.strip())
+        if key not in GRID_KEYS or not vals:
+            raise ValueError(f"bad grid spec {spec!r}; use KEY=v1,v2 with KEY in {sorted(GRID_KEYS)}")
+        grid = replace(grid, **{key: tuple(GRID_KEYS[key](v) for v in vals.split(","))})
+    return grid
+
+
+@dataclass
+class Signals:
+    """Tradeable candidate bars (glyph matches the mode, side != wait) and their inputs."""
+    idx: np.ndarray       # bar index
+    long: np.ndarray      # bool
+    entry: np.ndarray     # close at entry
+    atr: np.ndarray
+    day: np.ndarray       # FeatureFrame day ids
+    n_days: int
+    warmup: int
+    high: np.ndarray
+    low: np.ndarray
+
+
+def signals(df: pd.DataFrame, mode: Mode = "collapse", atr_period: int = 14, rev_k: float = 1.0,
+            ma_period: int = 20, features: Optional[FeatureFrame] = None) -> Signals:
+    """Candidate selection exactly as in `multi_entry_scan` (default, non-reference path)."""
+    ff = features if features is not None else feature_frame(df, atr_period)
+    high, low, close = df["high"].values, df["low"].values, df["close"].values
+    warmup = max(atr_period + 20, 30)
+    want = GLYPHS.index("⟿" if mode == "collapse" else "☑")
+    cand = np.flatnonzero(ff.glyph[warmup:len(close) - 2] == want) + warmup
+    ma_col = ff.sma(ma_period) if mode == "recovery" else None
+    sides = [entry_side(mode, close[: i + 1], float(ff.atr[i]), lookback=20, k=rev_k, ma_period=ma_period,
+                        ma=None if ma_col is None else float(ma_col[i])) for i in cand.tolist()]
+    sides = np.array(sides, dtype=object)
+    keep = sides != "wait"
+    idx = cand[keep]
+    return Signals(idx, sides[keep] == "long", close[idx].astype(float), ff.atr[idx].astype(float),
+                   ff.day[idx], len(ff.day_keys), warmup, np.asarray(high, dtype=float), np.asarray(low, dtype=float))
+
+
+def _fill_r(sig: Signals, rr: np.ndarray, atr_mult: np.ndarray, look_ahead_bars: int) -> np.ndarray:
+    """R multiple of every candidate under each (rr, atr_mult) pair: shape (pairs, candidates)."""
+    k, t = rr.size, sig.idx.size
+    sgn = np.where(sig.long, 1.0, -1.0)[None, :]
+    entry = np.broadcast_to(sig.entry, (k, t))
+    stop, target = stops_targets_arrays(entry, sgn, sig.atr[None, :], atr_mult[:, None], rr[:, None])
+    exit_px, _, _ = fill_trades(np.tile(sig.idx, k), np.tile(sgn[0], k), stop.ravel(), target.ravel(),
+                                sig.high, sig.low, look_ahead_bars=look_ahead_bars, entries=entry.ravel())
+    exit_px = exit_px.reshape(k, t)
+    rpu = np.abs(entry - stop)
+    move = np.where(sgn > 0, exit_px - entry, entry - exit_px)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(rpu > 0, move / rpu, 0.0)
+
+
+def replay(sig: Signals, r: np.ndarray, cooldown_bars: int, day_policy: DayPolicy) -> np.ndarray:
+    """Sequential cooldown + per-day clamp over candidates; returns indices of taken trades."""
+    book = DailyBook(day_policy, sig.n_days)
+    taken = []
+    next_free = sig.warmup
+    for k, (i, d, rk) in enumerate(zip(sig.idx.tolist(), sig.day.tolist(), r.tolist())):
+        if i < next_free or not book.can_enter(d):
+            continue
+        book.register(d, rk)
+        taken.append(k)
+        next_free = i + cooldown_bars + 1
+    return np.array(taken, dtype=np.int64)
+
+
+def sweep(df: pd.DataFrame, grid: SweepGrid, atr_period: int = 14, day_policy: DayPolicy = DayPolicy(),
+          mode: Mode = "collapse", rev_k: float = 1.0, ma_period: int = 20, rank_by: str = "cum_R",
+          features: Optional[FeatureFrame] = None) -> pd.DataFrame:
+    """One row per grid point (params + trades, cum_R and R stats), best `rank_by` first."""
+    if rank_by not in RANK_KEYS:
+        raise ValueError(f"rank_by must be one of {RANK_KEYS}, got {rank_by!r}")
+    sig = signals(df, mode, atr_period, rev_k, ma_period, features)
+    pairs = list(itertools.product(grid.rr, grid.atr_mult))
+    rr = np.array([p[0] for p in pairs], dtype=float)
+    am = np.array([p[1] for p in pairs], dtype=float)
+    rows = []
+    for look in grid.look_ahead_bars:
+        r_all = _fill_r(sig, rr, am, look) if sig.idx.size else np.zeros((len(pairs), 0))
+        for p, (rr_p, am_p) in enumerate(pairs):
+            for cd in grid.cooldown_bars:
+                r = r_all[p, replay(sig, r_all[p], cd, day_policy)]
+                cum = 0.0
+                for x in r.tolist():  # same summation order as the scanner
+                    cum += x
+                m = r_metrics(r)
+                m["cum_R"] = cum
+                rows.append({"rr": rr_p, "atr_mult": am_p, "look_ahead_bars": look, "cooldown_bars": cd,
+                             "trades": m.pop("count"), **m})
+    out = pd.DataFrame(rows)
+    if out.empty:
+        return out
+    out = out.sort_values(rank_by, ascending=False, kind="stable").reset_index(drop=True)
+    out.insert(0, "rank", np.arange(1, len(out) + 1))
+    return out
+
+
+def best_params(table: pd.DataFrame, base: RiskParams) -> Dict:
+    """Top row of a sweep table as scan kwargs: {risk, look_ahead_bars, cooldown_bars}."""
+    top = table.iloc[0]
+    return {"risk": replace(base, rr=float(top["rr"]), atr_mult=float(top["atr_mult"])),
+            "look_ahead_bars": int(top["look_ahead_bars"]), "cooldown_bars": int(top["cooldown_bars"])}
@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+import argparse, os
+from .cli import day_policy, run_command
+
+
+def run(args: argparse.Namespace) -> None:
+    from .data import load_csv
+    from .sweep import SweepGrid, parse_grid, sweep
+    from .profiling import profiled
+    from .resample import at_timeframe
+    with profiled(args):
+        base = SweepGrid(rr=(args.rr,), atr_mult=(args.atr_mult,), look_ahead_bars=(args.lookahead,),
+                         cooldown_bars=(args.cooldown,))
+        grid = parse_grid(args.grid, base)
+        df = at_timeframe(load_csv(args.csv), args.timeframe)
+        table = sweep(df, grid, atr_period=args.atr, day_policy=day_policy(args),
+                      mode=args.mode, rev_k=args.rev_k, ma_period=args.ma, rank_by=args.rank_by)
+        table.insert(1, "symbol", args.symbol)
+        os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+        table.to_csv(args.out, index=False)
+        top = table.iloc[0]
+        print(f"[SWEEP] {args.symbol} points={len(grid)} best: rr={top['rr']} atr_mult={top['atr_mult']} "
+              f"lookahead={top['look_ahead_bars']} cooldown={top['cooldown_bars']} "
+              f"trades={top['trades']} {args.rank_by}={top[args.rank_by]:.2f} → {args.out}")
+
+
+def main(argv=None):
+    run_command("sweep", run, argv)
+
+
+if __name__ == "__main__":
+    main()
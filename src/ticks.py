@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Tick-level fills over memory-mapped tick files.
+
+A tick file is a flat run of little-endian records (ts int64 UTC epoch ns, price f8,
+size f8), sorted by ts, read through `np.memmap` so it is never loaded whole. A sparse
+index holds every `stride`-th timestamp (saved next to the file as `<path>.idx.npz`), and a
+time is located by a `searchsorted` on that index and then inside one stride-sized block.
+
+`TickFill` resolves a trade's exit at the first tick that touches the stop or target. Bars
+without any ticks fall back to `fill_trade` semantics (bar high/low, `stop_first`).
+"""
+from __future__ import annotations
+import argparse, os
+from typing import Iterable, Optional, Tuple
+import numpy as np
+from .lazy import pandas as pd
+from .calendar_index import utc_ns
+from .execution import ExitReason, fill_trade
+from .profiling import active
+
+TICK_DTYPE = np.dtype([("ts", "<i8"), ("price", "<f8"), ("size", "<f8")])
+
+
+def write_ticks(path: str, ts: np.ndarray, price: np.ndarray, size: Optional[np.ndarray] = None,
+                append: bool = False) -> int:
+    """Write (or append) ticks sorted by ts; returns the number of records written."""
+    ts = np.asarray(ts, dtype=np.int64)
+    if ts.size and np.any(np.diff(ts) < 0):
+        raise ValueError("ticks must be sorted by ts")
+    if append and os.path.exists(path) and os.path.getsize(path) and ts.size:
+        last = np.memmap(path, dtype=TICK_DTYPE, mode="r")["ts"][-1]
+        if ts[0] < last:
+            raise ValueError(f"appended ticks start before the file's last tick ({ts[0]} < {last})")
+    rec = np.empty(ts.size, dtype=TICK_DTYPE)
+    rec["ts"], rec["price"] = ts, price
+    rec["size"] = 0.0 if size is None else size
+    with open(path, "ab" if append else "wb") as f:
+        rec.tofile(f)
+    return int(ts.size)
+
+
+def ticks_from_csv(src: str, dst: str, chunksize: int = 1_000_000, ts_col: str = "timestamp",
+                   price_col: str = "price", size_col: str = "size") -> int:
+    """Convert a tick CSV to the binary format chunk by chunk (naive times are taken as UTC)."""
+    n, first = 0, True
+    for chunk in pd.read_csv(src, chunksize=chunksize):
+        ts = utc_ns(pd.DatetimeIndex(pd.to_datetime(chunk[ts_col], format="ISO8601")))
+        size = chunk[size_col].to_numpy(float) if size_col in chunk else None
+        n += write_ticks(dst, ts, chunk[price_col].to_numpy(float), size, append=not first)
+        first = False
+    if first:
+        open(dst, "wb").close()
+    return n
+
+
+class TickFile:
+    """Read side of a tick file: memmapped columns plus the sparse ts index."""
+
+    def __init__(self, path: str, stride: int = 4096):
+        self.path = path
+        self.stride = stride
+        n = os.path.getsize(path) // TICK_DTYPE.itemsize
+        data = np.memmap(path, dtype=TICK_DTYPE, mode="r", shape=(n,)) if n else np.zeros(0, TICK_DTYPE)
+        self.ts, self.price = data["ts"], data["price"]
+        self.index = self._load_index(n)
+
+    def __len__(self) -> int:
+        return self.ts.size
+
+    def _load_index(self, n: int) -> np.ndarray:
+        side = self.path + ".idx.npz"
+        try:
+            if os.path.getmtime(side) >= os.path.getmtime(self.path):
+                with np.load(side) as z:
+                    if int(z["stride"]) == self.stride and int(z["n"]) == n:
+                        return z["ts"]
+        except (OSError, KeyError, ValueError):
+            pass
+        index = np.array(self.ts[:: self.stride])      # touches one page per stride
+        try:
+            np.savez(side, stride=self.stride, n=n, ts=index)
+        except OSError:
+            pass                                        # read-only location: rebuild next time
+        return index
+
+    def locate(self, times: Iterable[int]) -> np.ndarray:
+        """Position of the first tick at or after each time (like `searchsorted(ts, times)`)."""
+        times = np.asarray(times, dtype=np.int64)
+        n = self.ts.size
+        k = np.searchsorted(self.index, times, side="left")
+        lo = np.clip((k - 1) * self.stride, 0, n)
+        hi = np.clip(k * self.stride, 0, n)
+        if times.size == 0:
+            return lo
+        a, b = int(lo.min()), int(hi.max())
+        if b - a <= 8 * self.stride:                    # sorted, nearby times: one slice
+            return a + np.searchsorted(self.ts[a:b], times, side="left")
+        return np.array([l + np.searchsorted(self.ts[l:h], x, side="left") for x, l, h in zip(times, lo, hi)],
+                        dtype=np.int64)
+
+    def first_touch(self, start: int, stop_at: int, side: str, stop: float, target: float,
+                    chunk: int = 1 << 16) -> Tuple[int, Optional[ExitReason]]:
+        """First tick in [start, stop_at) at or through the stop or target: (position, reason)."""
+        for s in range(start, stop_at, chunk):
+            p = self.price[s: min(stop_at, s + chunk)]
+            if side == "long":
+                hit_stop, hit_tgt = p <= stop, p >= target
+            else:
+                hit_stop, hit_tgt = p >= stop, p <= target
+            hit = hit_stop | hit_tgt
+            if hit.any():
+                k = int(hit.argmax())
+                return s + k, ("stop" if hit_stop[k] else "target")
+        return stop_at, None
+
+
+class TickFill:
+    """
+    `fill_trade` on ticks for one bar series. Trade entering at the close of bar i sees the
+    ticks of bars i+1 .. i+look_ahead_bars (bar j spans [open_j, open_{j+1}); the last bar
+    is as long as the median bar). Exit is at the stop/target level of the first touching
+    tick; bars_held counts up to the bar of that tick. Bars with no ticks are checked on
+    their high/low instead, and a trade with no touch exits as `fill_trade` does.
+    """
+
+    def __init__(self, ticks: TickFile, df: pd.DataFrame):
+        self.ticks = ticks
+        opens = utc_ns(df.index)
+        last = int(np.median(np.diff(opens))) if opens.size > 1 else 0
+        self.edges_ns = np.append(opens, opens[-1] + last) if opens.size else opens
+        self.high, self.low = df["high"].to_numpy(float), df["low"].to_numpy(float)
+
+    def fill(self, i: int, entry: float, side: str, stop: float, target: float,
+             look_ahead_bars: int = 64, max_bars: int = 200, stop_first: bool = True) -> Tuple[float, ExitReason, int]:
+        a = i + 1
+        end = min(a + look_ahead_bars, self.high.size)          # look-ahead slice, as fill_trade sees it
+        b = min(end, a + max_bars)
+        if a >= b:
+            return fill_trade(entry, side, stop, target, self.high[a:a], self.low[a:a], max_bars, stop_first)
+        edges = self.ticks.locate(self.edges_ns[a: b + 1])     # tick span of each bar
+        bare = edges[1:] == edges[:-1]
+        fallback = b
+        if bare.any():
+            h, l = self.high[a:b], self.low[a:b]
+            hit = ((l <= stop) | (h >= target)) if side == "long" else ((h >= stop) | (l <= target))
+            hit &= bare
+            if hit.any():
+                fallback = a + int(hit.argmax())
+        pos, reason = self.ticks.first_touch(int(edges[0]), int(edges[fallback - a]), side, stop, target)
+        prof = active()
+        if reason is not None:
+            held = int(np.searchsorted(edges, pos, side="right"))   # bar a + held - 1 holds the tick
+            if prof:
+                prof.count("fill.tick")
+            return (stop if reason == "stop" else target), reason, held
+        if fallback < b:
+            if prof:
+                prof.count("fill.bar_fallback")
+            px, reason, _ = fill_trade(entry, side, stop, target, self.high[fallback: fallback + 1],
+                                       self.low[fallback: fallback + 1], 1, stop_first)
+            return px, reason, fallback - a + 1
+        return float(self.high[end - 1] + self.low[end - 1]) * 0.5, "time", b - a
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Convert a tick CSV (timestamp,price[,size]) to a binary tick file")
+    ap.add_argument("--csv", required=True)
+    ap.add_argument("--out", required=True)
+    ap.add_argument("--chunksize", type=int, default=1_000_000)
+    args = ap.parse_args()
+    n = ticks_from_csv(args.csv, args.out, args.chunksize)
+    TickFile(args.out)                                  # build the sparse index
+    print(f"[OK] {n} ticks -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory trades of one scan. A `TradeBatch` appends one compact row per trade and
+exposes NumPy columns under the ledger's column names through `column(name)` /
+`dictionary(name)`, the columnar-source interface that `metrics` already reads, so
+results reach the metrics without an NDJSON write and re-parse. It is also a capsule
+sink (`write(cap)`), and `capsules()` rebuilds the `trade_capsule` dicts for disk sinks.
+"""
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from .capsule_logger import new_capsule_id
+from .ledger import DICT_COLUMNS, FIELDS, LEDGER_DTYPE, STRING_COLUMNS, TIME_COLUMNS, _parse_times
+
+COLUMNS = tuple(name for name, _ in FIELDS)         # row layout, ledger order
+_POS = {name: k for k, name in enumerate(COLUMNS)}
+_VERDICT = [(k, path[1]) for k, (_, path) in enumerate(FIELDS) if path[0] == "verdict"]
+_TOP = [(k, path[0]) for k, (_, path) in enumerate(FIELDS) if len(path) == 1]
+
+
+class TradeBatch:
+    __slots__ = ("rows", "_cols")
+
+    def __init__(self) -> None:
+        self.rows: List[Tuple] = []
+        self._cols: Dict[str, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def next_id(self) -> str:
+        """Capsule id of the next trade, unique across batches, processes and runs."""
+        return new_capsule_id()
+
+    def append(self, row: Tuple) -> None:
+        """One trade as a tuple in COLUMNS order (t0/t1 as printed timestamps)."""
+        self.rows.append(row)
+        self._cols.clear()
+
+    def write(self, cap: Dict[str, Any]) -> None:
+        """Sink interface: append a `trade_capsule` dict (missing fields become None)."""
+        v = cap.get("verdict") or {}
+        self.append(tuple((v if path[0] == "verdict" else cap).get(path[-1]) for _, path in FIELDS))
+
+    def capsule(self, k: int) -> Dict[str, Any]:
+        row = self.rows[k]
+        cap = {key: row[j] for j, key in _TOP[:6]}
+        cap["verdict"] = {key: row[j] for j, key in _VERDICT}
+        cap.update((key, row[j]) for j, key in _TOP[6:])
+        return cap
+
+    def capsules(self) -> Iterator[Dict[str, Any]]:
+        return (self.capsule(k) for k in range(len(self.rows)))
+
+    @property
+    def cum_r(self) -> float:
+        return float(sum(row[_POS["R"]] for row in self.rows))
+
+    def _values(self, name: str) -> List[Any]:
+        k = _POS[name]
+        return [row[k] for row in self.rows]
+
+    def column(self, name: str) -> np.ndarray:
+        """Column `name` of the ledger schema: dict columns as int32 codes into `dictionary(name)`
+        (-1 for None), t0/t1 as wall-clock ns with t0_off/t1_off offsets, capsule_id as objects."""
+        if name in self._cols:
+            return self._cols[name]
+        if name in ("t0_off", "t1_off") or name in TIME_COLUMNS:
+            base = name[:2]
+            self._cols[base], self._cols[base + "_off"] = _parse_times(self._values(base))
+        elif name in DICT_COLUMNS:
+            vocab: Dict[Any, int] = {}
+            codes = [-1 if v is None else vocab.setdefault(v, len(vocab)) for v in self._values(name)]
+            self._cols[name], self._cols[name + "#dict"] = np.array(codes, dtype=np.int32), list(vocab)
+        elif name in STRING_COLUMNS:
+            self._cols[name] = np.array(self._values(name), dtype=object)
+        elif name in _POS:
+            kind = LEDGER_DTYPE[name].kind
+            vals = [(np.nan if kind == "f" else 0) if v is None else v for v in self._values(name)]
+            self._cols[name] = np.array(vals, dtype=LEDGER_DTYPE[name])
+        else:
+            raise KeyError(name)
+        return self._cols[name]
+
+    def dictionary(self, name: str) -> List[str]:
+        self.column(name)
+        return self._cols[name + "#dict"]
+
+
+class ScanResult(tuple):
+    """`(num_trades, cumR)` of a scan, as before, with the trades themselves on `.batch`."""
+
+    def __new__(cls, trades: int, cum_r: float, batch: Optional[TradeBatch] = None):
+        self = super().__new__(cls, (trades, cum_r))
+        self.batch = batch if batch is not None else TradeBatch()
+        return self
+
+    def __getnewargs__(self):
+        return self[0], self[1], self.batch
@@ -1,41 +1,108 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Tuple, Dict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Dict, Optional
 import os, json
-import pandas as pd
+import multiprocessing as mp
+from .lazy import pandas as pd
 from .risk import RiskParams
 from .policy import DayPolicy
 from .scanner import multi_entry_scan
+from .features import feature_frame
+from .sweep import SweepGrid, sweep, best_params
+from .shared import SharedFrame, FrameSpec, attach_frame
+from .profiling import PROFILER
+from .scan_cache import ScanCache
 
 
 @dataclass
 class WFSpec:
-    train_bars: int = 0      # reserved for future tuning; ignored for now
+    train_bars: int = 0      # in-sample length before each test window (tuned when a grid is given)
     test_bars: int = 500     # OOS length per split
     step_bars: int = 250     # how far to advance between splits
 
 def rolling_windows(n_bars: int, spec: WFSpec) -> List[Tuple[int,int,int,int]]:
     """
     Produce (train_start, train_end, test_start, test_end) index tuples.
-    train_* are placeholders (0..train_end), test_* is the OOS slice we evaluate.
+    train_* is the in-sample slice used for tuning, test_* is the OOS slice we evaluate.
     """
     wins: List[Tuple[int,int,int,int]] = []
     t, k, s = spec.train_bars, spec.test_bars, spec.step_bars
     start = 0
     while True:
         train_start = max(0, start)
-        train_end   = max(0, start + t)           # currently not used
+        train_end   = max(0, start + t)
         test_start  = train_end
         test_end    = min(n_bars, test_start + k)
         if test_end - test_start < k:             # not enough bars to evaluate
             break
         wins.append((train_start, train_end, test_start, test_end))
-        start = test_start + s
+        start += s                                # train and test windows roll together
         if start + t + k >= n_bars:
             break
     return wins
 
+def _run_split(df: pd.DataFrame, symbol: str, outdir: str, i: int, tr_s: int, tr_e: int, te_s: int, te_e: int,
+               kw: Dict) -> Dict:
+    day_policy = kw["day_policy"]
+    tuned = {}
+    if kw["grid"] is not None and tr_e > tr_s:
+        # pick the best grid point in-sample, then evaluate it on the test window only
+        with PROFILER.stage("wf.sweep"):
+            table = sweep(df.iloc[tr_s:tr_e], kw["grid"], day_policy=day_policy, mode=kw["mode"],
+                          rev_k=kw["rev_k"], ma_period=kw["ma_period"], rank_by=kw["rank_by"])
+        if not table.empty:
+            tuned = best_params(table, kw["risk"])
+    risk = tuned.get("risk", kw["risk"])
+    look_ahead_bars = tuned.get("look_ahead_bars", kw["look_ahead_bars"])
+    cooldown_bars = tuned.get("cooldown_bars", kw["cooldown_bars"])
+
+    dfi = df.iloc[te_s:te_e]
+    sym_out = os.path.join(outdir, f"split_{i:02d}")
+    os.makedirs(sym_out, exist_ok=True)
+    if PROFILER.enabled:
+        PROFILER.count("wf.splits")
+    trades, cumR = multi_entry_scan(
+        df=dfi,
+        symbol=symbol,
+        risk=risk,
+        outdir=sym_out,
+        atr_period=14,
+        look_ahead_bars=look_ahead_bars,
+        cooldown_bars=cooldown_bars,
+        day_policy=DayPolicy(max_trades=day_policy.max_trades, dd_limit_r=day_policy.dd_limit_r),
+        mode="collapse" if kw["mode"] == "collapse" else "recovery",
+        rev_k=kw["rev_k"],
+        ma_period=kw["ma_period"],
+        features=feature_frame(dfi, 14),  # cached: re-runs over the same split reuse it
+        cache=kw["cache"],
+    )
+    res = {"split": i, "bars": int(te_e - te_s), "trades": trades, "cumR": cumR}
+    if kw["grid"] is not None:
+        res["params"] = {"rr": risk.rr, "atr_mult": risk.atr_mult,
+                         "look_ahead_bars": look_ahead_bars, "cooldown_bars": cooldown_bars}
+    return res
+
+
+_worker_df: Optional[pd.DataFrame] = None
+
+
+def _init_worker(spec: FrameSpec, profile: bool) -> None:
+    global _worker_df
+    _worker_df = attach_frame(spec)
+    PROFILER.enabled = profile
+
+
+def _split_task(args: Tuple) -> Tuple[Dict, Optional[Dict]]:
+    if not PROFILER.enabled:
+        return _run_split(_worker_df, *args), None
+    PROFILER.reset()  # per task, so the parent can merge every snapshot once
+    with PROFILER.stage("wf.split"):
+        res = _run_split(_worker_df, *args)
+    return res, PROFILER.snapshot()
+
+
 def evaluate_walkforward(
     df: pd.DataFrame,
     symbol: str,
@@ -48,34 +115,42 @@ def evaluate_walkforward(
     day_policy: DayPolicy = DayPolicy(),
     rev_k: float = 1.0,
     ma_period: int = 20,
+    workers: int = 1,
+    grid: Optional[SweepGrid] = None,
+    rank_by: str = "cum_R",
+    cache: Optional[ScanCache] = None,
 ) -> Dict:
+    """
+    Scan every OOS split. With `workers > 1` splits run in a process pool that reads the
+    OHLCV arrays from one shared-memory block; results are collected in split order, so
+    the summary and per-split capsule files match the serial run.
+    With a `grid` and `wf.train_bars > 0`, each split first sweeps the grid on its train
+    window and scans the test window with the best config (reported under "params").
+    `cache` replays split scans already run on the same bars and parameters.
+    """
     os.makedirs(outdir, exist_ok=True)
     splits = rolling_windows(len(df), wf)
-    results = []
-    net_R = 0.0
-    total_trades = 0
+    kw = dict(mode=mode, risk=risk, look_ahead_bars=look_ahead_bars, cooldown_bars=cooldown_bars,
+              day_policy=day_policy, rev_k=rev_k, ma_period=ma_period, grid=grid, rank_by=rank_by, cache=cache)
+    tasks = [(symbol, outdir, i, *win, kw) for i, win in enumerate(splits, start=1)]
 
-    for i, (tr_s, tr_e, te_s, te_e) in enumerate(splits, start=1):
-        # NOTE: we only evaluate on test window [te_s:te_e]
-        dfi = df.iloc[te_s:te_e].copy()
-        sym_out = os.path.join(outdir, f"split_{i:02d}")
-        os.makedirs(sym_out, exist_ok=True)
-        trades, cumR = multi_entry_scan(
-            df=dfi,
-            symbol=symbol,
-            risk=risk,
-            outdir=sym_out,
-            atr_period=14,
-            look_ahead_bars=look_ahead_bars,
-            cooldown_bars=cooldown_bars,
-            day_policy=DayPolicy(max_trades=day_policy.max_trades, dd_limit_r=day_policy.dd_limit_r),
-            mode="collapse" if mode == "collapse" else "recovery",
-            rev_k=rev_k,
-            ma_period=ma_period,
-        )
-        total_trades += trades
-        net_R += cumR
-        results.append({"split": i, "bars": int(te_e - te_s), "trades": trades, "cumR": cumR})
+    if workers > 1 and len(tasks) > 1:
+        # spawn: the daemon runs this from a job thread, next to other live threads
+        with SharedFrame(df) as shared, ProcessPoolExecutor(
+                max_workers=min(workers, len(tasks)), mp_context=mp.get_context("spawn"),
+                initializer=_init_worker, initargs=(shared.spec, PROFILER.enabled)) as pool:
+            results = []
+            for res, snap in pool.map(_split_task, tasks):
+                results.append(res)
+                if snap:
+                    PROFILER.merge(snap)
+    else:
+        results = []
+        for t in tasks:
+            with PROFILER.stage("wf.split"):
+                results.append(_run_split(df, *t))
+    total_trades = sum(r["trades"] for r in results)
+    net_R = sum((r["cumR"] for r in results), 0.0)
 
     summary = {"mode": mode, "splits": len(splits), "total_trades": total_trades, "net_R": net_R, "by_split": results}
     with open(os.path.join(outdir, "wf_summary.json"), "w") as f:
@@ -1,2 +1,21 @@
 import os, sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def synth_ohlcv(n=1000, seed=0, start="2025-03-01", freq="15min", tz=None, base=100.0, step=1.0, spread=3.0):
+    """Seeded random-walk OHLCV bars on a DatetimeIndex."""
+    rng = np.random.default_rng(seed)
+    close = base + np.cumsum(rng.normal(0, step, n))
+    idx = pd.date_range(start, periods=n, freq=freq, tz=tz, name="timestamp")
+    return pd.DataFrame({"open": close, "high": close + rng.uniform(0, spread, n),
+                         "low": close - rng.uniform(0, spread, n), "close": close, "volume": 1.0}, index=idx)
+
+
+@pytest.fixture
+def ohlcv():
+    """Factory fixture: `ohlcv(n, seed, ...)` → synthetic OHLCV DataFrame (see `synth_ohlcv`)."""
+    return synth_ohlcv
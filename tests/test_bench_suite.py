@@ -0,0 +1,24 @@
+import numpy as np
+from benchmarks.suite import compare, run
+from benchmarks.synthetic import regime_ohlcv
+from src.entropy_engine import NP_WALL, RECOV_EPS, GLYPHS
+from src.features import build_features
+
+
+def test_regime_generator_is_seeded_and_crosses_thresholds():
+    a, b = regime_ohlcv(20_000, seed=1), regime_ohlcv(20_000, seed=1)
+    assert a.equals(b) and not a.equals(regime_ohlcv(20_000, seed=2))
+    assert (a.high >= a[["open", "close"]].max(axis=1)).all() and (a.low <= a[["open", "close"]].min(axis=1)).all()
+    ff = build_features(a)
+    assert (ff.dphi > NP_WALL).mean() > 0.1 and (ff.dphi <= RECOV_EPS).mean() > 0.1
+    codes = np.bincount(ff.glyph, minlength=3)
+    assert codes[GLYPHS.index("⟿")] > 0 and codes[GLYPHS.index("☑")] > 0
+
+
+def test_run_and_compare():
+    base = run([2000], ["multi_entry_scan", "verdict_columns"], repeat=1, log=lambda _: None)
+    r = base["results"]["multi_entry_scan@2000"]
+    assert r["trades"] > 0 and r["bars_per_s"] > 0 and r["peak_mb"] > 0
+    slow = {"results": {k: dict(v, seconds=v["seconds"] * 2) for k, v in base["results"].items()}}
+    assert not any(bad for *_, bad in compare(base, base))
+    assert all(bad for *_, bad in compare(base, slow, tolerance=0.5))
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+from src.calendar_index import SessionClock, Session, calendar_index, day_ids, session_ids_utc, utc_ns
+from src.policy import DailyBook, DayPolicy
+from src.session import SESSION_NAMES, session_weights
+
+
+def _sessions_at(stamps):
+    ids = session_ids_utc(utc_ns(pd.DatetimeIndex(stamps)))
+    return [SESSION_NAMES[i] for i in ids]
+
+
+def test_winter_sessions_are_the_old_utc_bands():
+    idx = pd.date_range("2025-01-06", periods=24 * 4, freq="15min")
+    old = np.where(idx.hour < 8, 0, np.where(idx.hour < 13, 1, 2))
+    assert (session_ids_utc(utc_ns(idx)) == old).all()
+
+
+def test_sessions_follow_dst():
+    # London opens 07:00 UTC in summer; New York opens 12:00 UTC in summer
+    assert _sessions_at(["2025-01-15 07:30", "2025-07-15 07:30"]) == ["asia", "london"]
+    assert _sessions_at(["2025-01-15 12:30", "2025-07-15 12:30"]) == ["london", "ny"]
+    # the weeks between the US (Mar 9) and UK (Mar 30) changes
+    assert _sessions_at(["2025-03-17 07:30", "2025-03-17 12:30"]) == ["asia", "ny"]
+    # tz-aware index: the same instant, whatever the display zone
+    ny = pd.DatetimeIndex(["2025-07-15 08:30"]).tz_localize("America/New_York")
+    assert session_weights(ny)[0] == 1.5
+
+
+def test_session_clock_matches_vectorized():
+    idx = pd.date_range("2025-03-01", "2025-04-05", freq="17min")
+    utc = utc_ns(idx)
+    clock = SessionClock()
+    assert [clock(int(t)) for t in utc] == session_ids_utc(utc).tolist()
+    custom = (Session("a", "Australia/Sydney", "10:00"), Session("b", "Asia/Kolkata", "09:15"))
+    assert [SessionClock(custom)(int(t)) for t in utc] == session_ids_utc(utc, custom).tolist()
+
+
+def test_day_ids_follow_the_index_clock():
+    idx = pd.DatetimeIndex(["2025-03-08 23:30", "2025-03-09 00:30", "2025-03-09 23:59"]).tz_localize("America/New_York")
+    cal = calendar_index(idx)
+    assert cal.day.tolist() == [0, 1, 1] and cal.day_keys == ["2025-03-08", "2025-03-09"]
+    wall = pd.DatetimeIndex(["2025-01-02", "2025-01-01", "2025-01-02 12:00"]).as_unit("ns").asi8
+    ids, keys = day_ids(wall)
+    assert ids.tolist() == [1, 0, 1] and keys == ["2025-01-01", "2025-01-02"]
+
+
+def test_daily_book_matches_day_policy():
+    rng = np.random.default_rng(0)
+    days, rs = rng.integers(0, 5, 200), rng.normal(0, 1, 200)
+    book, pols = DailyBook(DayPolicy(max_trades=3, dd_limit_r=-1.5), n_days=2), {}
+    for d, r in zip(days.tolist(), rs.tolist()):
+        p = pols.setdefault(d, DayPolicy(max_trades=3, dd_limit_r=-1.5))
+        assert book.can_enter(d) == p.can_enter()
+        if p.can_enter():
+            p.register(r)
+            book.register(d, r)
+    assert book.counts.tolist() == [pols[d]._count for d in range(5)]
+
+
+def test_pandas_free_calendar_and_stamps_match_pandas():
+    from src.calendar_index import calendar_utc, utc_offsets
+    from src.data import Bars, BarStamps
+    for tz in (None, "America/New_York", "Asia/Kolkata"):
+        idx = pd.date_range("2024-03-08 22:00:00.5", periods=4000, freq="17min", tz=tz)
+        utc = utc_ns(idx)
+        a, b = calendar_index(idx), calendar_utc(utc, tz)
+        assert np.array_equal(a.day, b.day) and a.day_keys == b.day_keys and np.array_equal(a.session, b.session)
+        stamps = BarStamps(Bars({"close": np.zeros(len(idx))}, utc, tz))
+        assert [stamps[j] for j in range(0, len(idx), 7)] == [str(t) for t in idx[::7]]
+    hours = np.arange(0, 24 * 366 * 40, 5)
+    inst = pd.DatetimeIndex((hours * 3_600_000_000_000).view("datetime64[ns]")).tz_localize("UTC")
+    for tz in ("Europe/London", "Australia/Lord_Howe"):
+        ref = (utc_ns(inst.tz_convert(tz).tz_localize(None)) - hours * 3_600_000_000_000) // 60_000_000_000
+        assert np.array_equal(utc_offsets(hours, tz), ref)
@@ -0,0 +1,46 @@
+import json
+import pytest
+from src.capsule_logger import CapsuleSink
+
+
+def _lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(l) for l in f]
+
+
+def test_sink_writes_all_in_order(tmp_path):
+    path = tmp_path / "out" / "trades.ndjson"
+    with CapsuleSink(str(path), flush_size=7, fsync=True) as sink:
+        for i in range(1000):
+            sink.write({"i": i, "ΔΦ": 0.1})
+        sink.flush()
+        assert len(_lines(path)) == 1000
+    assert [d["i"] for d in _lines(path)] == list(range(1000))
+
+
+def test_sink_flushes_on_exception_and_stays_lazy(tmp_path):
+    path = tmp_path / "trades.ndjson"
+    with CapsuleSink(str(path)):
+        pass
+    assert not path.exists()
+    with pytest.raises(RuntimeError):
+        with CapsuleSink(str(path), flush_size=10_000, flush_interval=60.0) as sink:
+            sink.write({"a": 1})
+            raise RuntimeError("boom")
+    assert _lines(path) == [{"a": 1}]
+    with pytest.raises(ValueError):
+        sink.write({"a": 2})
+
+
+def test_sink_error_does_not_mask_block_exception(tmp_path):
+    bad = tmp_path / "dir"
+    bad.mkdir()                                   # opening a directory fails in the writer thread
+    with pytest.raises(KeyError) as info:
+        with CapsuleSink(str(bad), flush_size=1) as sink:
+            sink.write({"a": 1})
+            raise KeyError("scan failed")
+    assert any("CapsuleSink writer also failed" in n for n in info.value.__notes__)
+    sink.close()                                  # idempotent after __exit__
+    with pytest.raises(OSError):
+        with CapsuleSink(str(bad), flush_size=1) as sink:
+            sink.write({"a": 1})
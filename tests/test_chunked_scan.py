@@ -0,0 +1,62 @@
+import json
+import numpy as np
+import pytest
+from benchmarks.synthetic import regime_ohlcv
+from src.data import iter_frames, load_bars
+from src.entropy_engine import ChunkedVerdict, verdict_columns
+from src.policy import DayPolicy
+from src.scanner import Variant, chunked_scan, multi_variant_scan
+
+VARIANTS = [
+    Variant("A", "collapse", cooldown_bars=0, day_policy=DayPolicy(max_trades=3, dd_limit_r=-2.0)),
+    Variant("B", "recovery", rev_k=0.5, ma_period=50),
+    Variant("C", "collapse", look_ahead_bars=8),
+]
+
+
+def _caps(path):
+    with open(path) as f:
+        return [{k: v for k, v in json.loads(line).items() if k != "capsule_id"} for line in f]
+
+
+def test_chunked_verdict_matches_columns():
+    rng = np.random.default_rng(0)
+    for trial in range(200):
+        n = int(rng.integers(1, 300))
+        x = np.abs(rng.normal(0.04, 0.04, n))
+        x[rng.random(n) < 0.03] = 0.2
+        if trial % 3 == 0:
+            x = np.sort(x)[::-1].copy()
+        cuts = np.sort(rng.integers(0, n, int(rng.integers(0, 8))))
+        cv = ChunkedVerdict()
+        parts = [cv.extend(x[a:b]) for a, b in zip(np.r_[0, cuts], np.r_[cuts, n])]
+        for got, want in zip(zip(*parts), verdict_columns(x)):
+            assert np.array_equal(np.concatenate(got), want)
+
+
+@pytest.mark.parametrize("rows", [1, 97, 1000, 5000])
+def test_chunked_scan_matches_in_memory(tmp_path, rows):
+    df = regime_ohlcv(3000, seed=2, freq="5min")
+    full = multi_variant_scan(df, "ES", VARIANTS, {v.name: str(tmp_path / "full" / v.name) for v in VARIANTS})
+    chunks = (df.iloc[s: s + rows] for s in range(0, len(df), rows))
+    res = chunked_scan(chunks, "ES", VARIANTS, {v.name: str(tmp_path / "c" / v.name) for v in VARIANTS})
+    assert res == full and all(n > 0 for n, _ in full.values())
+    for v in VARIANTS:
+        assert _caps(tmp_path / "c" / v.name / "trades.ndjson") == _caps(tmp_path / "full" / v.name / "trades.ndjson")
+
+
+def test_iter_frames_cache_and_csv(tmp_path, ohlcv):
+    df = ohlcv(250, seed=1)
+    path = tmp_path / "bars.csv"
+    df.to_csv(path)
+    parts = list(iter_frames(str(path), 100))          # no cache yet: CSV chunks
+    assert [len(p) for p in parts] == [100, 100, 50]
+    load_bars(str(path))                               # writes the sidecar cache
+    cached = list(iter_frames(str(path), 100))
+    for a, b in zip(parts, cached):
+        assert a.index.equals(b.index) and np.array_equal(a["close"].values, b["close"].values)
+
+
+def test_chunked_scan_rejects_confluence(ohlcv):
+    with pytest.raises(ValueError):
+        chunked_scan([ohlcv(100)], "ES", [Variant("A", confirm_tf="1h")])
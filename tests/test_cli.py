@@ -0,0 +1,54 @@
+import json, os, subprocess, sys
+import pytest
+from benchmarks.bench_startup import parse_importtime
+from benchmarks.synthetic import regime_ohlcv
+from src import cli
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _python(code, cwd):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    out = subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, capture_output=True, text=True, check=True)
+    return out.stdout.strip().splitlines()
+
+
+def test_shared_schema():
+    ap = cli.build_parser()
+    for cmd in ("multi", "ab", "portfolio", "wf"):
+        csv = "ES:x.csv" if cmd == "portfolio" else "x.csv"
+        args = ap.parse_args([cmd, "--csv", csv, "--rr", "3", "--max-trades", "2", "--no-cache"])
+        assert cli.risk_params(args).rr == 3.0 and cli.day_policy(args).max_trades == 2 and cli.scan_cache(args) is None
+    with pytest.raises(SystemExit):
+        cli.main(["wf", "--csv", "x.csv", "--rank-by", "nope"])
+    with pytest.raises(SystemExit):
+        cli.main(["multi", "--csv", "x.csv", "--chunk-rows", "10", "--ticks", "t"])
+    for argv in (["sweep", "--csv", "x.csv", "--rank-by", "nope"], ["live", "--source", "socket"],
+                 ["mc", "--method", "nope"], ["mc", "--trades", "t", "--ledger", "l"]):
+        with pytest.raises(SystemExit):
+            cli.main(argv)
+
+
+def test_runner_imports_and_cached_scan_skip_pandas(tmp_path):
+    code = ("import sys; from src import backtest_runner, multi_backtest, ab_runner, portfolio_runner, wf_runner, "
+            "sweep_runner, screen_runner, live_runner, montecarlo_runner; "
+            "print(sorted(m for m in ('numpy', 'pandas') if m in sys.modules))")
+    assert _python(code, tmp_path) == ["[]"]
+    csv = str(tmp_path / "bars.csv")
+    regime_ohlcv(3000, seed=1, freq="15min").to_csv(csv, index_label="timestamp")
+    scan = f"from src.cli import main; main(['multi', '--csv', {csv!r}, '--no-cache']); "
+    first = _python("import sys; " + scan + "print('pandas.core' in sys.modules)", tmp_path)
+    again = _python("import sys; " + scan + "print('pandas.core' in sys.modules)", tmp_path)
+    assert first[-1] == "True" and again[-1] == "False" and first[0] == again[0]   # parse once, then the binary cache
+    with open(tmp_path / "artifacts" / "session_summary.json") as f:
+        assert f"trades={json.load(f)['trades']}" in again[0]
+
+
+def test_parse_importtime():
+    log = ("import time: self [us] | cumulative | imported package\n"
+           "import time:       100 |        100 |   numpy.core\n"
+           "import time:       500 |        600 | numpy\n"
+           "import time:        50 |         50 |     pandas.core.api\n"
+           "import time:       200 |        250 | src.data\n")
+    r = parse_importtime(log)
+    assert r["import_ms"] == 0.85 and r["modules"] == 4 and r["pandas"] and r["top"][0] == ["numpy", 0.6]
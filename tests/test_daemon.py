@@ -0,0 +1,81 @@
+import os, threading
+import pytest
+from benchmarks.synthetic import regime_ohlcv
+from src.cli import build_parser
+from src.daemon import Daemon, DaemonClient, DatasetStore
+from src.data import load_csv
+from src.features import feature_frame
+from src.risk import RiskParams
+from src.scanner import multi_entry_scan
+
+
+@pytest.fixture
+def csvs(tmp_path):
+    paths = []
+    for seed in (1, 2):
+        path = str(tmp_path / f"s{seed}.csv")
+        regime_ohlcv(3000, seed=seed, freq="15min").to_csv(path, index_label="timestamp")
+        paths.append(path)
+    return paths
+
+
+def test_store_lru_and_reload(csvs):
+    store = DatasetStore(budget=1 << 30)
+    a = store.frame(csvs[0])
+    assert store.frame(csvs[0]) is a and store.features(csvs[0], "1h").close.size == len(store.frame(csvs[0], "1h"))
+    assert (store.hits, store.misses) == (3, 3)         # 1h features → 1h frame → base frame
+    store.budget = store.stats()["bytes"]               # room for one dataset only
+    store.frame(csvs[1])
+    assert store.stats()["datasets"] == [csvs[1]] and store.evictions == 1
+    regime_ohlcv(2000, seed=3, freq="15min").to_csv(csvs[1], index_label="timestamp")
+    assert len(store.frame(csvs[1])) == 2000            # changed on disk: reloaded
+
+
+def test_store_budget_covers_shared_caches(csvs):
+    store = DatasetStore(budget=1 << 30)
+    df = store.frame(csvs[0])
+    feature_frame(df.iloc[:1000])                       # e.g. wf's per-split features
+    ff = feature_frame(df.iloc[:2000])
+    store.budget = store.stats()["bytes"] + ff.nbytes   # the dataset plus the newest cached FeatureFrame
+    store.trim()
+    assert store.stats()["cache_bytes"] == ff.nbytes
+    store.budget = store.stats()["bytes"]
+    store.trim()
+    assert store.stats()["cache_bytes"] == 0 and store.stats()["datasets"] == [os.path.abspath(csvs[0])]
+    assert store.evictions == 0
+
+
+def test_daemon_jobs_match_direct_scan(tmp_path, csvs):
+    sock = str(tmp_path / "d.sock")
+    daemon, ready = Daemon(sock, workers=2), threading.Event()
+    t = threading.Thread(target=daemon.serve, args=(ready,))
+    t.start()
+    try:
+        assert ready.wait(10)
+        client = DaemonClient(sock)
+        ap = build_parser()
+        args = vars(ap.parse_args(["multi", "--csv", csvs[0], "--no-cache"]))
+        args.pop("command")
+        runs = []
+        for _ in range(2):
+            runs.append(list(client.submit("multi", args, cwd=str(tmp_path))))
+            assert client.stats()["misses"] == 2        # frame and features, loaded by the first job only
+        direct = multi_entry_scan(load_csv(csvs[0]), "ES", RiskParams(), outdir=None)
+        for events in runs:
+            assert [e["event"] for e in events] == ["accepted", "done"]
+            assert (events[-1]["result"]["trades"], events[-1]["result"]["cumR"]) == tuple(direct) and direct[0] > 0
+        assert os.path.exists(tmp_path / "artifacts" / "session_summary.json")
+
+        args = vars(ap.parse_args(["portfolio", "--csv", f"A:{csvs[0]}", "--csv", f"B:{csvs[1]}", "--no-cache"]))
+        args.pop("command")
+        events = list(client.submit("portfolio", args, cwd=str(tmp_path)))
+        assert sorted(e["symbol"] for e in events if e["event"] == "progress") == ["A", "B"]
+        assert events[-1]["result"]["by_symbol"]["A"]["trades"] == direct[0]
+
+        args = vars(ap.parse_args(["multi", "--csv", str(tmp_path / "missing.csv")]))
+        args.pop("command")
+        assert list(client.submit("multi", args))[-1]["event"] == "error"
+    finally:
+        DaemonClient(sock).shutdown()
+        t.join(10)
+    assert not os.path.exists(sock)
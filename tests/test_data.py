@@ -0,0 +1,50 @@
+import os
+import numpy as np
+import pandas as pd
+from src.data import load_csv, load_bars, read_csv, cache_dir
+
+CSV = "timestamp,open,high,low,close,volume\n" + "".join(
+    f"2025-01-01 09:{m:02d},{100 + m},{102 + m},{99 + m},{101 + m},{1000 + m}\n" for m in range(30))
+
+
+def test_cache_roundtrip_and_invalidation(tmp_path):
+    path = tmp_path / "es.csv"
+    path.write_text(CSV)
+    first = load_csv(str(path))
+    assert os.path.isdir(cache_dir(str(path)))
+    bars = load_bars(str(path))
+    assert isinstance(bars.columns["close"], np.memmap)
+    second = load_csv(str(path))
+    pd.testing.assert_frame_equal(first, second)
+    pd.testing.assert_frame_equal(second, read_csv(str(path)), check_index_type=False)
+    assert first.index[3] == pd.Timestamp("2025-01-01 09:03")
+
+    path.write_text(CSV.replace(",1029\n", ",5\n"))  # same size class of edit, new content
+    assert load_csv(str(path))["volume"].iloc[-1] == 5
+    os.utime(path, ns=(1, 1))  # touched only: hash still matches, cache reused
+    assert load_bars(str(path)).meta["hash"]
+
+
+def test_touched_file_is_hashed_once(tmp_path, monkeypatch):
+    import src.data as data
+    path = tmp_path / "es.csv"
+    path.write_text(CSV)
+    load_bars(str(path))
+    os.utime(path, ns=(10**18, 10**18))
+    calls = []
+    real = data.file_hash
+    monkeypatch.setattr(data, "file_hash", lambda p: calls.append(p) or real(p))
+    for _ in range(3):
+        assert load_bars(str(path)).meta["mtime_ns"] == 10**18
+    assert len(calls) == 1
+
+
+def test_tz_aware_and_no_timestamp(tmp_path):
+    path = tmp_path / "tz.csv"
+    path.write_text("timestamp,high,low,close\n2025-01-01 09:30-05:00,2,1,1.5\n2025-01-01 09:31-05:00,3,1,2\n")
+    a, b = load_csv(str(path)), load_csv(str(path))
+    assert str(a.index.tz) == "UTC-05:00" and a.index.equals(b.index)
+    path = tmp_path / "plain.csv"
+    path.write_text("high,low,close\n2,1,1.5\n3,1,2\n")
+    df = load_csv(str(path))
+    assert list(df.columns) == ["high", "low", "close"] and load_csv(str(path))["close"].tolist() == [1.5, 2.0]
@@ -16,3 +16,26 @@ def test_target_first_option_short():
     lows  = np.array([97.0])      # target hit same bar
     exit_px, reason, bars = fill_trade(entry, "short", stop, target, highs, lows, stop_first=False)
     assert reason == "target" and exit_px == target and bars == 1
+
+
+def test_fill_trades_matches_fill_trade():
+    from src.execution import fill_trades, EXIT_REASONS
+    rng = np.random.default_rng(0)
+    n = 400
+    mid = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    high, low = mid + rng.random(n), mid - rng.random(n)
+    idx = rng.integers(0, n, size=300)
+    idx[:3] = [n - 1, n - 2, n - 5]
+    sides = rng.choice(["long", "short"], size=idx.size)
+    entries = mid[idx]
+    dist = rng.uniform(0.5, 4.0, idx.size)
+    sgn = np.where(sides == "long", 1.0, -1.0)
+    stops, targets = entries - sgn * dist, entries + sgn * dist * 1.5
+    for look, max_bars in [(64, 200), (64, 10), (5, 200)]:
+        for stop_first in (True, False):
+            px, why, held = fill_trades(idx, sides, stops, targets, high, low, look_ahead_bars=look,
+                                        max_bars=max_bars, stop_first=stop_first, entries=entries)
+            for k, i in enumerate(idx):
+                exp = fill_trade(entries[k], sides[k], stops[k], targets[k], high[i + 1 : i + 1 + look],
+                                 low[i + 1 : i + 1 + look], max_bars=max_bars, stop_first=stop_first)
+                assert (px[k], EXIT_REASONS[why[k]], held[k]) == exp
@@ -0,0 +1,29 @@
+import numpy as np
+from src.entropy_engine import verdict_from_series, verdict_columns, GLYPHS, NP_WALL, RECOV_EPS
+from src.features import feature_frame, build_features, clear_feature_cache
+from src.session import session_weight
+
+
+def test_verdict_columns_match_prefix_verdicts():
+    rng = np.random.default_rng(11)
+    d = rng.choice([0.01, RECOV_EPS, 0.06, NP_WALL + 0.01], size=120)
+    np_wall, no_rec, sat, glyph = verdict_columns(d)
+    for i in range(d.size):
+        v = verdict_from_series(d[: i + 1])
+        assert (v.np_wall, v.no_recovery, v.sat_like, v.glyph) == (np_wall[i], no_rec[i], sat[i], GLYPHS[glyph[i]])
+
+
+def test_feature_frame_columns_and_cache(ohlcv):
+    clear_feature_cache()
+    df = ohlcv(300, start="2025-03-01 20:00")
+    ff = feature_frame(df, 14)
+    assert feature_frame(df.copy(), 14) is ff          # same content → cache hit
+    assert feature_frame(df, 10) is not ff
+    assert ff.day_keys[ff.day[-1]] == df.index[-1].date().isoformat()
+    assert [ff.session_w[i] for i in (0, 50, 150)] == [session_weight(df.index[i]) for i in (0, 50, 150)]
+    sma = ff.sma(20)
+    assert np.isclose(sma[100], df["close"].values[81:101].mean())
+    assert np.isclose(sma[5], df["close"].values[:6].mean())
+    v = ff.verdict(len(ff) - 1)
+    assert v == verdict_from_series(ff.dphi)
+    assert build_features(df, 14).glyph.tolist() == ff.glyph.tolist()
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from src.indicators import (RollingSMA, RollingEMA, ATR, WilderATR, RollingMax, RollingMin, RollingStd,
+                            sma, true_range)
+from src.entropy_engine import atr
+
+
+@pytest.fixture
+def series(ohlcv):
+    df = ohlcv(257, seed=4, base=5000.0, step=3.0, spread=4.0)
+    return df["high"].values, df["low"].values, df["close"].values
+
+
+def test_update_extend_compute_agree_exactly(series):
+    high, low, close = series
+    for k in (RollingSMA(20), RollingEMA(10), RollingMax(7), RollingMin(7), RollingStd(15), RollingSMA(1)):
+        ref = k.compute(close)
+        step = [k.update(x) for x in close.tolist()]
+        k.reset()
+        chunked = np.concatenate([k.extend(close[a:a + 50]) for a in range(0, close.size, 50)])
+        assert ref.tolist() == step == chunked.tolist(), type(k).__name__
+    for k in (ATR(14), WilderATR(14)):
+        ref = k.compute(high, low, close)
+        step = [k.update(h, l, c) for h, l, c in zip(high.tolist(), low.tolist(), close.tolist())]
+        k.reset()
+        chunked = np.concatenate([k.extend(high[a:a + 33], low[a:a + 33], close[a:a + 33])
+                                  for a in range(0, close.size, 33)])
+        assert ref.tolist() == step == chunked.tolist(), type(k).__name__
+
+
+def test_values_are_trailing_windows(series):
+    high, low, close = series
+    i = 100
+    assert np.isclose(sma(close, 20)[i], close[i - 19:i + 1].mean())
+    assert np.isclose(sma(close, 20)[3], close[:4].mean())
+    assert RollingMax(7).compute(close)[i] == close[i - 6:i + 1].max()
+    assert RollingMin(7).compute(close)[i] == close[i - 6:i + 1].min()
+    assert np.isclose(RollingStd(15).compute(close)[i], close[i - 14:i + 1].std())
+    tr = true_range(high, low, close)
+    assert np.isclose(atr(high, low, close, 14)[i], tr[i - 13:i + 1].mean())
+
+
+def test_no_lookahead(series):
+    high, low, close = series
+    bumped = close.copy()
+    bumped[150:] *= 1.5
+    assert np.array_equal(sma(close, 20)[:150], sma(bumped, 20)[:150])
+    assert np.array_equal(atr(high, low, close)[:150], atr(high, low, bumped)[:150])
+
+
+def test_kernel_bases_are_abstract():
+    from src.indicators import _Kernel, _RollingExtreme
+    for base in (_Kernel, _RollingExtreme):
+        with pytest.raises(TypeError):
+            base(3) if base is _RollingExtreme else base()
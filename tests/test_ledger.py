@@ -0,0 +1,86 @@
+import json
+import numpy as np
+from src.ledger import Ledger, LedgerWriter, ndjson_to_ledger, ledger_to_ndjson
+from src.metrics import compute_metrics
+
+
+def _capsules(n, start=0):
+    out = []
+    for i in range(start, start + n):
+        out.append({
+            "capsule_id": f"TRADE⇌{i}", "symbol": "ES" if i % 2 else "NQ", "side": "long" if i % 3 else "short",
+            "entry": 100.0 + i, "exit": 101.5 + i, "pnl": 1.5 if i % 3 else -1.5,
+            "verdict": {"glyph": "⟿", "np_wall": True, "no_recovery": True, "sat_like": False,
+                        "ΔΦ_last": 0.1 + i / 1000, "size": 3, "stop": 99.0 + i, "target": 103.0 + i,
+                        "exit_reason": ["stop", "target", "time"][i % 3], "bars_held": i % 7, "R": (i % 5) - 1.5},
+            "t0": f"2025-01-0{1 + i % 5} 09:{i % 60:02d}:00", "t1": f"2025-01-0{1 + i % 5} 10:{i % 60:02d}:00",
+        })
+    return out
+
+
+def test_ndjson_roundtrip_and_segments(tmp_path):
+    caps = _capsules(250)
+    src = tmp_path / "trades.ndjson"
+    src.write_text("".join(json.dumps(c, separators=(",", ":")) + "\n" for c in caps), encoding="utf-8")
+    led = ndjson_to_ledger(str(src), str(tmp_path / "ledger"), segment_rows=100)
+    assert len(led) == 250 and len(led.segments) == 3
+    back = tmp_path / "back.ndjson"
+    assert ledger_to_ndjson(str(tmp_path / "ledger"), str(back)) == 250
+    assert back.read_text(encoding="utf-8") == src.read_text(encoding="utf-8")
+
+    w = LedgerWriter(str(tmp_path / "ledger"))
+    w.append(_capsules(10, start=250))
+    led = Ledger(str(tmp_path / "ledger"))
+    assert len(led) == 260 and led.decoded("symbol")[-1] == "ES"
+    assert led.column("R").tolist() == [c["verdict"]["R"] for c in _capsules(260)]
+
+
+def test_single_segment_column_is_memmap_and_metrics_match(tmp_path):
+    caps = _capsules(40)
+    LedgerWriter(str(tmp_path / "l")).append(caps)
+    led = Ledger(str(tmp_path / "l"))
+    assert isinstance(led.column("pnl"), np.memmap)
+    a, b = compute_metrics(led), compute_metrics(caps)
+    assert a.keys() == b.keys()
+    assert all(np.isclose(a[k], b[k]) for k in a)
+
+
+def test_absent_and_null_fields_roundtrip(tmp_path):
+    import pytest
+    caps = _capsules(4)
+    del caps[0]["verdict"]["size"]
+    caps[1]["verdict"]["R"] = None
+    caps[1]["capsule_id"] = None
+    del caps[2]["t1"]
+    del caps[3]["verdict"]
+    w = LedgerWriter(str(tmp_path / "l"))
+    w.append(caps)
+    assert list(Ledger(str(tmp_path / "l")).iter_capsules()) == caps
+    with pytest.raises(ValueError):
+        w.append([dict(_capsules(1)[0], extra=1)])
+    with pytest.raises(ValueError):
+        w.append([{**_capsules(1)[0], "verdict": {**_capsules(1)[0]["verdict"], "size": 2.5}}])
+
+
+def test_dictionaries_live_outside_meta(tmp_path):
+    path = tmp_path / "l"
+    LedgerWriter(str(path)).append(_capsules(50))
+    meta = (path / "meta.json").read_text(encoding="utf-8")
+    assert "TRADE" not in meta and "long" not in meta
+    with open(path / "dict_symbol.txt", "a", encoding="utf-8") as f:
+        f.write('"ZZ"\n')  # bytes of an append that never reached meta.json
+    LedgerWriter(str(path)).append([dict(_capsules(1)[0], symbol="CL")])
+    led = Ledger(str(path))
+    assert led.dictionary("symbol") == ["NQ", "ES", "CL"] and led.decoded("symbol")[-1] == "CL"
+    assert led.column("capsule_id")[-1] == "TRADE⇌0"
+
+
+def test_append_after_crash_before_meta(tmp_path):
+    path = tmp_path / "l"
+    LedgerWriter(str(path)).append(_capsules(5))
+    meta = (path / "meta.json").read_text(encoding="utf-8")
+    LedgerWriter(str(path)).append(_capsules(5, start=5))
+    (path / "meta.json").write_text(meta, encoding="utf-8")   # crash: seg_000001 written, meta.json not
+    LedgerWriter(str(path)).append(_capsules(3, start=10))
+    led = Ledger(str(path))
+    assert len(led) == 8 and led.column("R").tolist() == [c["verdict"]["R"] for c in _capsules(5) + _capsules(3, 10)]
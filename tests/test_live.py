@@ -0,0 +1,71 @@
+import asyncio
+from src.live import LineParser, frame_bars, latency_summary, replay, run_feed, socket_bars, tail_csv
+from src.strategy import EntropyStrategy, Params
+
+
+def test_on_bar_matches_run_on_every_prefix(tmp_path, ohlcv):
+    df = ohlcv(400, seed=2, base=30.0, step=0.3, spread=3.0)  # ΔΦ crosses the collapse wall
+    live = EntropyStrategy("ES", Params())
+    batch = EntropyStrategy("ES", Params(), outdir=str(tmp_path))
+    sides = set()
+    for t, bar in enumerate(frame_bars(df)):
+        d = live.on_bar(bar)
+        if t >= 20:
+            r = batch.run(df.iloc[: t + 1])
+            assert (d["glyph"], d["side"], d["delta_phi_last"]) == (r["glyph"], r["side"], r["delta_phi_last"])
+            sides.add(d["side"])
+    assert {"long", "short"} <= sides
+
+
+def test_replay_latency(ohlcv):
+    seen = []
+    lat = replay(EntropyStrategy("ES", Params()), ohlcv(500), seen.append)
+    s = latency_summary(lat)
+    assert s["bars"] == len(seen) == 500 and 0 < s["p50_us"] <= s["p99_us"] <= s["p999_us"]
+
+
+def test_tail_csv_waits_for_complete_lines(tmp_path, ohlcv):
+    df = ohlcv(30)
+    lines = df.to_csv().splitlines(keepends=True)
+    path = tmp_path / "feed.csv"
+    path.write_text("".join(lines[:11]) + lines[11][:7])
+
+    async def main():
+        async def writer():
+            await asyncio.sleep(0.05)
+            with open(path, "a") as f:
+                f.write(lines[11][7:] + "".join(lines[12:]))
+        task = asyncio.create_task(writer())
+        got = [b async for b in tail_csv(str(path), poll_interval=0.01, idle_timeout=0.3)]
+        await task
+        return got
+
+    assert asyncio.run(main()) == list(frame_bars(df))
+
+
+def test_socket_feed(tmp_path, ohlcv):
+    df = ohlcv(50)
+    payload = df.to_csv().encode()
+    sock = str(tmp_path / "bars.sock")
+
+    async def main():
+        async def serve(reader, writer):
+            writer.write(payload)
+            await writer.drain()
+            writer.close()
+        server = await asyncio.start_unix_server(serve, path=sock)
+        async with server:
+            bot = EntropyStrategy("ES", Params())
+            lat = await run_feed(bot, socket_bars(path=sock))
+        return lat, bot
+
+    lat, bot = asyncio.run(main())
+    ref = EntropyStrategy("ES", Params())
+    last = [ref.on_bar(b) for b in frame_bars(df)][-1]
+    assert lat.size == 50 and bot._n == 50 and bot._sv.verdict().delta_phi == last["delta_phi_last"]
+
+
+def test_line_parser_header_order():
+    p = LineParser(["close", "low", "high", "open", "timestamp"])
+    bar = p("4,1,5,2,2025-03-01T00:15:00\n")
+    assert bar == (1740788100 * 10**9, 2.0, 5.0, 1.0, 4.0, 0.0)
@@ -0,0 +1,41 @@
+import numpy as np
+from src.ledger import LedgerWriter, Ledger
+from src.metrics import compute_metrics, metrics_panel, group_metrics
+
+
+def _caps(rs, days, sides):
+    return [{"symbol": "ES", "side": s, "pnl": r * 10, "t0": f"2025-01-{d:02d} {9 + k % 8:02d}:00:00",
+             "verdict": {"R": r, "glyph": "⟿", "exit_reason": "target" if r > 0 else "stop"}}
+            for k, (r, d, s) in enumerate(zip(rs, days, sides))]
+
+
+def test_panel_extras():
+    caps = _caps([1.0, 2.0, -1.0, -1.0, -1.0, 3.0, 0.5], [1] * 7, ["long"] * 7)
+    m = metrics_panel(caps)
+    assert set(compute_metrics(caps)) <= set(m)
+    assert m["max_win_streak"] == 2 and m["max_loss_streak"] == 3
+    assert m["max_drawdown_R"] == -3.0 and m["max_dd_duration"] == 3
+    assert sum(m["R_hist"]["counts"]) == 7
+    r = np.array([1.0, 2.0, -1.0, -1.0, -1.0, 3.0, 0.5])
+    assert np.isclose(m["sharpe_R"], r.mean() / r.std(ddof=1))
+
+
+def test_group_by_matches_per_group_metrics(tmp_path):
+    rng = np.random.default_rng(2)
+    n = 300
+    rs = np.round(rng.normal(0.1, 1.2, n), 3).tolist()
+    days = rng.integers(1, 9, n).tolist()
+    sides = rng.choice(["long", "short"], n).tolist()
+    caps = _caps(rs, days, sides)
+    LedgerWriter(str(tmp_path / "l")).append(caps)
+    led = Ledger(str(tmp_path / "l"))
+    for by in ("day", "side", "exit_reason", "session", "glyph"):
+        g_dicts, g_led = group_metrics(caps, by), group_metrics(led, by)
+        assert g_dicts.keys() == g_led.keys()
+        for k, v in g_dicts.items():
+            assert all(np.isclose(v[f], g_led[k][f]) for f in v)
+    for day, g in group_metrics(caps, "day").items():
+        sub = [c for c in caps if c["t0"].startswith(day)]
+        ref = compute_metrics(sub)
+        assert g["count"] == ref["count"] and np.isclose(g["cum_R"], ref["cum_R"])
+        assert np.isclose(g["profit_factor_R"], ref["profit_factor_R"])
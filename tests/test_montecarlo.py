@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from src.montecarlo import _Paths, _clamp_days, _day_summary, _day_table, simulate, trade_r_days
+from src.policy import DayPolicy
+
+
+def _days(seed=0, n=60):
+    rng = np.random.default_rng(seed)
+    r = np.where(rng.random(n) < 0.4, 2.5, -1.0) * rng.uniform(0.5, 1.0, n)
+    return r, np.sort(rng.integers(0, 12, n))
+
+
+def test_constant_r_has_no_drawdown():
+    res = simulate(np.ones(5), paths=1000, method="iid", seed=1)
+    assert res["final_R"]["mean"] == 5 and res["max_drawdown_R"]["q99"] == 0
+    assert res["risk_of_ruin"]["p"] == 0 and res["expectancy_R"]["ci95"] == [1.0, 1.0]
+
+
+def test_day_step_matches_trade_step():
+    r, days = _days()
+    table = _day_table(r, days)
+    summ = _day_summary(table)
+    seq = np.random.default_rng(3).integers(0, table.shape[0], size=(40, 500))
+    by_day, by_trade = _Paths(500), _Paths(500)
+    for d in seq:
+        by_day.step_day(*(summ[k][d] for k in ("total", "low", "high", "dd")))
+        for v in np.nan_to_num(table[d]).T:
+            by_trade.step(v)
+    for k in ("eq", "peak", "dd", "low"):
+        np.testing.assert_allclose(getattr(by_day, k), getattr(by_trade, k), atol=1e-9)
+
+
+def test_day_clamp_matches_day_policy():
+    r, days = _days(seed=5, n=120)
+    table = _day_table(r, days)
+    clamped = _clamp_days(table, DayPolicy(max_trades=3, dd_limit_r=-1.5))
+    for row, got in zip(table, clamped):
+        p = DayPolicy(max_trades=3, dd_limit_r=-1.5)
+        want = []
+        for x in row[~np.isnan(row)]:
+            if p.can_enter():
+                p.register(x)
+                want.append(x)
+        np.testing.assert_allclose(got[~np.isnan(got)], want)
+
+
+def test_simulate_methods_and_rules():
+    r, days = _days()
+    res = {m: simulate(r, days, paths=20_000, method=m, seed=7) for m in ("iid", "block", "day")}
+    for out in res.values():
+        assert abs(out["expectancy_R"]["mean"] - r.mean()) < 0.05
+        lo, hi = out["expectancy_R"]["ci95"]
+        assert lo < r.mean() < hi
+        qs = list(out["max_drawdown_R"].values())
+        assert qs == sorted(qs, reverse=True)                 # deeper at higher quantiles
+    assert simulate(r, days, paths=20_000, method="day", seed=7) == res["day"]
+    ruled = simulate(r, days, paths=20_000, method="day", seed=7, day_policy=DayPolicy(max_trades=2, dd_limit_r=-1.0))
+    assert ruled["trades_per_path"]["max"] <= 2 * len(np.unique(days))
+    assert 0 < ruled["day_rules"]["p_day_hits_dd_limit"] < 1
+    with pytest.raises(ValueError):
+        simulate(r, days, method="iid", day_policy=DayPolicy())
+
+
+def test_trade_r_days_from_capsules():
+    caps = [{"t0": "2024-01-02T10:00:00", "verdict": {"R": 1.0}},
+            {"t0": "2024-01-02T11:00:00", "verdict": {}},
+            {"t0": "2024-01-03T10:00:00", "verdict": {"R": -1.0}}]
+    r, days = trade_r_days(caps)
+    assert r.tolist() == [1.0, -1.0] and days[0] != days[1]
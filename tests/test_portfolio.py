@@ -0,0 +1,49 @@
+import json
+import threading
+import pandas as pd
+import pytest
+from src.portfolio import MemoryBudget, ScanParams, run_portfolio
+from src.shared import SharedFrame, run_on_frame, _attached
+
+
+@pytest.fixture
+def csv(ohlcv):
+    def write(path, n, seed):
+        ohlcv(n, seed).to_csv(path)
+        return str(path)
+    return write
+
+
+def test_memory_budget_blocks_until_release():
+    b = MemoryBudget(100)
+    b.acquire(80)
+    got = threading.Event()
+    t = threading.Thread(target=lambda: (b.acquire(50), got.set()))
+    t.start()
+    assert not got.wait(0.1)
+    b.release(80)
+    assert got.wait(2)
+    t.join()
+    b.release(50)
+    b.acquire(500)   # over budget, but nothing else is in flight
+    assert b.used == 500
+
+
+def test_run_on_frame_unmaps(tmp_path, csv):
+    df = pd.read_csv(csv(tmp_path / "a.csv", 50, 0), index_col=0, parse_dates=True)
+    before = len(_attached)
+    with SharedFrame(df) as sh:
+        assert run_on_frame(sh.spec, lambda f: float(f["close"].sum())) == float(df["close"].sum())
+    assert len(_attached) == before
+
+
+def test_parallel_portfolio_matches_serial(tmp_path, csv):
+    symmap = {s: csv(tmp_path / f"{s}.csv", 900 + 100 * k, k) for k, s in enumerate(["ES", "NQ", "CL"])}
+    seen = []
+    serial = run_portfolio(symmap, ScanParams(), outroot=str(tmp_path / "a"))
+    par = run_portfolio(symmap, ScanParams(), outroot=str(tmp_path / "b"), workers=2, max_rss=1,
+                        on_result=lambda s, r: seen.append(s))
+    assert serial == par
+    assert sorted(seen) == sorted(symmap)
+    assert list(json.loads((tmp_path / "b" / "portfolio_summary.json").read_text())["by_symbol"]) == list(symmap)
+    assert "pending" not in par
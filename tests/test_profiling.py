@@ -0,0 +1,46 @@
+import json
+from types import SimpleNamespace
+import pytest
+from src.profiling import PROFILER, profiled
+from src.risk import RiskParams
+from src.scanner import multi_entry_scan
+from src.walkforward import WFSpec, evaluate_walkforward
+
+
+@pytest.fixture(autouse=True)
+def _clean_profiler():
+    PROFILER.reset()
+    yield
+    PROFILER.enabled = False
+    PROFILER.reset()
+
+
+def test_disabled_profiler_records_nothing(tmp_path, ohlcv):
+    multi_entry_scan(ohlcv(600, base=30.0, step=0.3), "ES", RiskParams(), outdir=str(tmp_path))
+    assert PROFILER.snapshot() == {"stages": {}, "counters": {}}
+
+
+def test_profiled_scan_counts(tmp_path, ohlcv):
+    args = SimpleNamespace(profile=True, profile_out=str(tmp_path / "profile.json"), cprofile=str(tmp_path / "p.pstats"))
+    with profiled(args):
+        n, _ = multi_entry_scan(ohlcv(600, base=30.0, step=0.3), "ES", RiskParams(), outdir=str(tmp_path))
+    snap = json.loads((tmp_path / "profile.json").read_text())
+    c = snap["counters"]
+    assert c["trades"] == n > 0 and c["scan.bars"] == 600
+    assert c["scan.glyph_hits"] == n + c.get("skip.cooldown", 0) + c.get("skip.policy", 0) + c.get("skip.wait", 0)
+    assert snap["stages"]["scan.fill"]["calls"] == n and "total" in snap["stages"]
+    assert (tmp_path / "p.pstats").stat().st_size > 0 and not PROFILER.enabled
+
+
+def test_parallel_walkforward_merges_worker_profiles(tmp_path, ohlcv):
+    df, spec = ohlcv(1200, seed=3, base=30.0, step=0.3), WFSpec(test_bars=300, step_bars=300)
+    counts = []
+    for workers in (1, 2):
+        PROFILER.reset()
+        PROFILER.enabled = True
+        out = evaluate_walkforward(df, "ES", str(tmp_path / str(workers)), spec, "collapse", RiskParams(),
+                                   workers=workers)
+        PROFILER.enabled = False
+        counts.append(PROFILER.snapshot()["counters"])
+        assert counts[-1]["trades"] == out["total_trades"] and counts[-1]["wf.splits"] == out["splits"]
+    assert counts[0] == counts[1]
@@ -0,0 +1,52 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic import regime_ohlcv
+from src.resample import BarPyramid, parse_timeframe, resample_level
+from src.risk import RiskParams
+from src.scanner import multi_entry_scan
+
+AGG = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+
+@pytest.mark.parametrize("tf,tz", [("1h", None), ("75min", None), ("1d", "America/New_York")])
+def test_levels_match_pandas_resample(ohlcv, tf, tz):
+    df = ohlcv(3000, seed=1, start="2025-03-05", tz=tz)  # spans the March DST change
+    df = df.drop(df.index[100:140])                       # a gap: some buckets are missing
+    lv = resample_level(df, parse_timeframe(tf))
+    rule = pd.Timedelta(seconds=parse_timeframe(tf)) if tz is None else "1D"
+    ref = df.resample(rule, origin="epoch" if tz is None else "start_day").agg(AGG).dropna()
+    pd.testing.assert_frame_equal(lv.frame, ref, check_freq=False)
+
+
+def test_aligned_verdicts_have_no_lookahead(ohlcv):
+    df = ohlcv(1500, seed=2, base=30.0, step=0.3)
+    full = BarPyramid(df)
+    glyph, dphi = full.aligned_glyph("1h"), full.aligned_dphi("1h")
+    assert (glyph >= 0).any() and glyph[0] == -1
+    for i in (5, 37, 38, 39, 400, 1201):
+        head = BarPyramid(df.iloc[: i + 1])
+        assert head.aligned_glyph("1h")[i] == glyph[i]
+        np.testing.assert_equal(head.aligned_dphi("1h")[i], dphi[i])
+    # an hour of 15m bars is closed on its 4th bar
+    lv = full.level("1h")
+    assert lv.done_at[1] == lv.first[1] + 3
+    assert full.level("1h") is lv
+
+
+def test_confluence_filters_entries(tmp_path):
+    df = regime_ohlcv(4000, seed=0, freq="5min")
+    n_all, _ = multi_entry_scan(df, "ES", RiskParams(), outdir=str(tmp_path / "all"))
+    n, _ = multi_entry_scan(df, "ES", RiskParams(), outdir=str(tmp_path / "conf"), confirm_tf="15m", confirm_glyphs="☑")
+    ok = BarPyramid(df).confluence("15m", ("☑",))
+    with open(tmp_path / "conf" / "trades.ndjson") as f:
+        t0 = [json.loads(line)["t0"] for line in f]
+    assert 0 < n == len(t0) < n_all
+    assert ok[df.index.get_indexer(pd.to_datetime(t0))].all()
+
+
+def test_parse_timeframe():
+    assert [parse_timeframe(t) for t in ("5m", "15min", "1h", "1d", "30s")] == [300, 900, 3600, 86400, 30]
+    with pytest.raises(ValueError):
+        parse_timeframe("fast")
@@ -0,0 +1,85 @@
+import json, os, re
+import pytest
+from src import entropy_engine
+from src.features import data_fingerprint
+from src.risk import RiskParams
+from src.scan_cache import SALT_MODULES, ScanCache, scan_key
+from src.scanner import Variant, multi_entry_scan, multi_variant_scan
+
+
+def _lines(path):
+    """Capsules without capsule_id (fresh per run, also on replay)."""
+    with open(path) as f:
+        return [_no_id(json.loads(line)) for line in f]
+
+
+def _no_id(cap):
+    return {k: v for k, v in cap.items() if k != "capsule_id"}
+
+
+def test_hit_replays_capsules(tmp_path, ohlcv):
+    df = ohlcv(900, seed=7)
+    cache = ScanCache(str(tmp_path / "cache"))
+    first = multi_entry_scan(df, "ES", RiskParams(), outdir=str(tmp_path / "a"), cache=cache)
+    again = multi_entry_scan(df, "ES", RiskParams(), outdir=str(tmp_path / "b"), cache=cache)
+    assert first == again and first[0] > 0
+    caps = [[_no_id(c) for c in res.batch.capsules()] for res in (first, again)]
+    assert caps[1] == json.loads(json.dumps(caps[0]))
+    assert not set(again.batch.column("capsule_id")) & set(first.batch.column("capsule_id"))
+    assert _lines(tmp_path / "a" / "trades.ndjson") == _lines(tmp_path / "b" / "trades.ndjson")
+    assert len(os.listdir(tmp_path / "cache")) == 1                  # no temp files left behind
+
+
+def test_key_covers_data_params_and_thresholds(ohlcv, monkeypatch):
+    df = ohlcv(300, seed=1)
+    fp = data_fingerprint(df)
+    base = scan_key(fp, "ES", Variant("A"), 14)
+    assert scan_key(fp, "ES", Variant("renamed"), 14) == base          # the name only picks the outdir
+    assert scan_key(fp, "ES", Variant("A", risk=RiskParams(rr=3.0)), 14) != base
+    assert scan_key(fp, "NQ", Variant("A"), 14) != base
+    assert scan_key(fp, "ES", Variant("A"), 20) != base
+    assert scan_key(data_fingerprint(ohlcv(300, seed=2)), "ES", Variant("A"), 14) != base
+    monkeypatch.setattr(entropy_engine, "NP_WALL", 0.1)
+    assert scan_key(fp, "ES", Variant("A"), 14) != base
+
+
+def test_partial_hits_in_multi_variant_scan(tmp_path, ohlcv):
+    df = ohlcv(900, seed=7)
+    cache = ScanCache(str(tmp_path / "cache"))
+    a, b = Variant("A"), Variant("B", "recovery", rev_k=0.5, ma_period=10)
+    multi_variant_scan(df, "ES", [a], {"A": str(tmp_path / "x" / "A")}, cache=cache)
+    res = multi_variant_scan(df, "ES", [a, b], {v.name: str(tmp_path / "y" / v.name) for v in (a, b)}, cache=cache)
+    plain = multi_variant_scan(df, "ES", [a, b], {v.name: str(tmp_path / "z" / v.name) for v in (a, b)})
+    assert res == plain
+    for name in "AB":
+        assert _lines(tmp_path / "y" / name / "trades.ndjson") == _lines(tmp_path / "z" / name / "trades.ndjson")
+
+
+def test_lru_eviction(tmp_path):
+    cache = ScanCache(str(tmp_path), max_bytes=10**9)
+    caps = [{"capsule_id": "x", "pnl": float(i)} for i in range(50)]
+    for k, key in enumerate("abc"):
+        cache.put(key, len(caps), 1.0, caps)
+        os.utime(tmp_path / f"{key}.ndjson", (1000 + k, 1000 + k))
+    assert cache.get("a") is not None                                 # refreshes a's mtime
+    cache.max_bytes = cache.size() - 1
+    assert cache.evict() == 1
+    assert cache.get("b") is None and cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_chunked_scan_rejects_cache(tmp_path, ohlcv):
+    with pytest.raises(ValueError):
+        multi_variant_scan([ohlcv(100)], "ES", [Variant("A")], cache=ScanCache(str(tmp_path)))
+
+
+def test_salt_covers_scan_imports():
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    seen, todo = set(), ["scanner"]
+    while todo:
+        name = todo.pop()
+        if name in seen or name in ("lazy", "profiling", "scan_cache"):   # no effect on results
+            continue
+        seen.add(name)
+        with open(os.path.join(src, name + ".py"), encoding="utf-8") as f:
+            todo += re.findall(r"^from \.(\w+) import", f.read(), flags=re.M)
+    assert seen <= set(SALT_MODULES), seen - set(SALT_MODULES)
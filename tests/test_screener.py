@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import regime_ohlcv
+from src.cli import main
+from src.entropy_engine import verdict_from_series
+from src.features import build_features
+from src.screener import atr_rows, stack_universe, screen
+
+
+def _universe():
+    rng = np.random.default_rng(0)
+    series = {f"S{i:02d}": regime_ohlcv(int(rng.integers(1, 1200 if i % 5 else 25)), seed=i, freq="15min")
+              for i in range(40)}
+    series["EMPTY"] = series["S01"].iloc[:0]
+    return series
+
+
+def test_rows_match_per_symbol_verdicts():
+    series = _universe()
+    for bars in (None, 300):
+        u = stack_universe(series, bars)
+        table = screen(u).set_index("symbol")
+        atrs = atr_rows(u.high, u.low, u.close, u.start)
+        for row, (sym, df) in enumerate(series.items()):
+            d = df.iloc[-bars:] if bars else df
+            ff = build_features(d) if len(d) else None
+            v = verdict_from_series(ff.dphi if ff else np.empty(0))
+            r = table.loc[sym]
+            assert (r.glyph, r.np_wall, r.no_recovery, r.sat_like, r.dphi_last) == \
+                   (v.glyph, v.np_wall, v.no_recovery, v.sat_like, v.delta_phi)
+            assert r.bars == len(d) and np.array_equal(atrs[row, u.start[row]:], ff.atr if ff else np.empty(0))
+            if len(d) >= 20:
+                close = d["close"].values
+                assert r.side == ("wait" if v.glyph != "⟿" else "long" if close[-1] > close[-20] else "short")
+    ranked = screen(stack_universe(series))
+    assert list(ranked.index) == list(range(1, len(series) + 1))
+    codes = ranked["glyph"].map({"⟿": 0, "☑": 1, "⚖": 2}).values
+    assert (np.diff(codes) >= 0).all() and (ranked["glyph"] == "⟿").any()
+    for _, grp in ranked.groupby("glyph"):
+        assert grp["dphi_last"].is_monotonic_decreasing
+
+
+def test_screen_command(tmp_path, capsys):
+    for i in range(3):
+        regime_ohlcv(400 + 50 * i, seed=i, freq="15min").to_csv(tmp_path / f"S{i}.csv", index_label="timestamp")
+    out = tmp_path / "screen.csv"
+    main(["screen", "--dir", str(tmp_path), "--csv", f"X:{tmp_path / 'S0.csv'}", "--bars", "300", "--out", str(out)])
+    table = pd.read_csv(out, index_col="rank")
+    assert sorted(table["symbol"]) == ["S0", "S1", "S2", "X"] and (table["bars"] == 300).all()
+    assert "[SCREEN] symbols=4" in capsys.readouterr().out
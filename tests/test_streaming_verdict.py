@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+from src.entropy_engine import StreamingVerdict, verdict_from_series, NP_WALL, RECOV_EPS
+from src.risk import RiskParams
+from src.scanner import multi_entry_scan
+
+
+def test_streaming_matches_prefix_verdicts():
+    rng = np.random.default_rng(7)
+    levels = np.array([0.01, RECOV_EPS * 0.5, RECOV_EPS, 0.06, NP_WALL, NP_WALL + 0.03])
+    d = rng.choice(levels, size=400) + rng.normal(0, 1e-3, size=400) * (rng.random(400) < 0.3)
+    d[50:60] = np.linspace(0.05, 0.03, 10)  # non-increasing stretch
+    sv = StreamingVerdict()
+    assert sv.verdict() == verdict_from_series(d[:0])
+    for i in range(d.size):
+        sv.update(float(d[i]))
+        assert sv.verdict() == verdict_from_series(d[: i + 1]), i
+
+
+def test_scanner_streaming_equals_reference(tmp_path):
+    rng = np.random.default_rng(3)
+    n = 600
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    spread = close * np.where((np.arange(n) // 100) % 2 == 0, 0.02, 0.15)
+    high, low = close + spread * rng.random(n), close - spread * rng.random(n)
+    idx = pd.date_range("2025-01-01", periods=n, freq="h")
+    df = pd.DataFrame({"open": close, "high": high, "low": low, "close": close}, index=idx)
+    for mode in ("collapse", "recovery"):
+        fast = multi_entry_scan(df, "T", RiskParams(), outdir=str(tmp_path / f"{mode}_s"), mode=mode)
+        ref = multi_entry_scan(df, "T", RiskParams(), outdir=str(tmp_path / f"{mode}_r"), mode=mode, reference=True)
+        assert fast == ref and fast[0] > 0
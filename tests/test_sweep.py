@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from src.policy import DayPolicy
+from src.risk import RiskParams
+from src.scanner import multi_entry_scan
+from src.sweep import SweepGrid, parse_grid, sweep
+from src.walkforward import WFSpec, evaluate_walkforward
+
+
+@pytest.mark.parametrize("mode", ["collapse", "recovery"])
+def test_sweep_matches_scanner(tmp_path, ohlcv, mode):
+    df = ohlcv(1500, seed=5)
+    grid = SweepGrid(rr=(1.5, 3.0), atr_mult=(1.0, 2.0), look_ahead_bars=(8, 64), cooldown_bars=(0, 10))
+    pol = DayPolicy(max_trades=4, dd_limit_r=-2.0)
+    table = sweep(df, grid, day_policy=pol, mode=mode)
+    assert len(table) == len(grid) == 16
+    assert table["rank"].tolist() == list(range(1, 17))
+    assert table["cum_R"].is_monotonic_decreasing
+    for _, row in table.iterrows():
+        n, cum = multi_entry_scan(df, "ES", RiskParams(rr=row.rr, atr_mult=row.atr_mult), outdir=str(tmp_path),
+                                  look_ahead_bars=int(row.look_ahead_bars), cooldown_bars=int(row.cooldown_bars),
+                                  day_policy=DayPolicy(max_trades=4, dd_limit_r=-2.0), mode=mode)
+        assert (n, cum) == (row.trades, row.cum_R)
+
+
+def test_parse_grid():
+    g = parse_grid(["rr=1,2", "cooldown=5"], SweepGrid(atr_mult=(1.5,)))
+    assert (g.rr, g.atr_mult, g.cooldown_bars, len(g)) == ((1.0, 2.0), (1.5,), (5,), 2)
+    with pytest.raises(ValueError):
+        parse_grid(["size=1"])
+
+
+def test_walkforward_tunes_on_train_window(tmp_path, ohlcv):
+    df = ohlcv(1500, seed=5)
+    spec = WFSpec(train_bars=600, test_bars=300, step_bars=300)
+    grid = SweepGrid(rr=(1.5, 3.0), atr_mult=(1.0, 2.0))
+    out = evaluate_walkforward(df, "ES", str(tmp_path), spec, "collapse", RiskParams(), grid=grid)
+    assert out["splits"] == 2
+    for s in out["by_split"]:
+        p = s["params"]
+        assert p["rr"] in grid.rr and p["atr_mult"] in grid.atr_mult
+        assert s["bars"] == 300
+
+
+def test_stops_targets_arrays_match_scalar():
+    from src.risk import stops_targets, stops_targets_arrays
+    rng = np.random.default_rng(1)
+    entry, atr = rng.uniform(50, 150, 200), rng.uniform(0, 3, 200)
+    p = RiskParams(rr=2.3, atr_mult=1.7)
+    for side, sign in (("long", 1.0), ("short", -1.0), ("wait", 0.0)):
+        st, tg = stops_targets_arrays(entry, sign, atr, p.atr_mult, p.rr)
+        assert list(zip(st.tolist(), tg.tolist())) == [stops_targets(e, side, a, p) for e, a in zip(entry, atr)]
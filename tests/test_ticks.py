@@ -0,0 +1,69 @@
+import json
+import numpy as np
+from src.calendar_index import utc_ns
+from src.execution import fill_trade
+from src.risk import RiskParams
+from src.scanner import multi_entry_scan
+from src.ticks import TickFile, TickFill, write_ticks
+
+
+def _bar_ticks(df, keep=None):
+    """Two ticks per bar, the low then the high (bars where keep is False get none)."""
+    opens = utc_ns(df.index)
+    keep = np.ones(len(df), bool) if keep is None else keep
+    ts = np.stack([opens + 1, opens + 2], axis=1)[keep].ravel()
+    px = np.stack([df["low"].values, df["high"].values], axis=1)[keep].ravel()
+    return ts, px
+
+
+def test_locate_matches_searchsorted(tmp_path):
+    rng = np.random.default_rng(0)
+    ts = np.sort(rng.integers(0, 10_000, 5000))
+    write_ticks(str(tmp_path / "t.bin"), ts, rng.normal(size=ts.size))
+    tf = TickFile(str(tmp_path / "t.bin"), stride=16)
+    for times in (np.sort(rng.integers(-5, 10_005, 300)), np.arange(4000, 4040), ts[::97]):
+        assert np.array_equal(tf.locate(times), np.searchsorted(ts, times))
+    assert np.array_equal(TickFile(str(tmp_path / "t.bin"), stride=16).index, tf.index)   # sidecar reused
+
+
+def test_tick_order_resolves_same_bar_hits(tmp_path, ohlcv):
+    df = ohlcv(400, seed=3, spread=6.0)
+    path = str(tmp_path / "t.bin")
+    write_ticks(path, *_bar_ticks(df))
+    fill = TickFill(TickFile(path), df)
+    hi, lo, close = df["high"].values, df["low"].values, df["close"].values
+    for i in range(0, 390, 7):
+        for side, sign in (("long", 1), ("short", -1)):
+            stop, target = close[i] - sign * 2.0, close[i] + sign * 3.0
+            # low ticks first: longs see the stop first, shorts the target
+            want = fill_trade(close[i], side, stop, target, hi[i + 1: i + 17], lo[i + 1: i + 17],
+                              stop_first=side == "long")
+            assert fill.fill(i, close[i], side, stop, target, 16) == want
+
+
+def test_missing_ticks_fall_back_to_bars(tmp_path, ohlcv):
+    df = ohlcv(400, seed=4, spread=6.0)
+    keep = np.ones(len(df), bool)
+    keep[100:300] = False
+    path = str(tmp_path / "t.bin")
+    write_ticks(path, *_bar_ticks(df, keep))
+    fill = TickFill(TickFile(path), df)
+    hi, lo, close = df["high"].values, df["low"].values, df["close"].values
+    for i in range(100, 280, 5):
+        stop, target = close[i] + 2.0, close[i] - 3.0
+        assert fill.fill(i, close[i], "short", stop, target, 16) == \
+            fill_trade(close[i], "short", stop, target, hi[i + 1: i + 17], lo[i + 1: i + 17])
+
+
+def test_scan_with_ticks(tmp_path, ohlcv):
+    df = ohlcv(900, seed=7)
+    empty = tmp_path / "empty.bin"
+    write_ticks(str(empty), [], [])
+    full = tmp_path / "full.bin"
+    write_ticks(str(full), *_bar_ticks(df))
+    base = multi_entry_scan(df, "ES", RiskParams(), outdir=str(tmp_path / "bars"))
+    assert multi_entry_scan(df, "ES", RiskParams(), outdir=str(tmp_path / "none"), ticks=TickFile(str(empty))) == base
+    n, _ = multi_entry_scan(df, "ES", RiskParams(), outdir=str(tmp_path / "ticks"), ticks=TickFile(str(full)))
+    with open(tmp_path / "ticks" / "trades.ndjson") as f:
+        caps = [json.loads(line) for line in f]
+    assert n == len(caps) > 0 and all(c["verdict"]["exit_reason"] in ("stop", "target", "time") for c in caps)
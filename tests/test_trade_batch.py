@@ -0,0 +1,50 @@
+import json
+import numpy as np
+from benchmarks.synthetic import regime_ohlcv
+from src import capsule_logger
+from src.ledger import Ledger, ndjson_to_ledger
+from src.metrics import compute_metrics, group_metrics, load_trades
+from src.risk import RiskParams
+from src.scanner import multi_entry_scan
+from src.strategy import EntropyStrategy, Params
+
+
+def test_batch_matches_ndjson_and_ledger(tmp_path):
+    df = regime_ohlcv(6000, seed=1, freq="15min").tz_localize("America/New_York")
+    trades, cum_r = res = multi_entry_scan(df, "ES", RiskParams(), outdir=str(tmp_path))
+    batch = res.batch
+    assert len(batch) == trades > 0 and np.isclose(batch.cum_r, cum_r)
+    path = str(tmp_path / "trades.ndjson")
+    caps = load_trades(path)
+    assert [json.loads(json.dumps(c)) for c in batch.capsules()] == caps
+    assert compute_metrics(batch) == compute_metrics(caps)
+    for by in ("day", "session", "glyph", "exit_reason"):
+        assert group_metrics(batch, by) == group_metrics(caps, by)
+    led = ndjson_to_ledger(path, str(tmp_path / "ledger"))
+    for name in ("R", "size", "np_wall", "t0", "t1_off", "capsule_id"):
+        assert np.array_equal(batch.column(name), Ledger(led.path).column(name))
+    assert batch.dictionary("side") == led.dictionary("side")
+
+
+def test_outdir_none_writes_nothing(tmp_path, ohlcv, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    df = ohlcv(900, seed=7)
+    res = multi_entry_scan(df, "ES", RiskParams(), outdir=None)
+    assert res == multi_entry_scan(df, "ES", RiskParams(), outdir="a")
+    assert len(res.batch) == res[0] and list(tmp_path.iterdir()) == [tmp_path / "a"]
+
+
+def test_capsule_ids_are_unique_across_scans(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    df = regime_ohlcv(6000, seed=1, freq="15min")
+    runs = [multi_entry_scan(df, "ES", RiskParams(), outdir=None) for _ in range(2)]
+    ids = [i for res in runs for i in res.batch.column("capsule_id")]
+    assert runs[0][0] > 1 and len(set(ids)) == len(ids) == 2 * runs[0][0]
+    assert all(i.startswith(f"TRADE⇌{capsule_logger.RUN_ID}.") for i in ids)
+    bot = EntropyStrategy("ES", Params(), outdir=None)
+    df = regime_ohlcv(3000, seed=1, freq="15min")
+    for n in range(100, 3000, 25):
+        bot.run(df.iloc[:n])
+    ids = list(bot.trades.column("capsule_id"))
+    assert len(set(ids)) == len(ids) == len(bot.trades) > 1
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,42 @@
+import json
+import pytest
+from src.policy import DayPolicy
+from src.risk import RiskParams
+from src.scanner import Variant, multi_entry_scan, multi_variant_scan, parse_variant
+
+
+def _caps(path):
+    with open(path) as f:
+        return [{k: v for k, v in json.loads(line).items() if k != "capsule_id"} for line in f]
+
+
+@pytest.mark.parametrize("reference", [False, True])
+def test_one_pass_matches_separate_scans(tmp_path, ohlcv, reference):
+    df = ohlcv(900, seed=7)
+    variants = [
+        Variant("A", "collapse", cooldown_bars=0, day_policy=DayPolicy(max_trades=3, dd_limit_r=-2.0)),
+        Variant("B", "recovery", rev_k=0.5, ma_period=10),
+        Variant("C", "collapse", risk=RiskParams(rr=1.5, atr_mult=1.0), look_ahead_bars=8),
+    ]
+    res = multi_variant_scan(df, "ES", variants, {v.name: str(tmp_path / v.name) for v in variants},
+                             reference=reference)
+    for v in variants:
+        solo = tmp_path / f"solo_{v.name}"
+        n, cum = multi_entry_scan(df, "ES", v.risk, outdir=str(solo), look_ahead_bars=v.look_ahead_bars,
+                                  cooldown_bars=v.cooldown_bars, day_policy=v.day_policy, mode=v.mode,
+                                  rev_k=v.rev_k, ma_period=v.ma_period)
+        assert res[v.name] == (n, cum) and n > 0
+        assert _caps(tmp_path / v.name / "trades.ndjson") == _caps(solo / "trades.ndjson")
+
+
+def test_parse_variant(ohlcv):
+    base = Variant("base", risk=RiskParams(rr=2.0))
+    v = parse_variant("B2:mode=recovery,rev_k=1.5,ma=30,rr=3,max_trades=2", base)
+    assert (v.name, v.mode, v.rev_k, v.ma_period, v.risk.rr, v.risk.atr_mult, v.day_policy.max_trades) == \
+        ("B2", "recovery", 1.5, 30, 3.0, 1.5, 2)
+    assert base.risk.rr == 2.0 and base.day_policy.max_trades == 8
+    for bad in ("B2:size=1", "B2:mode=trend", ":rr=2"):
+        with pytest.raises(ValueError):
+            parse_variant(bad, base)
+    with pytest.raises(ValueError):
+        multi_variant_scan(ohlcv(100), "ES", [base, base])
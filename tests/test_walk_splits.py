@@ -7,3 +7,29 @@ def test_rolling_windows_count():
     assert len(wins) == 6
     # each window's test span length == 50
     assert all((te - ts) == 50 for (_, _, ts, te) in wins)
+
+
+def test_shared_frame_roundtrip(ohlcv):
+    import pandas as pd
+    from src.shared import SharedFrame, attach_frame
+    df = ohlcv(100, seed=3, tz="America/New_York")
+    with SharedFrame(df) as sh:
+        pd.testing.assert_frame_equal(attach_frame(sh.spec), df, check_freq=False)
+
+
+def test_parallel_walkforward_matches_serial(tmp_path, ohlcv):
+    import json
+    from src.walkforward import evaluate_walkforward
+    from src.risk import RiskParams
+    df, spec = ohlcv(1200, seed=3, tz="America/New_York", spread=2.0), WFSpec(test_bars=200, step_bars=100)
+
+    def run(out, workers):
+        s = evaluate_walkforward(df, "ES", str(out), spec, "collapse", RiskParams(), workers=workers)
+        caps = {}
+        for d in sorted(out.glob("split_*")):
+            f = d / "trades.ndjson"
+            lines = f.read_text().splitlines() if f.exists() else []
+            caps[d.name] = [{k: v for k, v in json.loads(l).items() if k != "capsule_id"} for l in lines]
+        return s, caps
+
+    assert run(tmp_path / "serial", 1) == run(tmp_path / "pool", 2)